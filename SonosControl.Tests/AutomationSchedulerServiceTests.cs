@@ -1,7 +1,10 @@
+using System.Globalization;
+using System.Text.RegularExpressions;
 using Microsoft.AspNetCore.Http;
 using Microsoft.EntityFrameworkCore;
 using Microsoft.Extensions.Configuration;
 using Microsoft.Extensions.DependencyInjection;
+using Microsoft.Extensions.Logging;
 using Microsoft.Extensions.Logging.Abstractions;
 using Moq;
 using SonosControl.DAL.Interfaces;
@@ -14,6 +17,13 @@ namespace SonosControl.Tests;
 
 public class AutomationSchedulerServiceTests
 {
+    // Same patterns as TRIGGER_PATTERN and FAILURE_PATTERN in scripts/simulate_scheduler.py,
+    // which reads these log lines to grade scheduler simulations.
+    private static readonly Regex TriggerLogPattern = new(
+        @"Schedule (?<window>\S+) triggered scene (?<scene>\S+) at (?<at>\S+) on (?<targets>\d+) speaker\(s\) in (?<elapsed>[\d.,]+) ms\.");
+    private static readonly Regex FailureLogPattern = new(
+        @"Schedule (?<window>\S+) could not apply scene (?<scene>\S+) at (?<at>\S+?): ");
+
     [Fact]
     public async Task EvaluateNowAsync_TransitionsBetweenWindows_StopsOldTargetsAndAppliesNewScene()
     {
@@ -176,13 +186,129 @@ public class AutomationSchedulerServiceTests
             Times.Exactly(2));
     }
 
+    [Fact]
+    public async Task EvaluateNowAsync_RecordsSchedulerEvaluationsAndTriggers()
+    {
+        var time = new ManualTimeProvider(new DateTimeOffset(2026, 7, 20, 10, 0, 0, TimeSpan.Zero));
+        var settings = Settings(
+            Window("window-a", "scene-a", new TimeOnly(9, 0), new TimeOnly(11, 0), priority: 10),
+            Window("window-b", "scene-b", new TimeOnly(11, 0), new TimeOnly(13, 0), priority: 20));
+        var settingsRepo = new Mock<ISettingsRepo>();
+        settingsRepo.Setup(repo => repo.GetSettings()).ReturnsAsync(settings);
+        var connector = new Mock<ISonosConnectorRepo>();
+        connector.Setup(repo => repo.PausePlaying("10.0.0.1")).Returns(Task.CompletedTask);
+        var scenes = new Mock<ISceneOrchestrationService>();
+        scenes.Setup(service => service.ApplySceneByIdAsync("scene-a", "automation-scheduler", It.IsAny<CancellationToken>()))
+            .ReturnsAsync(new SceneApplyResult(true, "Applied A", "scene-a", ["10.0.0.1"]));
+        scenes.Setup(service => service.ApplySceneByIdAsync("scene-b", "automation-scheduler", It.IsAny<CancellationToken>()))
+            .ReturnsAsync(new SceneApplyResult(true, "Applied B", "scene-b", ["10.0.0.2"]));
+        var metrics = new MetricsCollector();
+
+        using var fixture = CreateScheduler(settingsRepo.Object, connector.Object, scenes.Object, time, metricsCollector: metrics);
+
+        await fixture.Service.EvaluateNowAsync();
+        time.SetUtcNow(new DateTimeOffset(2026, 7, 20, 10, 15, 0, TimeSpan.Zero));
+        await fixture.Service.EvaluateNowAsync();
+        time.SetUtcNow(new DateTimeOffset(2026, 7, 20, 11, 30, 0, TimeSpan.Zero));
+        await fixture.Service.EvaluateNowAsync();
+
+        var scheduler = metrics.GetSnapshot().Scheduler;
+        Assert.Equal(3, scheduler.Evaluations);
+        Assert.Equal(2, scheduler.Triggers);
+        Assert.Equal(2, scheduler.AverageWindowsPerEvaluation);
+        Assert.Equal(3, scheduler.EvaluationDurationBuckets.Values.Sum());
+        Assert.True(scheduler.MaxEvaluationDurationMs >= scheduler.AverageEvaluationDurationMs);
+        Assert.Equal(time.GetUtcNow(), scheduler.LastEvaluationUtc);
+    }
+
+    [Fact]
+    public async Task EvaluateNowAsync_FailedScene_RecordsEvaluationWithoutTrigger()
+    {
+        var time = new ManualTimeProvider(new DateTimeOffset(2026, 7, 20, 10, 0, 0, TimeSpan.Zero));
+        var settingsRepo = new Mock<ISettingsRepo>();
+        settingsRepo.Setup(repo => repo.GetSettings())
+            .ReturnsAsync(Settings(Window("window-a", "scene-a", new TimeOnly(9, 0), new TimeOnly(11, 0), priority: 10)));
+        var scenes = new Mock<ISceneOrchestrationService>();
+        scenes.Setup(service => service.ApplySceneByIdAsync("scene-a", "automation-scheduler", It.IsAny<CancellationToken>()))
+            .ReturnsAsync(new SceneApplyResult(false, "Speaker unavailable", "scene-a", []));
+        var metrics = new MetricsCollector();
+
+        using var fixture = CreateScheduler(settingsRepo.Object, Mock.Of<ISonosConnectorRepo>(), scenes.Object, time, metricsCollector: metrics);
+
+        await fixture.Service.EvaluateNowAsync();
+
+        var scheduler = metrics.GetSnapshot().Scheduler;
+        Assert.Equal(1, scheduler.Evaluations);
+        Assert.Equal(0, scheduler.Triggers);
+        Assert.Equal(0, scheduler.AverageTriggerDurationMs);
+    }
+
+    [Fact]
+    public async Task EvaluateNowAsync_LogsTriggerInSimulationScriptFormat()
+    {
+        var evaluatedAt = new DateTimeOffset(2026, 7, 20, 10, 0, 0, TimeSpan.Zero);
+        var settingsRepo = new Mock<ISettingsRepo>();
+        settingsRepo.Setup(repo => repo.GetSettings())
+            .ReturnsAsync(Settings(Window("window-a", "scene-a", new TimeOnly(9, 0), new TimeOnly(11, 0), priority: 10)));
+        var scenes = new Mock<ISceneOrchestrationService>();
+        scenes.Setup(service => service.ApplySceneByIdAsync("scene-a", "automation-scheduler", It.IsAny<CancellationToken>()))
+            .ReturnsAsync(new SceneApplyResult(true, "Applied", "scene-a", ["10.0.0.1"]));
+        var logger = new RecordingLogger<AutomationSchedulerService>();
+
+        using var fixture = CreateScheduler(
+            settingsRepo.Object,
+            Mock.Of<ISonosConnectorRepo>(),
+            scenes.Object,
+            new ManualTimeProvider(evaluatedAt),
+            logger: logger);
+
+        await fixture.Service.EvaluateNowAsync();
+
+        var match = Assert.Single(logger.Messages.Select(message => TriggerLogPattern.Match(message)), m => m.Success);
+        Assert.Equal("window-a", match.Groups["window"].Value);
+        Assert.Equal("scene-a", match.Groups["scene"].Value);
+        Assert.Equal(evaluatedAt, DateTimeOffset.Parse(match.Groups["at"].Value, CultureInfo.InvariantCulture));
+        Assert.Equal("1", match.Groups["targets"].Value);
+        Assert.True(double.Parse(match.Groups["elapsed"].Value, CultureInfo.InvariantCulture) >= 0);
+    }
+
+    [Fact]
+    public async Task EvaluateNowAsync_LogsFailedTriggerInSimulationScriptFormat()
+    {
+        var evaluatedAt = new DateTimeOffset(2026, 7, 20, 10, 0, 0, TimeSpan.Zero);
+        var settingsRepo = new Mock<ISettingsRepo>();
+        settingsRepo.Setup(repo => repo.GetSettings())
+            .ReturnsAsync(Settings(Window("window-a", "scene-a", new TimeOnly(9, 0), new TimeOnly(11, 0), priority: 10)));
+        var scenes = new Mock<ISceneOrchestrationService>();
+        scenes.Setup(service => service.ApplySceneByIdAsync("scene-a", "automation-scheduler", It.IsAny<CancellationToken>()))
+            .ReturnsAsync(new SceneApplyResult(false, "Speaker unavailable", "scene-a", []));
+        var logger = new RecordingLogger<AutomationSchedulerService>();
+
+        using var fixture = CreateScheduler(
+            settingsRepo.Object,
+            Mock.Of<ISonosConnectorRepo>(),
+            scenes.Object,
+            new ManualTimeProvider(evaluatedAt),
+            logger: logger);
+
+        await fixture.Service.EvaluateNowAsync();
+
+        var match = Assert.Single(logger.Messages.Select(message => FailureLogPattern.Match(message)), m => m.Success);
+        Assert.Equal("window-a", match.Groups["window"].Value);
+        Assert.Equal("scene-a", match.Groups["scene"].Value);
+        Assert.Equal(evaluatedAt, DateTimeOffset.Parse(match.Groups["at"].Value, CultureInfo.InvariantCulture));
+        Assert.DoesNotContain(logger.Messages, message => TriggerLogPattern.IsMatch(message));
+    }
+
     private static SchedulerFixture CreateScheduler(
         ISettingsRepo settingsRepo,
         ISonosConnectorRepo connector,
         ISceneOrchestrationService scenes,
         TimeProvider timeProvider,
         ISettingsSchemaMigrationService? migration = null,
-        TimeZoneInfo? timeZone = null)
+        TimeZoneInfo? timeZone = null,
+        IMetricsCollector? metricsCollector = null,
+        ILogger<AutomationSchedulerService>? logger = null)
     {
         var databaseOptions = new DbContextOptionsBuilder<ApplicationDbContext>()
             .UseInMemoryDatabase($"canonical-scheduler-{Guid.NewGuid():N}")
@@ -216,10 +342,11 @@ public class AutomationSchedulerServiceTests
             provider.GetRequiredService<IServiceScopeFactory>(),
             migration ?? migrationMock!.Object,
             status,
-            NullLogger<AutomationSchedulerService>.Instance,
+            logger ?? NullLogger<AutomationSchedulerService>.Instance,
             configuration,
             timeProvider,
-            timeZone ?? TimeZoneInfo.Utc);
+            timeZone ?? TimeZoneInfo.Utc,
+            metricsCollector);
 
         return new SchedulerFixture(scheduler, status, db, provider);
     }
@@ -274,6 +401,18 @@ public class AutomationSchedulerServiceTests
         public void SetUtcNow(DateTimeOffset value) => _utcNow = value;
     }
 
+    private sealed class RecordingLogger<T> : ILogger<T>
+    {
+        public List<string> Messages { get; } = [];
+
+        public IDisposable? BeginScope<TState>(TState state) where TState : notnull => null;
+
+        public bool IsEnabled(LogLevel logLevel) => true;
+
+        public void Log<TState>(LogLevel logLevel, EventId eventId, TState state, Exception? exception, Func<TState, Exception?, string> formatter)
+            => Messages.Add(formatter(state, exception));
+    }
+
     private sealed class SchedulerFixture(
         AutomationSchedulerService service,
         AutomationRuntimeStatus status,
@@ -0,0 +1,77 @@
+using Microsoft.Extensions.Configuration;
+using SonosControl.Web.Services;
+using Xunit;
+
+namespace SonosControl.Tests;
+
+public class SimulatedTimeProviderTests
+{
+    [Fact]
+    public void FromConfiguration_WithoutStart_ReturnsNull()
+    {
+        var configuration = new ConfigurationBuilder().Build();
+
+        Assert.Null(SimulatedTimeProvider.FromConfiguration(configuration));
+    }
+
+    [Fact]
+    public void FromConfiguration_ParsesStartAsUtcAndSpeed()
+    {
+        var configuration = new ConfigurationBuilder()
+            .AddInMemoryCollection(new Dictionary<string, string?>
+            {
+                ["Automation:SimulatedClock:StartUtc"] = "2026-07-20T06:00:00",
+                ["Automation:SimulatedClock:Speed"] = "1440"
+            })
+            .Build();
+
+        var clock = SimulatedTimeProvider.FromConfiguration(configuration);
+
+        Assert.NotNull(clock);
+        Assert.Equal(new DateTimeOffset(2026, 7, 20, 6, 0, 0, TimeSpan.Zero), clock!.StartUtc);
+        Assert.Equal(1440, clock.Speed);
+    }
+
+    [Fact]
+    public void FromConfiguration_InvalidStart_Throws()
+    {
+        var configuration = new ConfigurationBuilder()
+            .AddInMemoryCollection(new Dictionary<string, string?>
+            {
+                ["Automation:SimulatedClock:StartUtc"] = "next tuesday"
+            })
+            .Build();
+
+        Assert.Throws<InvalidOperationException>(() => SimulatedTimeProvider.FromConfiguration(configuration));
+    }
+
+    [Fact]
+    public void Constructor_NonPositiveSpeed_Throws()
+    {
+        Assert.Throws<ArgumentOutOfRangeException>(() => new SimulatedTimeProvider(DateTimeOffset.UtcNow, 0));
+    }
+
+    [Fact]
+    public async Task GetUtcNow_AdvancesFasterThanWallClock()
+    {
+        var start = new DateTimeOffset(2026, 7, 20, 6, 0, 0, TimeSpan.Zero);
+        var clock = new SimulatedTimeProvider(start, 3600);
+
+        await Task.Delay(TimeSpan.FromMilliseconds(100));
+
+        Assert.True(clock.GetUtcNow() - start >= TimeSpan.FromMinutes(5));
+    }
+
+    [Fact]
+    public async Task Delay_CompletesAfterScaledWallClockTime()
+    {
+        var clock = new SimulatedTimeProvider(DateTimeOffset.UtcNow, 3600);
+        var before = clock.GetUtcNow();
+
+        var delay = Task.Delay(TimeSpan.FromMinutes(15), clock);
+        var completed = await Task.WhenAny(delay, Task.Delay(TimeSpan.FromSeconds(5)));
+
+        Assert.Same(delay, completed);
+        Assert.True(clock.GetUtcNow() - before >= TimeSpan.FromMinutes(15));
+    }
+}
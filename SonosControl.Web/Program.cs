@@ -9,12 +9,21 @@ using Microsoft.EntityFrameworkCore;
 using Microsoft.AspNetCore.DataProtection;
 using System.IO;
 using System.Globalization;
+using System.Diagnostics;
 
 using SonosControl.Web.Models; // For ApplicationUser
 using SonosControl.Web.Data;   // For ApplicationDbContext
 using Radzen;
 
 
+// Startup phases are logged once the host exists so cold-start regressions can be
+// broken down by the startup profiler (scripts/profile_startup.py).
+var startupPhases = new List<(string Phase, DateTime ReachedUtc)>
+{
+    ("process-start", Process.GetCurrentProcess().StartTime.ToUniversalTime()),
+    ("program-start", DateTime.UtcNow)
+};
+
 var builder = WebApplication.CreateBuilder(args);
 
 // Add services to the container.
@@ -54,7 +63,11 @@ builder.Services.AddSingleton<IDeviceHealthSnapshotStore, DeviceHealthSnapshotSt
 builder.Services.AddSingleton<AutomationRuntimeStatus>();
 builder.Services.AddSingleton<ConfiguredTimeZoneService>();
 builder.Services.AddSingleton<ISettingsSchemaMigrationService, SettingsSchemaMigrationService>();
-builder.Services.AddSingleton<AutomationSchedulerService>();
+// Simulation runs replace only the scheduler's clock; other services keep wall-clock time.
+var simulatedAutomationClock = SimulatedTimeProvider.FromConfiguration(builder.Configuration);
+builder.Services.AddSingleton(sp => simulatedAutomationClock is null
+    ? ActivatorUtilities.CreateInstance<AutomationSchedulerService>(sp)
+    : ActivatorUtilities.CreateInstance<AutomationSchedulerService>(sp, simulatedAutomationClock));
 builder.Services.AddSingleton<IAutomationScheduler>(sp => sp.GetRequiredService<AutomationSchedulerService>());
 if (builder.Configuration.GetValue("BackgroundServices:Enabled", true))
 {
@@ -138,11 +151,18 @@ builder.Services.AddDataProtection()
     .PersistKeysToFileSystem(new DirectoryInfo(keysDirectory));
 
 var app = builder.Build();
+startupPhases.Add(("host-build", DateTime.UtcNow));
+foreach (var (phase, reachedUtc) in startupPhases)
+{
+    LogStartupPhase(phase, reachedUtc);
+}
+
 using (var scope = app.Services.CreateScope())
 {
     var db = scope.ServiceProvider.GetRequiredService<ApplicationDbContext>();
     db.Database.Migrate(); // Apply pending migrations or create DB schema
 }
+LogStartupPhase("migrations", DateTime.UtcNow);
 
 // Seed admin user/role
 using (var scope = app.Services.CreateScope())
@@ -150,6 +170,8 @@ using (var scope = app.Services.CreateScope())
     var services = scope.ServiceProvider;
     await DataSeeder.SeedAdminUser(services);
 }
+LogStartupPhase("seeding", DateTime.UtcNow);
+app.Lifetime.ApplicationStarted.Register(() => LogStartupPhase("server-started", DateTime.UtcNow));
 
 if (!app.Environment.IsDevelopment())
 {
@@ -192,3 +214,11 @@ app.MapGet("/metricsz", (IMetricsCollector metricsCollector, IConfiguration conf
 app.MapFallbackToPage("/_Host");
 
 app.Run();
+
+void LogStartupPhase(string phase, DateTime reachedUtc)
+{
+    app.Logger.LogInformation(
+        "Startup phase {StartupPhase} reached at {ReachedAtUtc:O}.",
+        phase,
+        reachedUtc);
+}
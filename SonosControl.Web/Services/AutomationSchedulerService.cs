@@ -1,3 +1,4 @@
+using System.Diagnostics;
 using Microsoft.Extensions.DependencyInjection;
 using SonosControl.DAL.Interfaces;
 using SonosControl.DAL.Models;
@@ -20,6 +21,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
     private readonly ILogger<AutomationSchedulerService> _logger;
     private readonly TimeProvider _timeProvider;
     private readonly TimeZoneInfo _timeZone;
+    private readonly IMetricsCollector? _metricsCollector;
     private readonly SemaphoreSlim _evaluationLock = new(1, 1);
 
     private string? _activeWindowId;
@@ -32,7 +34,8 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         ILogger<AutomationSchedulerService> logger,
         IConfiguration configuration,
         TimeProvider? timeProvider = null,
-        TimeZoneInfo? timeZone = null)
+        TimeZoneInfo? timeZone = null,
+        IMetricsCollector? metricsCollector = null)
     {
         _scopeFactory = scopeFactory;
         _migrationService = migrationService;
@@ -40,6 +43,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         _logger = logger;
         _timeProvider = timeProvider ?? TimeProvider.System;
         _timeZone = timeZone ?? ResolveTimeZone(configuration["Automation:TimeZone"]);
+        _metricsCollector = metricsCollector;
     }
 
     public AutomationRuntimeSnapshot Status => _runtimeStatus.Snapshot;
@@ -47,6 +51,13 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
     protected override async Task ExecuteAsync(CancellationToken stoppingToken)
     {
         _logger.LogInformation("Canonical automation scheduler started in timezone {TimeZone}.", _timeZone.Id);
+        if (_timeProvider is SimulatedTimeProvider simulatedClock)
+        {
+            _logger.LogWarning(
+                "Automation scheduler is running on a simulated clock starting at {SimulatedStartUtc:O} at {SimulatedSpeed}x speed.",
+                simulatedClock.StartUtc,
+                simulatedClock.Speed);
+        }
 
         while (!stoppingToken.IsCancellationRequested)
         {
@@ -75,6 +86,9 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
             return;
         }
 
+        var evaluationStarted = Stopwatch.GetTimestamp();
+        var windowsEvaluated = 0;
+        var triggered = false;
         try
         {
             var migration = await _migrationService.MigrateIfRequiredAsync(cancellationToken);
@@ -107,6 +121,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
                 .Where(window => window.IsEnabled)
                 .Where(window => !string.IsNullOrWhiteSpace(window.SceneId) && validSceneIds.Contains(window.SceneId))
                 .ToList();
+            windowsEvaluated = eligibleWindows.Count;
 
             var utcNow = _timeProvider.GetUtcNow();
             var localNow = TimeZoneInfo.ConvertTime(utcNow, _timeZone);
@@ -118,7 +133,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
                 {
                     var oldWindow = settings.ScheduleWindows.FirstOrDefault(window =>
                         string.Equals(window.Id, _activeWindowId, StringComparison.OrdinalIgnoreCase));
-                    await StopWindowPlaybackAsync(oldWindow, settings, uow, actionLogger, cancellationToken);
+                    await StopWindowPlaybackAsync(oldWindow, settings, uow, actionLogger, _timeProvider, cancellationToken);
                     _activeWindowId = null;
                     _activeWindowAppliedUtc = default;
                 }
@@ -141,7 +156,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
                 var oldWindow = settings.ScheduleWindows.FirstOrDefault(window =>
                     string.Equals(window.Id, _activeWindowId, StringComparison.OrdinalIgnoreCase));
                 var newTargets = ResolveWindowTargetSpeakers(activeWindow, settings);
-                await StopWindowPlaybackAsync(oldWindow, settings, uow, actionLogger, cancellationToken, newTargets);
+                await StopWindowPlaybackAsync(oldWindow, settings, uow, actionLogger, _timeProvider, cancellationToken, newTargets);
             }
 
             var result = await sceneOrchestration.ApplySceneByIdAsync(
@@ -153,19 +168,33 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
             {
                 var message = $"Schedule '{activeWindow.Name}' could not apply scene: {result.Message}";
                 await actionLogger.LogAsync("ScheduleTriggerFailed", message);
+                _logger.LogWarning(
+                    "Schedule {ScheduleId} could not apply scene {SceneId} at {EvaluatedAtLocal:O}: {Reason}",
+                    activeWindow.Id,
+                    activeWindow.SceneId,
+                    localNow,
+                    result.Message);
                 _runtimeStatus.RecordEvaluation(null, utcNow, message);
                 return;
             }
 
             if (activeWindow.FadeInSeconds > 0 && result.TargetSpeakers.Count > 0)
             {
-                await ApplyFadeInAsync(result.TargetSpeakers, activeWindow.FadeInSeconds, uow, cancellationToken);
+                await ApplyFadeInAsync(result.TargetSpeakers, activeWindow.FadeInSeconds, uow, _timeProvider, cancellationToken);
             }
 
             await actionLogger.LogAsync(
                 "ScheduleTriggered",
                 $"Schedule '{activeWindow.Name}' triggered scene '{activeWindow.SceneId}'.");
-
+            _logger.LogInformation(
+                "Schedule {ScheduleId} triggered scene {SceneId} at {EvaluatedAtLocal:O} on {TargetCount} speaker(s) in {ElapsedMs:F1} ms.",
+                activeWindow.Id,
+                activeWindow.SceneId,
+                localNow,
+                result.TargetSpeakers.Count,
+                Stopwatch.GetElapsedTime(evaluationStarted).TotalMilliseconds);
+
+            triggered = true;
             _activeWindowId = activeWindow.Id;
             _activeWindowAppliedUtc = utcNow.UtcDateTime;
             _runtimeStatus.RecordEvaluation(activeWindow.Name, utcNow);
@@ -177,6 +206,11 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         }
         finally
         {
+            _metricsCollector?.RecordSchedulerEvaluation(
+                Stopwatch.GetElapsedTime(evaluationStarted),
+                _timeProvider.GetUtcNow(),
+                windowsEvaluated,
+                triggered);
             _evaluationLock.Release();
         }
     }
@@ -203,6 +237,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         SonosSettings settings,
         IUnitOfWork uow,
         ActionLogger actionLogger,
+        TimeProvider timeProvider,
         CancellationToken cancellationToken,
         IReadOnlyCollection<string>? excludeSpeakerIps = null)
     {
@@ -221,7 +256,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
 
         if ((window?.FadeOutSeconds ?? 0) > 0)
         {
-            await ApplyFadeOutAsync(targetSpeakers, window!.FadeOutSeconds, uow, cancellationToken);
+            await ApplyFadeOutAsync(targetSpeakers, window!.FadeOutSeconds, uow, timeProvider, cancellationToken);
         }
 
         await Task.WhenAll(targetSpeakers.Select(ip => uow.ISonosConnectorRepo.PausePlaying(ip)));
@@ -269,6 +304,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         IReadOnlyCollection<string> targetSpeakers,
         int fadeOutSeconds,
         IUnitOfWork uow,
+        TimeProvider timeProvider,
         CancellationToken cancellationToken)
     {
         var steps = Math.Clamp(fadeOutSeconds, 2, 20);
@@ -299,7 +335,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
                     Math.Max(0, (int)Math.Round(start * ratio)),
                     cancellationToken);
             }));
-            await Task.Delay(delay, cancellationToken);
+            await Task.Delay(delay, timeProvider, cancellationToken);
         }
     }
 
@@ -307,6 +343,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
         IReadOnlyCollection<string> targetSpeakers,
         int fadeInSeconds,
         IUnitOfWork uow,
+        TimeProvider timeProvider,
         CancellationToken cancellationToken)
     {
         var steps = Math.Clamp(fadeInSeconds, 2, 20);
@@ -340,7 +377,7 @@ public sealed class AutomationSchedulerService : BackgroundService, IAutomationS
                     Math.Max(1, (int)Math.Round(target * ratio)),
                     cancellationToken);
             }));
-            await Task.Delay(delay, cancellationToken);
+            await Task.Delay(delay, timeProvider, cancellationToken);
         }
     }
 }
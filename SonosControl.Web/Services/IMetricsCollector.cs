@@ -9,6 +9,7 @@ public interface IMetricsCollector
     void IncrementSonosCommandError(string commandName);
     void RecordPlaybackMonitorCycle(TimeSpan duration, int speakersProcessed, int sessionWrites);
     void RecordPlaybackSessionWrite(bool skippedByThrottle);
+    void RecordSchedulerEvaluation(TimeSpan duration, DateTimeOffset evaluatedAtUtc, int windowsEvaluated, bool triggered);
     AppMetricsSnapshot GetSnapshot();
 }
 
@@ -16,7 +17,8 @@ public sealed record AppMetricsSnapshot(
     DateTime GeneratedAtUtc,
     DashboardRefreshMetrics Dashboard,
     SonosCommandMetrics SonosCommands,
-    PlaybackMonitorMetrics PlaybackMonitor);
+    PlaybackMonitorMetrics PlaybackMonitor,
+    SchedulerMetrics Scheduler);
 
 public sealed record DashboardRefreshMetrics(
     long Successes,
@@ -38,3 +40,13 @@ public sealed record PlaybackMonitorMetrics(
     double MaxCycleDurationMs,
     IReadOnlyDictionary<string, long> CycleDurationBuckets,
     double AverageSpeakersPerCycle);
+
+public sealed record SchedulerMetrics(
+    long Evaluations,
+    long Triggers,
+    double AverageEvaluationDurationMs,
+    double AverageTriggerDurationMs,
+    double MaxEvaluationDurationMs,
+    IReadOnlyDictionary<string, long> EvaluationDurationBuckets,
+    double AverageWindowsPerEvaluation,
+    DateTimeOffset? LastEvaluationUtc);
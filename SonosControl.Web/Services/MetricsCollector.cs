@@ -22,6 +22,9 @@ public sealed class MetricsCollector : IMetricsCollector
     private readonly Counter<long> _playbackSessionWritesCounter = Meter.CreateCounter<long>("playback_session_writes_total");
     private readonly Counter<long> _playbackSessionWriteSkipsCounter = Meter.CreateCounter<long>("playback_session_write_skips_total");
 
+    private readonly Counter<long> _schedulerEvaluationCounter = Meter.CreateCounter<long>("scheduler_evaluations_total");
+    private readonly Histogram<double> _schedulerEvaluationDurationMs = Meter.CreateHistogram<double>("scheduler_evaluation_duration_ms");
+
     private long _dashboardRefreshSuccesses;
     private long _dashboardRefreshFailures;
     private long _dashboardSlowLaneRuns;
@@ -37,9 +40,20 @@ public sealed class MetricsCollector : IMetricsCollector
     private long _playbackSessionWrites;
     private long _playbackSessionWriteSkips;
 
+    // Idle scheduler evaluations finish well under a millisecond, so their
+    // durations are accumulated in ticks rather than whole milliseconds.
+    private long _schedulerEvaluations;
+    private long _schedulerTriggers;
+    private long _schedulerWindowsEvaluatedTotal;
+    private long _schedulerEvaluationDurationTicksTotal;
+    private long _schedulerTriggerDurationTicksTotal;
+    private long _schedulerEvaluationDurationTicksMax;
+    private long _schedulerLastEvaluationUtcTicks;
+
     private readonly ConcurrentDictionary<string, long> _sonosCommandErrorsByCommand = new(StringComparer.OrdinalIgnoreCase);
     private readonly ConcurrentDictionary<string, long> _dashboardDurationBuckets = new(StringComparer.OrdinalIgnoreCase);
     private readonly ConcurrentDictionary<string, long> _playbackCycleDurationBuckets = new(StringComparer.OrdinalIgnoreCase);
+    private readonly ConcurrentDictionary<string, long> _schedulerDurationBuckets = new(StringComparer.OrdinalIgnoreCase);
 
     public void RecordDashboardRefreshResult(bool success, bool slowLane, TimeSpan duration)
     {
@@ -102,6 +116,29 @@ public sealed class MetricsCollector : IMetricsCollector
         _playbackSessionWritesCounter.Add(1);
     }
 
+    public void RecordSchedulerEvaluation(TimeSpan duration, DateTimeOffset evaluatedAtUtc, int windowsEvaluated, bool triggered)
+    {
+        var durationTicks = Math.Max(0, duration.Ticks);
+
+        // The scheduler may run on a simulated clock, so keep its own notion of "now".
+        Interlocked.Exchange(ref _schedulerLastEvaluationUtcTicks, evaluatedAtUtc.UtcTicks);
+
+        Interlocked.Increment(ref _schedulerEvaluations);
+        Interlocked.Add(ref _schedulerWindowsEvaluatedTotal, Math.Max(0, windowsEvaluated));
+        Interlocked.Add(ref _schedulerEvaluationDurationTicksTotal, durationTicks);
+        UpdateMax(ref _schedulerEvaluationDurationTicksMax, durationTicks);
+        IncrementBucket(_schedulerDurationBuckets, GetDurationBucket((long)duration.TotalMilliseconds));
+
+        if (triggered)
+        {
+            Interlocked.Increment(ref _schedulerTriggers);
+            Interlocked.Add(ref _schedulerTriggerDurationTicksTotal, durationTicks);
+        }
+
+        _schedulerEvaluationCounter.Add(1, new KeyValuePair<string, object?>("triggered", triggered));
+        _schedulerEvaluationDurationMs.Record(duration.TotalMilliseconds);
+    }
+
     public AppMetricsSnapshot GetSnapshot()
     {
         var dashboardSuccesses = Interlocked.Read(ref _dashboardRefreshSuccesses);
@@ -117,6 +154,19 @@ public sealed class MetricsCollector : IMetricsCollector
             ? 0
             : (double)Interlocked.Read(ref _playbackMonitorSpeakersProcessedTotal) / playbackCycles;
 
+        var schedulerEvaluations = Interlocked.Read(ref _schedulerEvaluations);
+        var schedulerTriggers = Interlocked.Read(ref _schedulerTriggers);
+        var schedulerAverageDurationMs = schedulerEvaluations == 0
+            ? 0
+            : TimeSpan.FromTicks(Interlocked.Read(ref _schedulerEvaluationDurationTicksTotal)).TotalMilliseconds / schedulerEvaluations;
+        var schedulerAverageTriggerDurationMs = schedulerTriggers == 0
+            ? 0
+            : TimeSpan.FromTicks(Interlocked.Read(ref _schedulerTriggerDurationTicksTotal)).TotalMilliseconds / schedulerTriggers;
+        var averageWindows = schedulerEvaluations == 0
+            ? 0
+            : (double)Interlocked.Read(ref _schedulerWindowsEvaluatedTotal) / schedulerEvaluations;
+        var schedulerLastEvaluationTicks = Interlocked.Read(ref _schedulerLastEvaluationUtcTicks);
+
         return new AppMetricsSnapshot(
             GeneratedAtUtc: DateTime.UtcNow,
             Dashboard: new DashboardRefreshMetrics(
@@ -136,7 +186,18 @@ public sealed class MetricsCollector : IMetricsCollector
                 AverageCycleDurationMs: playbackAverageDurationMs,
                 MaxCycleDurationMs: Interlocked.Read(ref _playbackMonitorCycleDurationMsMax),
                 CycleDurationBuckets: SnapshotDictionary(_playbackCycleDurationBuckets),
-                AverageSpeakersPerCycle: averageSpeakers));
+                AverageSpeakersPerCycle: averageSpeakers),
+            Scheduler: new SchedulerMetrics(
+                Evaluations: schedulerEvaluations,
+                Triggers: schedulerTriggers,
+                AverageEvaluationDurationMs: schedulerAverageDurationMs,
+                AverageTriggerDurationMs: schedulerAverageTriggerDurationMs,
+                MaxEvaluationDurationMs: TimeSpan.FromTicks(Interlocked.Read(ref _schedulerEvaluationDurationTicksMax)).TotalMilliseconds,
+                EvaluationDurationBuckets: SnapshotDictionary(_schedulerDurationBuckets),
+                AverageWindowsPerEvaluation: averageWindows,
+                LastEvaluationUtc: schedulerLastEvaluationTicks == 0
+                    ? null
+                    : new DateTimeOffset(schedulerLastEvaluationTicks, TimeSpan.Zero)));
     }
 
     private static IReadOnlyDictionary<string, long> SnapshotDictionary(ConcurrentDictionary<string, long> source)
@@ -0,0 +1,79 @@
+using System.Globalization;
+
+namespace SonosControl.Web.Services;
+
+/// <summary>
+/// Clock for the automation scheduler that starts at a configured instant and runs
+/// <see cref="Speed"/> times faster than the wall clock. Timers are shortened by the
+/// same factor, so the scheduler's poll loop, fades and window transitions all follow
+/// virtual time. Only used when <c>Automation:SimulatedClock:StartUtc</c> is set.
+/// </summary>
+public sealed class SimulatedTimeProvider : TimeProvider
+{
+    private readonly long _startTimestamp;
+
+    public SimulatedTimeProvider(DateTimeOffset startUtc, double speed)
+    {
+        if (!double.IsFinite(speed) || speed <= 0)
+        {
+            throw new ArgumentOutOfRangeException(nameof(speed), speed, "Simulated clock speed must be a positive number.");
+        }
+
+        StartUtc = startUtc.ToUniversalTime();
+        Speed = speed;
+        _startTimestamp = TimeProvider.System.GetTimestamp();
+    }
+
+    public DateTimeOffset StartUtc { get; }
+    public double Speed { get; }
+
+    public static SimulatedTimeProvider? FromConfiguration(IConfiguration configuration)
+    {
+        var configuredStart = configuration["Automation:SimulatedClock:StartUtc"];
+        if (string.IsNullOrWhiteSpace(configuredStart))
+        {
+            return null;
+        }
+
+        if (!DateTimeOffset.TryParse(
+                configuredStart,
+                CultureInfo.InvariantCulture,
+                DateTimeStyles.AssumeUniversal | DateTimeStyles.AdjustToUniversal,
+                out var startUtc))
+        {
+            throw new InvalidOperationException(
+                $"Automation:SimulatedClock:StartUtc '{configuredStart}' is not a valid timestamp.");
+        }
+
+        return new SimulatedTimeProvider(startUtc, configuration.GetValue("Automation:SimulatedClock:Speed", 60d));
+    }
+
+    public override DateTimeOffset GetUtcNow()
+    {
+        var elapsed = TimeProvider.System.GetElapsedTime(_startTimestamp);
+        return StartUtc + TimeSpan.FromTicks((long)(elapsed.Ticks * Speed));
+    }
+
+    public override ITimer CreateTimer(TimerCallback callback, object? state, TimeSpan dueTime, TimeSpan period)
+        => new ScaledTimer(TimeProvider.System.CreateTimer(callback, state, ToWallClock(dueTime), ToWallClock(period)), this);
+
+    private TimeSpan ToWallClock(TimeSpan virtualDuration)
+    {
+        if (virtualDuration == Timeout.InfiniteTimeSpan || virtualDuration <= TimeSpan.Zero)
+        {
+            return virtualDuration;
+        }
+
+        return TimeSpan.FromTicks(Math.Max(1, (long)(virtualDuration.Ticks / Speed)));
+    }
+
+    private sealed class ScaledTimer(ITimer inner, SimulatedTimeProvider clock) : ITimer
+    {
+        public bool Change(TimeSpan dueTime, TimeSpan period)
+            => inner.Change(clock.ToWallClock(dueTime), clock.ToWallClock(period));
+
+        public void Dispose() => inner.Dispose();
+
+        public ValueTask DisposeAsync() => inner.DisposeAsync();
+    }
+}
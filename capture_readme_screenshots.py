@@ -1,8 +1,10 @@
 import argparse
+import asyncio
 import os
 import platform
 import shutil
 import subprocess
+import sys
 import tempfile
 import time
 from pathlib import Path
@@ -10,7 +12,11 @@ from typing import Optional
 from urllib.error import HTTPError, URLError
 from urllib.request import urlopen
 
-from playwright.sync_api import expect, sync_playwright
+from playwright.async_api import async_playwright, expect
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import seed_demo_data  # noqa: E402
+import ui_scheduler  # noqa: E402
 
 
 CHROME_PATH = os.getenv("PLAYWRIGHT_CHROME_PATH")
@@ -75,12 +81,12 @@ def resolve_chrome_path() -> Optional[str]:
     return None
 
 
-def launch_chromium(playwright):
+async def launch_chromium(playwright):
     executable_path = resolve_chrome_path()
     if executable_path:
-        return playwright.chromium.launch(headless=True, executable_path=executable_path)
+        return await playwright.chromium.launch(headless=True, executable_path=executable_path)
 
-    return playwright.chromium.launch(headless=True)
+    return await playwright.chromium.launch(headless=True)
 
 
 def start_local_server(base_url: str, project_root: Path):
@@ -165,32 +171,32 @@ def get_login_attempts(username_arg: Optional[str], password_arg: Optional[str])
     return attempts
 
 
-def try_login(page, base_url: str, username: str, password: str) -> tuple[bool, str, str]:
-    page.goto(f"{base_url.rstrip('/')}/auth/login", wait_until="networkidle")
-    page.fill("#username", username)
-    page.fill("#password", password)
-    page.click("button#loginBtn")
-    page.wait_for_load_state("networkidle")
-    page.wait_for_timeout(300)
+async def try_login(page, base_url: str, username: str, password: str) -> tuple[bool, str, str]:
+    await page.goto(f"{base_url.rstrip('/')}/auth/login", wait_until="networkidle")
+    await page.fill("#username", username)
+    await page.fill("#password", password)
+    await page.click("button#loginBtn")
+    await page.wait_for_load_state("networkidle")
+    await page.wait_for_timeout(300)
 
     if "/auth/login" not in page.url:
         return True, page.url, ""
 
     error_text = ""
     error_alert = page.locator(".alert[role='alert']")
-    if error_alert.count() > 0:
-        error_text = error_alert.first.inner_text().strip()
+    if await error_alert.count() > 0:
+        error_text = (await error_alert.first.inner_text()).strip()
 
     return False, page.url, error_text
 
 
-def ensure_expected_heading(page, expected_text: str):
+async def ensure_expected_heading(page, expected_text: str):
     main_content = page.locator("article.content")
-    expect(main_content.get_by_text(expected_text).first).to_be_visible(timeout=10000)
+    await expect(main_content.get_by_text(expected_text).first).to_be_visible(timeout=10000)
 
 
-def apply_theme(page, theme: str):
-    page.evaluate(
+async def apply_theme(page, theme: str):
+    await page.evaluate(
         """
         theme => {
             if (window.sonosTheme && typeof window.sonosTheme.apply === "function") {
@@ -202,33 +208,93 @@ def apply_theme(page, theme: str):
         """,
         theme,
     )
-    page.wait_for_timeout(200)
+    await page.wait_for_timeout(200)
+
+
+async def capture_route(page, base_url: str, route: str, expected_text: str, theme: str) -> bytes:
+    await page.goto(f"{base_url.rstrip('/')}{route}", wait_until="networkidle")
+    await ensure_expected_heading(page, expected_text)
+    await apply_theme(page, theme)
+    await page.keyboard.press("Escape")
+    await page.mouse.move(1, 1)
+    await page.wait_for_timeout(200)
+    return await page.screenshot(full_page=False)
+
+
+async def capture_lane(
+    browser,
+    storage_state: dict,
+    base_url: str,
+    viewport_label: str,
+    viewport: dict,
+    theme: str,
+    output_dir: Path,
+    scheduler: ui_scheduler.CellScheduler,
+):
+    """Capture every route for one viewport/theme pair; files are written while the next route loads."""
+    context = await browser.new_context(viewport=viewport, storage_state=storage_state)
+    try:
+        page = await context.new_page()
+        for route, slug, expected_text in ROUTES:
+            output_path = output_dir / f"{viewport_label}-{theme}-{slug}.png"
+            async with scheduler.slot("chromium", base_url):
+                data = await capture_route(page, base_url, route, expected_text, theme)
+            scheduler.write_file(output_path, data)
+            print(f"Captured {output_path}")
+    finally:
+        await context.close()
 
 
-def capture_route(page, base_url: str, route: str, expected_text: str, theme: str, output_path: Path):
-    page.goto(f"{base_url.rstrip('/')}{route}", wait_until="networkidle")
-    ensure_expected_heading(page, expected_text)
-    apply_theme(page, theme)
-    page.keyboard.press("Escape")
-    page.mouse.move(1, 1)
-    page.wait_for_timeout(200)
-    page.screenshot(path=str(output_path), full_page=False)
+async def capture_all(args, output_dir: Path, desktop_viewport: dict, mobile_viewport: dict):
+    async with async_playwright() as playwright:
+        browser = await launch_chromium(playwright)
+        context = await browser.new_context(viewport=desktop_viewport)
+        page = await context.new_page()
 
+        login_attempt_errors = []
+        login_succeeded = False
+        for username, password in get_login_attempts(args.username, args.password):
+            login_succeeded, current_url, error_text = await try_login(page, args.base_url, username, password)
+            if login_succeeded:
+                print(f"Login succeeded with user '{username}'.")
+                break
 
-def capture_viewport_set(page, base_url: str, viewport_label: str, viewport: dict, output_dir: Path):
-    page.set_viewport_size(viewport)
-    for theme in THEMES:
-        for route, slug, expected_text in ROUTES:
-            output_path = output_dir / f"{viewport_label}-{theme}-{slug}.png"
-            capture_route(page, base_url, route, expected_text, theme, output_path)
-            print(f"Captured {output_path}")
+            login_attempt_errors.append(
+                f"{username}@{current_url} ({error_text or 'no error message'})"
+            )
+
+        if not login_succeeded:
+            failure_path = output_dir / "readme_login_failure.png"
+            await page.screenshot(path=str(failure_path), full_page=False)
+            attempts_description = "; ".join(login_attempt_errors) or "none"
+            await browser.close()
+            raise RuntimeError(
+                "Unable to log in. Provide credentials with --username/--password or set env vars. "
+                f"Attempt results: {attempts_description}"
+            )
+
+        storage_state = await context.storage_state()
+        await context.close()
+
+        scheduler = ui_scheduler.CellScheduler(args.concurrency, args.server_concurrency)
+        try:
+            await asyncio.gather(
+                *[
+                    capture_lane(browser, storage_state, args.base_url, label, viewport, theme, output_dir, scheduler)
+                    for label, viewport in (("desktop", desktop_viewport), ("mobile", mobile_viewport))
+                    for theme in THEMES
+                ]
+            )
+        finally:
+            await scheduler.drain()
+        await browser.close()
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
         description=(
             "Capture README screenshots for desktop and mobile routes. "
-            "For best visual results, prepare representative demo data (stations/log entries/users) before running."
+            "For best visual results, pass --demo-data to seed representative stations, scenes, users and history."
         )
     )
     parser.add_argument("--base-url", default=os.getenv("README_SCREENSHOT_BASE_URL", "http://localhost:5107"))
@@ -239,6 +305,20 @@ def parse_args():
     parser.add_argument("--mobile-viewport", default="390x844")
     parser.add_argument("--server-timeout", type=int, default=180)
     parser.add_argument("--no-autostart", action="store_true")
+    parser.add_argument(
+        "--demo-data",
+        choices=["none", *sorted(seed_demo_data.SCALES)],
+        default="none",
+        help="Seed the auto-started runtime with demo data at this scale before capturing.",
+    )
+    parser.add_argument("--demo-seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4, help="Pages captured at once per browser (default: 4)")
+    parser.add_argument(
+        "--server-concurrency",
+        type=int,
+        default=4,
+        help="Page loads in flight against the server at once (default: 4)",
+    )
     return parser.parse_args()
 
 
@@ -253,8 +333,12 @@ def run():
     desktop_viewport = parse_viewport(args.desktop_viewport)
     mobile_viewport = parse_viewport(args.mobile_viewport)
 
+    if args.demo_data != "none" and args.no_autostart:
+        raise ValueError("--demo-data seeds the auto-started runtime and cannot be combined with --no-autostart.")
+
     print("Preparing README screenshot capture.")
-    print("Tip: Use populated demo data for marketing-ready screenshots.")
+    if args.demo_data == "none":
+        print("Tip: Pass --demo-data medium for marketing-ready screenshots.")
     print(f"Output directory: {output_dir}")
 
     server_process = None
@@ -273,6 +357,14 @@ def run():
                 f"Timed out waiting for {args.base_url} (server exit code: {exit_code}). "
                 f"Check server log: {server_log_path}"
             )
+        if args.demo_data != "none":
+            summary = seed_demo_data.seed_runtime(runtime_dir, args.demo_data, args.demo_seed)
+            print(f"Seeded {args.demo_data} demo data in {summary['seconds']}s.")
+    elif args.demo_data != "none":
+        raise RuntimeError(
+            f"--demo-data needs an auto-started isolated runtime, but {args.base_url} is already serving. "
+            "Stop that server or omit --demo-data."
+        )
 
     if not is_server_reachable(args.base_url):
         raise RuntimeError(
@@ -280,43 +372,11 @@ def run():
             "Start the app manually or omit --no-autostart."
         )
 
-    with sync_playwright() as playwright:
-        browser = launch_chromium(playwright)
-        context = browser.new_context(viewport=desktop_viewport)
-        page = context.new_page()
-
-        login_attempt_errors = []
-        login_succeeded = False
-        for username, password in get_login_attempts(args.username, args.password):
-            login_succeeded, current_url, error_text = try_login(page, args.base_url, username, password)
-            if login_succeeded:
-                print(f"Login succeeded with user '{username}'.")
-                break
-
-            login_attempt_errors.append(
-                f"{username}@{current_url} ({error_text or 'no error message'})"
-            )
-
-        if not login_succeeded:
-            failure_path = output_dir / "readme_login_failure.png"
-            page.screenshot(path=str(failure_path), full_page=False)
-            attempts_description = "; ".join(login_attempt_errors) or "none"
-            browser.close()
-            if started_local_server:
-                stop_local_server(server_process, server_log_stream, runtime_dir)
-            raise RuntimeError(
-                "Unable to log in. Provide credentials with --username/--password or set env vars. "
-                f"Attempt results: {attempts_description}"
-            )
-
-        capture_viewport_set(page, args.base_url, "desktop", desktop_viewport, output_dir)
-        capture_viewport_set(page, args.base_url, "mobile", mobile_viewport, output_dir)
-
-        context.close()
-        browser.close()
-
-    if started_local_server:
-        stop_local_server(server_process, server_log_stream, runtime_dir)
+    try:
+        asyncio.run(capture_all(args, output_dir, desktop_viewport, mobile_viewport))
+    finally:
+        if started_local_server:
+            stop_local_server(server_process, server_log_stream, runtime_dir)
 
     print("README screenshot capture complete.")
 
@@ -5,6 +5,8 @@ param(
     [string]$Out = "docs/assets/readme/images",
     [string]$DesktopViewport = "1280x900",
     [string]$MobileViewport = "390x844",
+    [ValidateSet("none", "small", "medium", "large")]
+    [string]$DemoData = "none",
     [switch]$NoAutoStart
 )
 
@@ -29,6 +31,10 @@ if ($Password) {
     $args += @("--password", $Password)
 }
 
+if ($DemoData -ne "none") {
+    $args += @("--demo-data", $DemoData)
+}
+
 if ($NoAutoStart) {
     $args += "--no-autostart"
 }
@@ -0,0 +1,162 @@
+"""
+Minimal asyncio HTTP/1.1 client for the load benchmarks.
+
+The perf tools avoid third-party HTTP stacks, and urllib blocks a thread per
+request, which caps how much load one process can offer. This client opens one
+connection per request (`Connection: close`) on asyncio streams, so thousands
+of requests can be in flight from a single event loop, and it exposes the
+timings the benchmarks need: time to the status line (TTFB) and incremental
+body reads that can stop, and drop the connection, at any byte.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+
+class HttpClientError(Exception):
+    """Raised for connection failures, timeouts and malformed responses."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    ttfb: float
+    elapsed: float
+
+
+@dataclass
+class StreamingResponse:
+    status: int
+    headers: dict[str, str]
+    ttfb: float
+    started: float
+    _reader: asyncio.StreamReader = field(repr=False)
+    _writer: asyncio.StreamWriter = field(repr=False)
+
+    @property
+    def content_length(self) -> Optional[int]:
+        value = self.headers.get("content-length")
+        return int(value) if value and value.isdigit() else None
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yield the body as it arrives, decoding chunked transfer encoding."""
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self._reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                remaining = size
+                while remaining:
+                    data = await self._reader.read(min(chunk_size, remaining))
+                    if not data:
+                        raise HttpClientError("Connection closed inside a chunk.")
+                    remaining -= len(data)
+                    yield data
+                await self._reader.readexactly(2)
+            return
+
+        remaining = self.content_length
+        while remaining is None or remaining > 0:
+            data = await self._reader.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not data:
+                if remaining:
+                    raise HttpClientError(f"Connection closed with {remaining} body bytes outstanding.")
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            yield data
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def close(self):
+        """Close the connection; called early, this is a client disconnect mid-stream."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def open_response(
+    method: str,
+    url: str,
+    headers: Optional[dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    timeout: float = 30,
+) -> StreamingResponse:
+    """Send a request and return once the status line and headers have arrived."""
+    parts = urlsplit(url)
+    if parts.scheme != "http":
+        raise HttpClientError(f"Only http:// URLs are supported: {url}")
+    host = parts.hostname or "localhost"
+    port = parts.port or 80
+    target = parts.path or "/"
+    if parts.query:
+        target += f"?{parts.query}"
+
+    request_headers = {
+        "Host": parts.netloc,
+        "Connection": "close",
+        "Accept": "*/*",
+        **(headers or {}),
+    }
+    if body is not None:
+        request_headers["Content-Length"] = str(len(body))
+    head = f"{method} {target} HTTP/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+
+    started = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        ttfb = time.perf_counter() - started
+        fields = status_line.decode("latin-1").split(" ", 2)
+        if len(fields) < 2 or not fields[1].isdigit():
+            raise HttpClientError(f"Malformed status line: {status_line!r}")
+        response_headers: dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+        if writer is not None:
+            writer.close()
+        raise HttpClientError(f"{type(error).__name__}: {error}") from error
+    except HttpClientError:
+        writer.close()
+        raise
+
+    return StreamingResponse(int(fields[1]), response_headers, ttfb, started, reader, writer)
+
+
+async def request(
+    method: str,
+    url: str,
+    headers: Optional[dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    timeout: float = 30,
+) -> HttpResponse:
+    """Send a request and read the whole response within `timeout` seconds."""
+    response = await open_response(method, url, headers, body, timeout)
+    try:
+        payload = await asyncio.wait_for(response.read(), timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+        raise HttpClientError(f"{type(error).__name__}: {error}") from error
+    finally:
+        await response.close()
+    return HttpResponse(response.status, response.headers, payload, response.ttfb, time.perf_counter() - response.started)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Measure how many concurrent Blazor circuits one SonosControl.Web instance can serve.
+
+Ramps up M authenticated browser contexts that sit on the home dashboard (with
+the global player), and for each step records:
+- server CPU and RSS of the `dotnet` process tree,
+- dashboard refresh durations from `/metricsz` during the hold window,
+- UI update latency: a client-side `Blazor.navigateTo` round trip through the circuit.
+
+The result is a latency-vs-circuits curve written to JSON and CSV.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import time
+from pathlib import Path
+
+from playwright.sync_api import expect, sync_playwright
+
+import perf_results
+import sonos_harness as harness
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ramp concurrent Blazor circuits and record a latency curve.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", harness.DEFAULT_BASE_URL))
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--steps", default="1,2,4,8,16,32", help="Comma-separated circuit counts (default: 1,2,4,8,16,32)")
+    parser.add_argument("--hold-seconds", type=float, default=30, help="Idle window per step while sampling (default: 30)")
+    parser.add_argument("--probes", type=int, default=10, help="UI latency probes per step (default: 10)")
+    parser.add_argument("--viewport", default="768x1024", help="Tablet-sized viewport as WIDTHxHEIGHT")
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--no-autostart", action="store_true")
+    parser.add_argument(
+        "--demo-data",
+        choices=["small", "medium", "large"],
+        default=None,
+        help="Seed the isolated runtime with demo data at this scale (see seed_demo_data.py)",
+    )
+    parser.add_argument("--out", default="artifacts/perf/concurrent_circuits.json")
+    return parser.parse_args()
+
+
+def parse_steps(raw: str) -> list[int]:
+    steps = sorted({int(part) for part in raw.split(",") if part.strip()})
+    if not steps or steps[0] < 1:
+        raise ValueError("--steps must contain positive circuit counts.")
+    return steps
+
+
+def parse_viewport(viewport: str) -> dict:
+    width, height = (int(part) for part in viewport.lower().split("x"))
+    return {"width": width, "height": height}
+
+
+def open_circuit(browser, base_url: str, storage_state: dict, viewport: dict):
+    context = browser.new_context(viewport=viewport, storage_state=storage_state)
+    page = context.new_page()
+    errors: list[str] = []
+    page.on("pageerror", lambda error: errors.append(str(error)))
+    page.goto(f"{base_url}/", wait_until="networkidle")
+    expect(page.locator("[data-qa='home-dashboard']")).to_be_visible(timeout=30000)
+    expect(page.locator("[data-qa='global-player-bar']")).to_be_visible(timeout=30000)
+    return context, page, errors
+
+
+def probe_ui_latency(page) -> float:
+    """Time a client-side navigation away from and back to the dashboard through the circuit."""
+    started = time.perf_counter()
+    page.evaluate("() => Blazor.navigateTo('/library')")
+    expect(page.locator("article.content").get_by_text("Library", exact=True).first).to_be_visible(timeout=30000)
+    page.evaluate("() => Blazor.navigateTo('/')")
+    expect(page.locator("[data-qa='home-dashboard']")).to_be_visible(timeout=30000)
+    return (time.perf_counter() - started) * 1000 / 2
+
+
+def write_csv(path: Path, steps: list[dict]):
+    with path.open("w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow([
+            "circuits", "open_seconds", "cpu_mean", "cpu_p95", "rss_max_mb",
+            "refreshes", "refresh_mean_ms", "ui_p50_ms", "ui_p95_ms", "page_errors",
+        ])
+        for step in steps:
+            writer.writerow([
+                step["circuits"],
+                step["open_seconds"],
+                step["resources"]["cpu_percent"]["mean"],
+                step["resources"]["cpu_percent"]["p95"],
+                step["resources"]["rss_mb"]["max"],
+                step["dashboard"]["refreshes"],
+                step["dashboard"]["mean_duration_ms"],
+                step["ui_latency_ms"]["median"],
+                step["ui_latency_ms"]["p95"],
+                step["page_errors"],
+            ])
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    steps = parse_steps(args.steps)
+    viewport = parse_viewport(args.viewport)
+    username, password = harness.default_credentials(args.username, args.password)
+
+    server = harness.ensure_server(
+        base_url,
+        "perf-circuits",
+        not args.no_autostart,
+        args.server_timeout,
+        demo_scale=args.demo_data,
+    )
+    sampler = None
+    server_pid = harness.find_server_pid(server) or (int(os.environ["PERF_SERVER_PID"]) if os.getenv("PERF_SERVER_PID") else None)
+    if server_pid:
+        sampler = harness.ProcessSampler(server_pid)
+        sampler.start()
+    else:
+        print("Server was not started by this run; set PERF_SERVER_PID to sample CPU/RSS.")
+
+    results: list[dict] = []
+    samples: dict[str, list[float]] = {}
+    circuits: list[tuple] = []
+    try:
+        with sync_playwright() as playwright:
+            browser = harness.launch_chromium(playwright)
+            login_context = browser.new_context(viewport=viewport)
+            login_page = login_context.new_page()
+            login_page.goto(f"{base_url}/auth/login", wait_until="networkidle")
+            login_page.fill("#username", username)
+            login_page.fill("#password", password)
+            login_page.click("button#loginBtn")
+            login_page.wait_for_load_state("networkidle")
+            if "/auth/login" in login_page.url:
+                raise RuntimeError(f"Unable to log in as '{username}'. Pass --username/--password.")
+            storage_state = login_context.storage_state()
+            login_context.close()
+
+            for target in steps:
+                open_started = time.perf_counter()
+                while len(circuits) < target:
+                    circuits.append(open_circuit(browser, base_url, storage_state, viewport))
+                open_seconds = round(time.perf_counter() - open_started, 2)
+
+                metrics_before = harness.fetch_metrics(base_url)
+                sample_mark = sampler.mark() if sampler else 0
+                hold_started = time.perf_counter()
+                probe_spacing = args.hold_seconds / max(args.probes, 1)
+                latencies: list[float] = []
+                for index in range(args.probes + 1):
+                    # Idle through Playwright so every page keeps servicing its circuit.
+                    remaining = hold_started + probe_spacing * index - time.perf_counter()
+                    if remaining > 0:
+                        circuits[0][1].wait_for_timeout(remaining * 1000)
+                    if index < args.probes:
+                        _, page, _ = circuits[index % len(circuits)]
+                        latencies.append(probe_ui_latency(page))
+                metrics_after = harness.fetch_metrics(base_url)
+
+                step = {
+                    "circuits": target,
+                    "open_seconds": open_seconds,
+                    "resources": sampler.window(sample_mark) if sampler else harness.empty_resource_window(),
+                    "dashboard": harness.dashboard_metrics_delta(metrics_before, metrics_after),
+                    "ui_latency_ms": harness.summarize(latencies),
+                    "page_errors": sum(len(errors) for _, _, errors in circuits),
+                }
+                results.append(step)
+                samples[f"ui-latency@{target}"] = latencies
+                print(
+                    f"{target:>4} circuits: ui p50={harness.format_value(step['ui_latency_ms']['median'])}ms "
+                    f"p95={harness.format_value(step['ui_latency_ms']['p95'])}ms, "
+                    f"refresh mean={harness.format_value(step['dashboard']['mean_duration_ms'])}ms, "
+                    f"cpu mean={harness.format_value(step['resources']['cpu_percent']['mean'])}%"
+                )
+
+            for context, _, _ in circuits:
+                context.close()
+            browser.close()
+    finally:
+        if sampler:
+            sampler.stop()
+        if server:
+            harness.stop_local_server(server[0], server[1], server[3])
+
+    print()
+    harness.print_table(
+        ["circuits", "cpu%", "cpu% p95", "rss MB", "refreshes", "refresh ms", "ui p50 ms", "ui p95 ms"],
+        [
+            [
+                step["circuits"],
+                step["resources"]["cpu_percent"]["mean"],
+                step["resources"]["cpu_percent"]["p95"],
+                step["resources"]["rss_mb"]["max"],
+                step["dashboard"]["refreshes"],
+                step["dashboard"]["mean_duration_ms"],
+                step["ui_latency_ms"]["median"],
+                step["ui_latency_ms"]["p95"],
+            ]
+            for step in results
+        ],
+    )
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "concurrent-circuits",
+            "base_url": base_url,
+            "viewport": viewport,
+            "hold_seconds": args.hold_seconds,
+            "isolated_runtime": server is not None,
+            "demo_data": args.demo_data,
+            "steps": results,
+        },
+    )
+    write_csv(report_path.with_suffix(".csv"), results)
+    print(f"Report written to {report_path} (+ .csv)")
+    perf_results.record_run(
+        "concurrent-circuits",
+        samples,
+        parameters={"viewport": args.viewport, "hold_seconds": args.hold_seconds, "demo_data": args.demo_data},
+    )
+
+
+if __name__ == "__main__":
+    run()
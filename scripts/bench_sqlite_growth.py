@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite growth against Insights/Logs and analytics query latency.
+
+Grows synthetic `PlaybackStats` and `Logs` rows in an isolated runtime database
+in steps, and after each step times:
+- `GET /insights` and `GET /logs` (server-prerendered, so page queries run),
+- `GET /api/analytics/summary` for the default and the full window,
+- `GET /api/analytics/export.csv`.
+
+Reports latency vs. row count and database file size, plus `EXPLAIN QUERY PLAN`
+output for the hot queries classified as index search, index scan, or full
+scan, so coverage by the `AddLogPlaybackIndexes` indexes can be checked.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+
+import perf_results
+import seed_demo_data as demo
+import sonos_harness as harness
+
+
+SPEAKERS = demo.ROOM_NAMES[:8]
+USERS = [name.lower() for name in demo.FIRST_NAMES[:6]] + [harness.DEFAULT_ADMIN_USERNAME, "Unknown"]
+MEDIA = [
+    ("Station", demo.STATION_NAMES[:6]),
+    ("Spotify", demo.SPOTIFY_NAMES),
+    ("YouTube Music", ["YouTube Music"]),
+    ("YouTube", ["YouTube"]),
+]
+ENDPOINTS = [
+    ("insights", "/insights"),
+    ("logs", "/logs"),
+    ("summary-30d", "/api/analytics/summary"),
+    ("summary-all", "/api/analytics/summary?fromUtc={from_utc}"),
+    ("export-csv", "/api/analytics/export.csv"),
+]
+HOT_QUERIES = [
+    ("logs-page", "SELECT * FROM Logs ORDER BY Timestamp DESC LIMIT 100", ()),
+    ("logs-users", "SELECT DISTINCT PerformedBy FROM Logs ORDER BY PerformedBy", ()),
+    ("logs-user-filter", "SELECT * FROM Logs WHERE PerformedBy = ? ORDER BY Timestamp DESC LIMIT 100", (USERS[0],)),
+    ("stats-window", "SELECT Timestamp, PerformedBy FROM Logs WHERE Timestamp >= ?", ("{window}",)),
+    (
+        "stats-leaderboard",
+        "SELECT PerformedBy, COUNT(*) FROM Logs WHERE Timestamp >= ? AND Action IN ('Station Changed', 'Playback Started') "
+        "GROUP BY PerformedBy ORDER BY COUNT(*) DESC LIMIT 5",
+        ("{window}",),
+    ),
+    ("summary-actions-by-day", "SELECT date(Timestamp), COUNT(*) FROM Logs WHERE Timestamp >= ? AND Timestamp <= ? GROUP BY date(Timestamp)", ("{window}", "{now}")),
+    ("playback-duration", "SELECT SUM(DurationSeconds) FROM PlaybackStats WHERE StartTime >= ?", ("{window}",)),
+    ("playback-longest", "SELECT * FROM PlaybackStats WHERE StartTime >= ? ORDER BY DurationSeconds DESC LIMIT 1", ("{window}",)),
+    (
+        "summary-top-media",
+        "SELECT TrackName, MediaType, SUM(DurationSeconds), COUNT(*) FROM PlaybackStats WHERE StartTime >= ? AND StartTime <= ? "
+        "GROUP BY TrackName, MediaType ORDER BY SUM(DurationSeconds) DESC LIMIT 10",
+        ("{window}", "{now}"),
+    ),
+    (
+        "summary-speaker-filter",
+        "SELECT COUNT(*) FROM PlaybackStats WHERE StartTime >= ? AND StartTime <= ? AND SpeakerName = ?",
+        ("{window}", "{now}", SPEAKERS[0]),
+    ),
+    ("export-csv", "SELECT * FROM PlaybackStats WHERE StartTime >= ? AND StartTime <= ? ORDER BY StartTime DESC", ("{window}", "{now}")),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Grow playback history/logs and time Insights, Logs and analytics endpoints.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", "http://localhost:5118"))
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument(
+        "--sizes",
+        default="10000,50000,100000,250000,500000",
+        help="Comma-separated row targets per table (default: 10000,50000,100000,250000,500000)",
+    )
+    parser.add_argument("--days", type=int, default=180, help="History span the rows are spread over (default: 180)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed requests per endpoint and step (default: 5)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--out", default="artifacts/perf/sqlite_growth.json")
+    return parser.parse_args()
+
+
+def table_count(db_path: Path, table: str) -> int:
+    with sqlite3.connect(db_path, timeout=30) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def database_size_mb(db_path: Path) -> float:
+    total = 0
+    for suffix in ("", "-wal", "-shm"):
+        path = Path(f"{db_path}{suffix}")
+        if path.exists():
+            total += path.stat().st_size
+    return round(total / (1024 * 1024), 2)
+
+
+def time_endpoint(opener, url: str, repeats: int) -> tuple[dict, list[float]]:
+    timings: list[float] = []
+    errors = 0
+    for attempt in range(repeats + 1):
+        started = time.perf_counter()
+        try:
+            with opener.open(url, timeout=120) as response:
+                response.read()
+        except (HTTPError, URLError, TimeoutError, OSError):
+            errors += 1
+            continue
+        if attempt > 0:
+            timings.append((time.perf_counter() - started) * 1000)
+    return {**harness.summarize(timings), "errors": errors}, timings
+
+
+def classify_plan(details: list[str]) -> str:
+    """Return the worst table access in a plan: `search`, `index-scan` or `full-scan`."""
+    scans = [detail for detail in details if detail.startswith("SCAN")]
+    if any("USING" not in detail for detail in scans):
+        return "full-scan"
+    if scans:
+        return "index-scan"
+    return "search"
+
+
+def explain_hot_queries(db_path: Path, now: datetime) -> list[dict]:
+    replacements = {
+        "{window}": demo.format_db_datetime(now - timedelta(days=30)),
+        "{now}": demo.format_db_datetime(now),
+    }
+    plans = []
+    with sqlite3.connect(db_path, timeout=30) as connection:
+        for name, sql, params in HOT_QUERIES:
+            bound = tuple(replacements.get(param, param) for param in params)
+            details = [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", bound)]
+            plans.append(
+                {
+                    "query": name,
+                    "plan": details,
+                    "access": classify_plan(details),
+                    "temp_btree": any("TEMP B-TREE" in detail for detail in details),
+                }
+            )
+    return plans
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    sizes = sorted({int(part) for part in args.sizes.split(",") if part.strip()})
+    if harness.is_server_reachable(base_url):
+        raise RuntimeError(f"{base_url} is already serving; the benchmark needs its own isolated instance.")
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    from_utc = (now - timedelta(days=args.days + 1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    username, password = harness.default_credentials(args.username, args.password)
+
+    server = harness.ensure_server(base_url, "perf-sqlite", True, args.server_timeout)
+    db_path = server[3] / "app.db"
+    steps: list[dict] = []
+    try:
+        opener = harness.login_http(base_url, username, password)
+        samples: dict[str, list[float]] = {}
+        for size in sizes:
+            playback_missing = max(0, size - table_count(db_path, "PlaybackStats"))
+            logs_missing = max(0, size - table_count(db_path, "Logs"))
+            insert_started = time.perf_counter()
+            demo.insert_history(db_path, rng, playback_missing, logs_missing, now, args.days, USERS, SPEAKERS, MEDIA)
+            insert_seconds = round(time.perf_counter() - insert_started, 2)
+
+            step = {
+                "rows_per_table": size,
+                "playback_rows": table_count(db_path, "PlaybackStats"),
+                "log_rows": table_count(db_path, "Logs"),
+                "db_size_mb": database_size_mb(db_path),
+                "insert_seconds": insert_seconds,
+                "endpoints": {},
+            }
+            for name, path in ENDPOINTS:
+                url = f"{base_url}{path.format(from_utc=from_utc)}"
+                step["endpoints"][name], samples[f"{name}@{size}"] = time_endpoint(opener, url, args.repeats)
+            steps.append(step)
+            print(
+                f"{size:>8} rows/table, {step['db_size_mb']:.1f} MB: "
+                + ", ".join(
+                    f"{name} p50={harness.format_value(stats['median'])}ms"
+                    for name, stats in step["endpoints"].items()
+                )
+            )
+
+        plans = explain_hot_queries(db_path, now)
+    finally:
+        harness.stop_local_server(server[0], server[1], server[3])
+
+    print()
+    harness.print_table(
+        ["rows/table", "db MB", *[f"{name} p50" for name, _ in ENDPOINTS]],
+        [
+            [step["rows_per_table"], step["db_size_mb"], *[step["endpoints"][name]["median"] for name, _ in ENDPOINTS]]
+            for step in steps
+        ],
+    )
+    print()
+    for plan in plans:
+        print(f"[{plan['access']:>10}] {plan['query']}: {' | '.join(plan['plan'])}")
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "sqlite-growth",
+            "commit": harness.git_commit(),
+            "days": args.days,
+            "seed": args.seed,
+            "steps": steps,
+            "query_plans": plans,
+        },
+    )
+    print(f"Report written to {report_path}")
+    perf_results.record_run("sqlite-growth", samples, parameters={"days": args.days, "seed": args.seed, "repeats": args.repeats})
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Measure webhook ingestion on `POST api/webhooks` under bursts and sustained load.
+
+Starts an isolated instance with a generated `Webhook:ApiKey` and a fake
+speaker fleet on loopback addresses (see `fake_speakers.py`), then drives it
+from one asyncio event loop:
+- bursts: N webhook events fired at the same instant,
+- sustained steps: an open-loop arrival rate (requests/s) held for a fixed time,
+  so a slow server builds a queue instead of slowing the client down.
+
+For every request the run records acceptance latency (until the HTTP response)
+and status, and, from the fake speakers, when the resulting command reached the
+device. `play-source` events carry a unique station URL, so their device delay
+is matched exactly; transport actions (`play`, `pause`, `next`) are matched to
+device commands in send order per speaker, after dropping the `Play` that
+follows each benchmark station switch (`play-source` starts playback itself). Each sustained step is classified as
+saturated when throughput falls below 90% of the offered rate, p95 exceeds
+`--slo-ms`, or more than 1% of requests fail, and the report says whether the
+server queues (latency grows) or sheds load (errors, timeouts) at that point.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import time
+import uuid
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Optional
+
+import async_http
+import fake_speakers
+import perf_results
+import sonos_harness as harness
+
+
+ACTIONS = ("play-source", "play", "pause", "next", "apply-scene")
+DEVICE_ACTIONS = {"play": "Play", "pause": "Pause", "next": "Next"}
+TOKEN_PATTERN = re.compile(r"/webhook-bench/(?P<token>[0-9a-f]{32})\.mp3")
+SATURATION_THROUGHPUT_RATIO = 0.9
+SATURATION_ERROR_RATE = 0.01
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark webhook bursts and sustained rates against a fake speaker fleet.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", harness.DEFAULT_BASE_URL))
+    parser.add_argument("--api-key", default=os.getenv("WEBHOOK_API_KEY"), help="Webhook API key of an already running server")
+    parser.add_argument("--actions", default="play-source", help=f"Comma-separated actions, cycled per request ({', '.join(ACTIONS)})")
+    parser.add_argument("--bursts", default="10,50,200", help="Comma-separated burst sizes (default: 10,50,200)")
+    parser.add_argument("--burst-gap", type=float, default=3, help="Idle seconds between bursts (default: 3)")
+    parser.add_argument("--rates", default="5,10,25,50,100", help="Comma-separated sustained rates in requests/s (default: 5,10,25,50,100)")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per sustained step (default: 15)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds; expiries count as dropped (default: 30)")
+    parser.add_argument("--slo-ms", type=float, default=1000, help="p95 acceptance latency that marks a step as saturated (default: 1000)")
+    parser.add_argument("--stop-after-saturation", type=int, default=1, help="Sustained steps to run past the first saturated one (default: 1)")
+    parser.add_argument("--idempotency", action="store_true", help="Send a unique Idempotency-Key with every event")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Share of events re-sent with the same Idempotency-Key (implies --idempotency)")
+    parser.add_argument("--speakers", type=int, default=8, help="Fake speakers on 127.0.0.11+ (default: 8)")
+    parser.add_argument("--device-latency-ms", type=float, default=25, help="Fake speaker response delay (default: 25)")
+    parser.add_argument("--device-failure-rate", type=float, default=0.0, help="Share of fake speaker commands answered with HTTP 500")
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--no-autostart", action="store_true")
+    parser.add_argument(
+        "--demo-data",
+        choices=["small", "medium", "large"],
+        default=None,
+        help="Seed the isolated runtime with demo data pointed at the fake fleet (needed for apply-scene)",
+    )
+    parser.add_argument("--out", default="artifacts/perf/webhooks.json")
+    return parser.parse_args()
+
+
+def parse_counts(raw: str, label: str) -> list[float]:
+    values = [float(part) for part in raw.split(",") if part.strip()]
+    if any(value <= 0 for value in values):
+        raise ValueError(f"{label} must contain positive numbers.")
+    return values
+
+
+def parse_actions(raw: str) -> list[str]:
+    actions = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [action for action in actions if action not in ACTIONS]
+    if not actions or unknown:
+        raise ValueError(f"Unsupported --actions {unknown or raw!r}; choose from {', '.join(ACTIONS)}.")
+    return actions
+
+
+def first_scene_id(runtime_dir: Optional[Path]) -> Optional[str]:
+    if runtime_dir is None:
+        return None
+    config_path = runtime_dir / "settings" / "config.json"
+    if not config_path.exists():
+        return None
+    scenes = json.loads(config_path.read_text(encoding="utf-8")).get("Scenes") or []
+    enabled = [scene for scene in scenes if scene.get("Enabled", True)]
+    return enabled[0]["Id"] if enabled else None
+
+
+def latency_summary(values: list[float]) -> dict:
+    summary = harness.summarize(values)
+    p99 = harness.percentile(values, 99)
+    summary["p99"] = round(p99, 3) if p99 is not None else None
+    return summary
+
+
+class WebhookLoad:
+    """Builds webhook payloads and sends them; every attempt lands in `records`."""
+
+    def __init__(self, args, base_url: str, api_key: str, speaker_ips: list[str], scene_id: Optional[str]):
+        self.url = f"{base_url}/api/webhooks"
+        self.api_key = api_key
+        self.actions = parse_actions(args.actions)
+        self.speaker_ips = speaker_ips
+        self.scene_id = scene_id
+        self.timeout = args.timeout
+        self.idempotency = args.idempotency or args.duplicate_rate > 0
+        self.duplicate_every = round(1 / args.duplicate_rate) if args.duplicate_rate > 0 else 0
+        self.sequence = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.records: list[dict] = []
+        if "apply-scene" in self.actions and not scene_id:
+            raise RuntimeError("apply-scene needs a scene; pass --demo-data so the runtime has scenes for the fake fleet.")
+
+    def next_event(self) -> dict:
+        index = self.sequence
+        self.sequence += 1
+        action = self.actions[index % len(self.actions)]
+        speaker_ip = self.speaker_ips[index % len(self.speaker_ips)]
+        token = uuid.uuid4().hex
+        payload: dict = {"action": action}
+        if action == "play-source":
+            payload.update(
+                speakerIp=speaker_ip,
+                sourceType="station",
+                sourceUrl=f"http://127.0.0.1/webhook-bench/{token}.mp3",
+            )
+        elif action == "apply-scene":
+            payload["sceneId"] = self.scene_id
+        else:
+            payload["speakerIp"] = speaker_ip
+        return {"index": index, "action": action, "speaker_ip": payload.get("speakerIp"), "token": token, "payload": payload}
+
+    async def send(self, phase: str, event: dict, offered_at: float, duplicate: bool = False) -> dict:
+        headers = {"Content-Type": "application/json", "X-API-Key": self.api_key}
+        if self.idempotency:
+            headers["Idempotency-Key"] = f"bench-{event['token']}"
+        record = {
+            "phase": phase,
+            "index": event["index"],
+            "action": event["action"],
+            "speaker_ip": event["speaker_ip"],
+            "token": None if duplicate else event["token"],
+            "duplicate": duplicate,
+            "offered_at": offered_at,
+            "sent_at": time.perf_counter(),
+            "status": None,
+            "latency_ms": None,
+            "error": None,
+            "device_delay_ms": None,
+        }
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            response = await async_http.request(
+                "POST",
+                self.url,
+                headers=headers,
+                body=json.dumps(event["payload"]).encode("utf-8"),
+                timeout=self.timeout,
+            )
+            record["status"] = response.status
+            record["latency_ms"] = response.elapsed * 1000
+        except async_http.HttpClientError as error:
+            record["error"] = str(error)
+        finally:
+            self.in_flight -= 1
+        self.records.append(record)
+        return record
+
+    async def fire(self, phase: str, offered_at: float) -> list[dict]:
+        event = self.next_event()
+        if self.duplicate_every and event["index"] % self.duplicate_every == 0:
+            return list(await asyncio.gather(
+                self.send(phase, event, offered_at),
+                self.send(phase, event, offered_at, duplicate=True),
+            ))
+        return [await self.send(phase, event, offered_at)]
+
+    async def burst(self, size: int) -> dict:
+        phase = f"burst{size}"
+        started = time.perf_counter()
+        await asyncio.gather(*[self.fire(phase, started) for _ in range(size)])
+        return {"phase": phase, "kind": "burst", "size": size, "seconds": time.perf_counter() - started}
+
+    async def sustained(self, rate: float, duration: float) -> dict:
+        """Open-loop arrivals: the i-th request is due at start + i / rate regardless of completions."""
+        phase = f"{rate:g}rps"
+        count = max(1, int(rate * duration))
+        started = time.perf_counter()
+        tasks = []
+        for index in range(count):
+            due = started + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.fire(phase, due)))
+        await asyncio.gather(*tasks)
+        return {"phase": phase, "kind": "sustained", "rate": rate, "size": count, "seconds": time.perf_counter() - started}
+
+
+def attach_device_delays(records: list[dict], commands: list[fake_speakers.DeviceCommand]):
+    """Match each accepted request to the device command it caused."""
+    by_token = {}
+    by_speaker: dict[tuple[str, str], deque] = defaultdict(deque)
+    # A successful station switch is followed by a Play on the same speaker
+    # (SetTuneInStationAsync -> StartPlaying); that Play belongs to play-source.
+    pending_source_plays: dict[str, int] = defaultdict(int)
+    for command in sorted(commands, key=lambda item: item.received):
+        if command.uri:
+            match = TOKEN_PATTERN.search(command.uri)
+            if match:
+                by_token.setdefault(match.group("token"), command)
+                if command.action == "SetAVTransportURI" and 200 <= command.status < 300:
+                    pending_source_plays[command.ip] += 1
+        if command.action == "Play" and pending_source_plays[command.ip]:
+            pending_source_plays[command.ip] -= 1
+            continue
+        if command.action in DEVICE_ACTIONS.values():
+            by_speaker[(command.ip, command.action)].append(command)
+
+    for record in sorted(records, key=lambda item: item["sent_at"]):
+        if record["duplicate"] or record["status"] is None or not 200 <= record["status"] < 300:
+            continue
+        command = None
+        if record["action"] == "play-source":
+            command = by_token.get(record["token"])
+        elif record["action"] in DEVICE_ACTIONS:
+            queue = by_speaker[(record["speaker_ip"], DEVICE_ACTIONS[record["action"]])]
+            while queue and queue[0].received < record["sent_at"]:
+                queue.popleft()
+            command = queue.popleft() if queue else None
+        if command is not None:
+            record["device_delay_ms"] = (command.received - record["sent_at"]) * 1000
+
+
+def summarize_phase(phase: dict, records: list[dict], resources: dict, slo_ms: float) -> dict:
+    primary = [record for record in records if not record["duplicate"]]
+    statuses: dict[str, int] = defaultdict(int)
+    for record in records:
+        statuses[str(record["status"]) if record["status"] is not None else "no response"] += 1
+    accepted = [record for record in primary if record["status"] is not None and 200 <= record["status"] < 300]
+    rejected = [record for record in primary if record["status"] is not None and record["status"] >= 400]
+    dropped = [record for record in primary if record["status"] is None]
+    latencies = [record["latency_ms"] for record in primary if record["latency_ms"] is not None]
+    device = [record["device_delay_ms"] for record in accepted if record["device_delay_ms"] is not None]
+    client_lag = [(record["sent_at"] - record["offered_at"]) * 1000 for record in primary]
+    completed_at = [record["sent_at"] + record["latency_ms"] / 1000 for record in primary if record["latency_ms"] is not None]
+    first_sent = min((record["sent_at"] for record in primary), default=0.0)
+    drain_seconds = (max(completed_at) - first_sent) if completed_at else None
+
+    result = {
+        **{key: value for key, value in phase.items() if key != "seconds"},
+        "requests": len(primary),
+        "duplicates_sent": len(records) - len(primary),
+        "statuses": dict(statuses),
+        "accepted": len(accepted),
+        "rejected": len(rejected),
+        "rate_limited": sum(1 for record in rejected if record["status"] == 429),
+        "dropped": len(dropped),
+        "error_rate": round((len(rejected) + len(dropped)) / len(primary), 4) if primary else None,
+        "drain_seconds": round(drain_seconds, 3) if drain_seconds is not None else None,
+        "throughput_rps": round(len(accepted) / drain_seconds, 2) if drain_seconds else None,
+        "acceptance_ms": latency_summary(latencies),
+        "device_delay_ms": latency_summary(device),
+        "device_matched": len(device),
+        "client_lag_ms": harness.summarize(client_lag),
+        "resources": resources,
+        "errors": sorted({record["error"] for record in dropped if record["error"]})[:5],
+    }
+    if phase["kind"] == "sustained":
+        result["saturation"] = classify_saturation(result, slo_ms)
+    return result
+
+
+def classify_saturation(step: dict, slo_ms: float) -> dict:
+    reasons = []
+    throughput = step["throughput_rps"] or 0.0
+    if throughput < step["rate"] * SATURATION_THROUGHPUT_RATIO:
+        reasons.append(f"throughput {throughput:.1f}/s of {step['rate']:g}/s offered")
+    p95 = step["acceptance_ms"]["p95"]
+    if p95 is not None and p95 > slo_ms:
+        reasons.append(f"p95 {p95:.0f}ms over {slo_ms:g}ms")
+    if (step["error_rate"] or 0) > SATURATION_ERROR_RATE:
+        reasons.append(f"{step['error_rate']:.1%} failed")
+
+    if not reasons:
+        behaviour = None
+    elif step["dropped"] or step["rate_limited"] or (step["error_rate"] or 0) > SATURATION_ERROR_RATE:
+        behaviour = "sheds load" if not step["rate_limited"] else "rate limits"
+    else:
+        behaviour = "queues"
+    return {"saturated": bool(reasons), "reasons": reasons, "behaviour": behaviour}
+
+
+async def run_load(args, load: WebhookLoad, fleet: fake_speakers.FakeSpeakerFleet, sampler) -> list[dict]:
+    phases: list[dict] = []
+
+    async def measure(coroutine) -> dict:
+        record_mark = len(load.records)
+        sample_mark = sampler.mark() if sampler else 0
+        fleet_mark = fleet.mark()
+        load.max_in_flight = 0
+        phase = await coroutine
+        phase_records = load.records[record_mark:]
+        # Every request of the phase has its response, so its device commands are in.
+        attach_device_delays(phase_records, fleet.commands(fleet_mark))
+        resources = sampler.window(sample_mark) if sampler else harness.empty_resource_window()
+        result = summarize_phase(phase, phase_records, resources, args.slo_ms)
+        result["max_in_flight"] = load.max_in_flight
+        phases.append(result)
+        return result
+
+    # One warm-up request so JIT and connection pools do not land in the first burst.
+    await load.fire("warmup", time.perf_counter())
+
+    for size in parse_counts(args.bursts, "--bursts"):
+        await asyncio.sleep(args.burst_gap)
+        result = await measure(load.burst(int(size)))
+        print(
+            f"burst {int(size):>5}: accept p50={harness.format_value(result['acceptance_ms']['median'])}ms "
+            f"p99={harness.format_value(result['acceptance_ms']['p99'])}ms, drained in {harness.format_value(result['drain_seconds'], 2)}s, "
+            f"{result['rejected'] + result['dropped']} failed"
+        )
+
+    steps_past_saturation: Optional[int] = None
+    for rate in parse_counts(args.rates, "--rates"):
+        if steps_past_saturation is not None:
+            if steps_past_saturation >= args.stop_after_saturation:
+                break
+            steps_past_saturation += 1
+        await asyncio.sleep(args.burst_gap)
+        result = await measure(load.sustained(rate, args.duration))
+        if result["saturation"]["saturated"] and steps_past_saturation is None:
+            steps_past_saturation = 0
+        print(
+            f"{rate:>6g}/s: {harness.format_value(result['throughput_rps'])}/s accepted, "
+            f"p95={harness.format_value(result['acceptance_ms']['p95'])}ms, "
+            f"device p95={harness.format_value(result['device_delay_ms']['p95'])}ms, "
+            f"in flight max={result['max_in_flight']}"
+            + (f"  SATURATED ({result['saturation']['behaviour']}: {'; '.join(result['saturation']['reasons'])})" if result["saturation"]["saturated"] else "")
+        )
+    return phases
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    if args.no_autostart and not args.api_key:
+        raise RuntimeError("Pass --api-key (or WEBHOOK_API_KEY) when benchmarking a server this run did not start.")
+    api_key = args.api_key or secrets.token_urlsafe(24)
+    speaker_ips = fake_speakers.loopback_ips(args.speakers)
+
+    with fake_speakers.FakeSpeakerFleet(speaker_ips, args.device_latency_ms, args.device_failure_rate) as fleet:
+        server = harness.ensure_server(
+            base_url,
+            "perf-webhooks",
+            not args.no_autostart,
+            args.server_timeout,
+            extra_env={"Webhook__ApiKey": api_key},
+            demo_scale=args.demo_data,
+            speaker_ips=speaker_ips,
+        )
+        sampler = None
+        server_pid = harness.find_server_pid(server) or (int(os.environ["PERF_SERVER_PID"]) if os.getenv("PERF_SERVER_PID") else None)
+        if server_pid:
+            sampler = harness.ProcessSampler(server_pid)
+            sampler.start()
+        else:
+            print("Server was not started by this run; set PERF_SERVER_PID to sample CPU/RSS.")
+
+        try:
+            load = WebhookLoad(args, base_url, api_key, speaker_ips, first_scene_id(server[3] if server else None))
+            phases = asyncio.run(run_load(args, load, fleet, sampler))
+            device_commands = len(fleet.commands())
+        finally:
+            if sampler:
+                sampler.stop()
+            if server:
+                harness.stop_local_server(server[0], server[1], server[3])
+
+    print()
+    harness.print_table(
+        ["phase", "requests", "accepted", "failed", "req/s", "p50 ms", "p95 ms", "p99 ms", "device p95", "in flight", "cpu%", "saturated"],
+        [
+            [
+                phase["phase"],
+                phase["requests"],
+                phase["accepted"],
+                phase["rejected"] + phase["dropped"],
+                phase["throughput_rps"],
+                phase["acceptance_ms"]["median"],
+                phase["acceptance_ms"]["p95"],
+                phase["acceptance_ms"]["p99"],
+                phase["device_delay_ms"]["p95"],
+                phase["max_in_flight"],
+                phase["resources"]["cpu_percent"]["mean"],
+                (phase["saturation"]["behaviour"] if phase["saturation"]["saturated"] else "no") if "saturation" in phase else "-",
+            ]
+            for phase in phases
+        ],
+    )
+
+    sustained = [phase for phase in phases if phase["kind"] == "sustained"]
+    sustainable = [phase["rate"] for phase in sustained if not phase["saturation"]["saturated"]]
+    first_saturated = next((phase for phase in sustained if phase["saturation"]["saturated"]), None)
+    summary = {
+        "max_sustainable_rps": max(sustainable) if sustainable else None,
+        "saturated_at_rps": first_saturated["rate"] if first_saturated else None,
+        "behaviour_at_saturation": first_saturated["saturation"]["behaviour"] if first_saturated else None,
+    }
+    if first_saturated:
+        print(
+            f"\nSustainable up to {harness.format_value(summary['max_sustainable_rps'])}/s; saturates at "
+            f"{first_saturated['rate']:g}/s and {summary['behaviour_at_saturation']}."
+        )
+    else:
+        print("\nNo sustained step saturated; raise --rates to find the limit.")
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "webhooks",
+            "commit": harness.git_commit(),
+            "base_url": base_url,
+            "actions": parse_actions(args.actions),
+            "speakers": len(speaker_ips),
+            "device_latency_ms": args.device_latency_ms,
+            "device_failure_rate": args.device_failure_rate,
+            "idempotency": args.idempotency or args.duplicate_rate > 0,
+            "duplicate_rate": args.duplicate_rate,
+            "slo_ms": args.slo_ms,
+            "device_commands": device_commands,
+            "summary": summary,
+            "phases": phases,
+        },
+    )
+    print(f"Report written to {report_path}")
+
+    samples = {}
+    for phase in phases:
+        samples[f"accept@{phase['phase']}"] = [
+            record["latency_ms"] for record in load.records
+            if record["phase"] == phase["phase"] and not record["duplicate"] and record["latency_ms"] is not None
+        ]
+        samples[f"device@{phase['phase']}"] = [
+            record["device_delay_ms"] for record in load.records
+            if record["phase"] == phase["phase"] and record["device_delay_ms"] is not None
+        ]
+    perf_results.record_run(
+        "webhooks",
+        {name: values for name, values in samples.items() if values},
+        parameters={
+            "actions": args.actions,
+            "speakers": len(speaker_ips),
+            "device_latency_ms": args.device_latency_ms,
+            "duration": args.duration,
+        },
+    )
+
+
+if __name__ == "__main__":
+    run()
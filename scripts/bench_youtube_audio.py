@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Measure how many rooms one instance can stream `api/youtube-audio` to.
+
+Playback sessions are created the way a room starts YouTube audio: a scene with
+a YouTube source is applied through `POST api/webhooks` to a fake speaker
+fleet (see `fake_speakers.py`), and the stream URLs the app enqueues on the
+speakers are collected from the recorded `AddURIToQueue` commands. Nothing
+touches the network: a stand-in `yt-dlp` on the server's PATH resolves every
+video to a WAV tone served by a local media source, and `ffmpeg` transcodes it
+(or, with `--transcoder passthrough`, a stand-in copies the bytes unchanged).
+
+Two session modes cover both code paths of `YouTubeAudioController`:
+- `live`: a single video, transcoded by one ffmpeg process per request,
+- `file`: a playlist, materialised to a temp MP3 on first open and then served
+  with range support.
+
+For each step of concurrent clients the run records TTFB, sustained bytes/s
+per stream, status codes, server CPU/RSS and transcoder processes, with a share
+of clients issuing `Range` requests and a share disconnecting mid-stream. After
+each step it checks that no transcoder outlived its client and re-probes TTFB.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import secrets
+import shutil
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+import async_http
+import fake_speakers
+import perf_results
+import sonos_harness as harness
+
+
+# Bitrate the app transcodes to; a stream slower than this stalls playback.
+REALTIME_BYTES_PER_SECOND = 192_000 / 8
+STREAM_URL_PATTERN = re.compile(r"/api/youtube-audio/(?P<session>[0-9a-f]{32})/(?P<index>\d+)")
+STANDIN_VIDEO_URL = "https://www.youtube.com/watch?v=standin000"
+STANDIN_PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLstandin"
+
+YT_DLP_STANDIN = '''#!{python}
+"""Stand-in yt-dlp: resolves any video to the local media source."""
+import json, os, sys, time
+from urllib.parse import parse_qs, urlsplit
+
+time.sleep(float(os.environ.get("STANDIN_RESOLVE_DELAY_MS", "0")) / 1000)
+url = sys.argv[-1]
+query = parse_qs(urlsplit(url).query)
+if "--flat-playlist" in sys.argv:
+    count = int(sys.argv[sys.argv.index("--playlist-end") + 1]) if "--playlist-end" in sys.argv else 10
+    count = min(count, int(os.environ.get("STANDIN_PLAYLIST_ITEMS", "10")))
+    entries = [{{"id": f"standin{{index:03d}}"}} for index in range(count)]
+    print(json.dumps({{"title": "Stand-in playlist", "entries": entries}}))
+else:
+    video_id = (query.get("v") or ["standin000"])[0]
+    print(json.dumps({{
+        "url": f"{{os.environ['STANDIN_MEDIA_URL']}}/media/{{video_id}}.wav",
+        "title": f"Stand-in {{video_id}}",
+        "webpage_url": f"https://www.youtube.com/watch?v={{video_id}}",
+        "uploader": "Stand-in",
+    }}))
+'''
+
+FFMPEG_STANDIN = '''#!{python}
+"""Stand-in ffmpeg: copies the -i URL to the output (file path or pipe:1) unchanged."""
+import shutil, sys
+from urllib.request import urlopen
+
+source = sys.argv[sys.argv.index("-i") + 1]
+target = sys.argv[-1]
+try:
+    with urlopen(source, timeout=30) as response:
+        if target == "pipe:1":
+            shutil.copyfileobj(response, sys.stdout.buffer, 64 * 1024)
+            sys.stdout.buffer.flush()
+        else:
+            with open(target, "wb") as output:
+                shutil.copyfileobj(response, output, 64 * 1024)
+except BrokenPipeError:
+    pass
+'''
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent api/youtube-audio streams against a local stand-in media source.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", harness.DEFAULT_BASE_URL))
+    parser.add_argument("--mode", choices=["live", "file"], default="live", help="Live ffmpeg stream per request, or materialised temp file with ranges (default: live)")
+    parser.add_argument("--clients", default="1,4,8,16,32", help="Comma-separated concurrent client counts (default: 1,4,8,16,32)")
+    parser.add_argument("--sessions", type=int, default=4, help="Playback sessions (one per fake speaker, default: 4)")
+    parser.add_argument("--items", type=int, default=3, help="Items per session in file mode (default: 3)")
+    parser.add_argument("--stream-seconds", type=float, default=10, help="Longest a client reads one stream (default: 10)")
+    parser.add_argument("--client-kbps", type=float, default=0, help="Pace each client to this read rate, e.g. 192 for realtime (default: unpaced)")
+    parser.add_argument("--range-share", type=float, default=0.25, help="Share of clients sending a Range request (default: 0.25)")
+    parser.add_argument("--disconnect-share", type=float, default=0.25, help="Share of clients that drop the connection mid-stream (default: 0.25)")
+    parser.add_argument("--media-seconds", type=int, default=180, help="Length of the stand-in source track (default: 180)")
+    parser.add_argument("--source-kbps", type=float, default=0, help="Throttle the stand-in media source (default: unthrottled)")
+    parser.add_argument("--resolve-delay-ms", type=float, default=0, help="Delay added to each stand-in yt-dlp call (default: 0)")
+    parser.add_argument("--transcoder", choices=["auto", "ffmpeg", "passthrough"], default="auto", help="Real ffmpeg, or a byte-copying stand-in (default: ffmpeg when installed)")
+    parser.add_argument("--ttfb-slo-ms", type=float, default=2000, help="p95 TTFB a room can tolerate (default: 2000)")
+    parser.add_argument("--settle-seconds", type=float, default=3, help="Wait after each step before counting transcoders (default: 3)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--out", default="artifacts/perf/youtube_audio.json")
+    return parser.parse_args()
+
+
+def parse_steps(raw: str) -> list[int]:
+    steps = sorted({int(part) for part in raw.split(",") if part.strip()})
+    if not steps or steps[0] < 1:
+        raise ValueError("--clients must contain positive client counts.")
+    return steps
+
+
+def write_tone(path: Path, seconds: int, sample_rate: int = 44100):
+    """Write a mono 16-bit 440 Hz tone; ffmpeg decodes it like any upstream audio."""
+    period = [int(12000 * math.sin(2 * math.pi * 440 * index / sample_rate)) for index in range(sample_rate // 440 * 10)]
+    block = struct.pack(f"<{len(period)}h", *period)
+    frames_needed = seconds * sample_rate
+    with wave.open(str(path), "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        written = 0
+        while written < frames_needed:
+            chunk = block[: (frames_needed - written) * 2]
+            output.writeframes(chunk)
+            written += len(chunk) // 2
+
+
+class MediaSource:
+    """Serves the stand-in tone for any `/media/<id>.wav` path and counts upstream fetches."""
+
+    def __init__(self, media_path: Path, kbps: float = 0):
+        self.media_path = media_path
+        self.kbps = kbps
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="media-standin", daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        source = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _headers(self) -> bool:
+                if not self.path.startswith("/media/"):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return False
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/wav")
+                self.send_header("Content-Length", str(source.media_path.stat().st_size))
+                self.end_headers()
+                return True
+
+            def do_HEAD(self):
+                self._headers()
+
+            def do_GET(self):
+                with source._lock:
+                    source.requests += 1
+                if not self._headers():
+                    return
+                chunk_size = 64 * 1024
+                delay = chunk_size / (source.kbps * 125) if source.kbps > 0 else 0
+                try:
+                    with source.media_path.open("rb") as stream:
+                        while chunk := stream.read(chunk_size):
+                            self.wfile.write(chunk)
+                            if delay:
+                                time.sleep(delay)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+
+def write_standin_tools(tools_dir: Path, passthrough: bool):
+    tools = {"yt-dlp": YT_DLP_STANDIN}
+    if passthrough:
+        tools["ffmpeg"] = FFMPEG_STANDIN
+    for name, template in tools.items():
+        path = tools_dir / name
+        path.write_text(template.format(python=sys.executable), encoding="utf-8")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def configure_runtime(runtime_dir: Path, mode: str, items: int, speaker_ips: list[str]) -> str:
+    """Add a YouTube scene on the fake fleet to the seeded settings and return its id."""
+    config_path = runtime_dir / "settings" / "config.json"
+    settings = json.loads(config_path.read_text(encoding="utf-8"))
+    source_url = STANDIN_VIDEO_URL if mode == "live" else STANDIN_PLAYLIST_URL
+    settings["YouTubeCollections"] = [
+        entry for entry in settings.get("YouTubeCollections") or [] if entry.get("Url") != source_url
+    ] + [
+        {
+            "Name": "Stand-in",
+            "Url": source_url,
+            "PlaybackMode": 0 if mode == "live" else 1,
+            "PreferredQueueLength": items,
+        }
+    ]
+    scene_id = uuid.uuid4().hex
+    settings.setdefault("Scenes", []).append(
+        {
+            "Id": scene_id,
+            "Name": "Stream benchmark",
+            "Description": "YouTube audio on the fake fleet",
+            "Enabled": True,
+            "SourceSelectionMode": 0,
+            "SourceType": 4,
+            "SourceUrl": source_url,
+            "IsSyncedPlayback": False,
+            "MasterSpeakerIp": speaker_ips[0],
+            "TimerMinutes": None,
+            "SpeakerIps": speaker_ips,
+            "Actions": [
+                {"SpeakerIp": ip, "Volume": None, "IncludeInPlayback": True, "IsMaster": ip == speaker_ips[0]}
+                for ip in speaker_ips
+            ],
+        }
+    )
+    config_path.write_text(json.dumps(settings, indent=2, ensure_ascii=False), encoding="utf-8")
+    return scene_id
+
+
+async def create_sessions(base_url: str, api_key: str, scene_id: str, fleet: fake_speakers.FakeSpeakerFleet) -> tuple[list[str], dict]:
+    """Apply the scene through the webhook and collect the enqueued stream paths."""
+    mark = fleet.mark()
+    response = await async_http.request(
+        "POST",
+        f"{base_url}/api/webhooks",
+        headers={"Content-Type": "application/json", "X-API-Key": api_key},
+        body=json.dumps({"action": "apply-scene", "sceneId": scene_id}).encode("utf-8"),
+        timeout=300,
+    )
+    if response.status != 200:
+        raise RuntimeError(f"Applying the stream scene failed ({response.status}): {response.body[:300]!r}")
+
+    paths: list[str] = []
+    for command in fleet.commands(mark):
+        match = STREAM_URL_PATTERN.search(command.uri or "")
+        if match and match.group(0) not in paths:
+            paths.append(match.group(0))
+    if not paths:
+        raise RuntimeError("The scene started without enqueuing any api/youtube-audio URLs; check the server log.")
+    return paths, {"prepare_seconds": round(response.elapsed, 3), "sessions": len({path.split("/")[3] for path in paths})}
+
+
+async def stream_client(url: str, kind: str, args, rng: random.Random, content_length: Optional[int]) -> dict:
+    """Read one stream as a room would; `kind` is full, range or disconnect."""
+    headers = {}
+    if kind == "range" and content_length:
+        headers["Range"] = f"bytes={rng.randrange(content_length // 2)}-"
+    # Disconnecting clients give up after a random share of the read window.
+    read_budget = args.stream_seconds * (rng.uniform(0.1, 0.6) if kind == "disconnect" else 1.0)
+    result = {"kind": kind, "status": None, "ttfb_ms": None, "bytes": 0, "seconds": None, "bytes_per_s": None, "error": None, "complete": False}
+    try:
+        response = await async_http.open_response("GET", url, headers=headers, timeout=60)
+    except async_http.HttpClientError as error:
+        result["error"] = str(error)
+        return result
+
+    result["status"] = response.status
+    result["ttfb_ms"] = response.ttfb * 1000
+    body_started = time.perf_counter()
+    deadline = body_started + read_budget
+    pace = args.client_kbps * 125
+    try:
+        async for chunk in response.iter_chunks(16 * 1024 if pace else 64 * 1024):
+            result["bytes"] += len(chunk)
+            now = time.perf_counter()
+            if pace:
+                ahead = body_started + result["bytes"] / pace - now
+                if ahead > 0:
+                    await asyncio.sleep(min(ahead, deadline - now))
+            if time.perf_counter() >= deadline:
+                break
+        else:
+            result["complete"] = True
+    except (async_http.HttpClientError, OSError, asyncio.IncompleteReadError) as error:
+        result["error"] = str(error)
+    finally:
+        await response.close()
+    elapsed = time.perf_counter() - body_started
+    result["seconds"] = round(elapsed, 3)
+    result["bytes_per_s"] = result["bytes"] / elapsed if elapsed > 0 and result["bytes"] else None
+    return result
+
+
+def transcoder_count(server_pid: Optional[int]) -> Optional[int]:
+    if not server_pid:
+        return None
+    import psutil
+
+    try:
+        children = psutil.Process(server_pid).children(recursive=True)
+    except psutil.Error:
+        return None
+    count = 0
+    for child in children:
+        try:
+            if any(Path(part).name == "ffmpeg" for part in child.cmdline()[:2]):
+                count += 1
+        except psutil.Error:
+            continue
+    return count
+
+
+def client_kinds(count: int, args, rng: random.Random, ranges_supported: bool) -> list[str]:
+    ranges = round(count * args.range_share) if ranges_supported else 0
+    disconnects = round(count * args.disconnect_share)
+    kinds = ["range"] * ranges + ["disconnect"] * disconnects
+    kinds += ["full"] * max(0, count - len(kinds))
+    rng.shuffle(kinds)
+    return kinds[:count]
+
+
+async def probe(url: str) -> dict:
+    """One short read used for cold-open and post-step TTFB."""
+    try:
+        response = await async_http.open_response("GET", url, timeout=120)
+    except async_http.HttpClientError as error:
+        return {"status": None, "ttfb_ms": None, "content_length": None, "error": str(error)}
+    try:
+        async for _ in response.iter_chunks():
+            break
+    except async_http.HttpClientError:
+        pass
+    finally:
+        await response.close()
+    return {"status": response.status, "ttfb_ms": response.ttfb * 1000, "content_length": response.content_length, "error": None}
+
+
+def summarize_step(clients: int, results: list[dict], resources: dict, leftover: Optional[int], after_probe: dict, args) -> dict:
+    statuses: dict[str, int] = {}
+    for result in results:
+        key = str(result["status"]) if result["status"] is not None else "no response"
+        statuses[key] = statuses.get(key, 0) + 1
+    ok = [result for result in results if result["status"] in (200, 206) and not result["error"]]
+    ranges = [result for result in results if result["kind"] == "range"]
+    rates = [result["bytes_per_s"] for result in ok if result["bytes_per_s"] and result["kind"] != "disconnect"]
+    slowest = min(rates) if rates else None
+    ttfb = harness.summarize([result["ttfb_ms"] for result in results if result["ttfb_ms"] is not None])
+    failed = len(results) - len(ok)
+    return {
+        "clients": clients,
+        "statuses": statuses,
+        "failed": failed,
+        "ttfb_ms": ttfb,
+        "stream_kbps": harness.summarize([rate / 125 for rate in rates]),
+        "slowest_stream_kbps": round(slowest / 125, 1) if slowest else None,
+        "total_mb": round(sum(result["bytes"] for result in results) / (1024 * 1024), 2),
+        "range_partial": sum(1 for result in ranges if result["status"] == 206),
+        "range_requests": len(ranges),
+        "disconnects": sum(1 for result in results if result["kind"] == "disconnect"),
+        "transcoders_after_settle": leftover,
+        "ttfb_after_step_ms": after_probe["ttfb_ms"],
+        "resources": resources,
+        "errors": sorted({result["error"] for result in results if result["error"]})[:5],
+        "keeps_up": (
+            failed == 0
+            and slowest is not None
+            # Paced clients read at exactly realtime, so allow for chunk granularity.
+            and slowest >= REALTIME_BYTES_PER_SECOND * 0.95
+            and ttfb["p95"] is not None
+            and ttfb["p95"] <= args.ttfb_slo_ms
+        ),
+    }
+
+
+async def run_streams(args, base_url: str, api_key: str, scene_id: str, fleet, sampler, server_pid: Optional[int]) -> tuple[dict, list[dict], dict]:
+    rng = random.Random(args.seed)
+    paths, prepare = await create_sessions(base_url, api_key, scene_id, fleet)
+    urls = [f"{base_url}{path}" for path in paths]
+    print(f"Prepared {prepare['sessions']} session(s) with {len(urls)} stream URL(s) in {prepare['prepare_seconds']}s")
+
+    # First open per URL: spawns ffmpeg (live) or materialises the temp file (file mode).
+    cold = [await probe(url) for url in urls]
+    content_lengths = {url: result["content_length"] for url, result in zip(urls, cold)}
+    # Live streams have no Content-Length, so there is nothing to range over.
+    ranges_supported = all(content_lengths.values())
+    cold_summary = {
+        "ttfb_ms": harness.summarize([result["ttfb_ms"] for result in cold if result["ttfb_ms"] is not None]),
+        "statuses": sorted({str(result["status"]) for result in cold}),
+        "ranges_supported": ranges_supported,
+    }
+    print(f"Cold open TTFB p50={harness.format_value(cold_summary['ttfb_ms']['median'])}ms over {len(cold)} URL(s)")
+    if args.range_share > 0 and not ranges_supported:
+        print("Streams report no Content-Length; running without Range clients.")
+
+    steps = []
+    samples: dict[str, list[float]] = {}
+    for clients in parse_steps(args.clients):
+        kinds = client_kinds(clients, args, rng, ranges_supported)
+        sample_mark = sampler.mark() if sampler else 0
+        results = await asyncio.gather(*[
+            stream_client(urls[index % len(urls)], kind, args, rng, content_lengths[urls[index % len(urls)]])
+            for index, kind in enumerate(kinds)
+        ])
+        resources = sampler.window(sample_mark) if sampler else harness.empty_resource_window()
+        await asyncio.sleep(args.settle_seconds)
+        leftover = transcoder_count(server_pid)
+        after_probe = await probe(urls[0])
+        step = summarize_step(clients, results, resources, leftover, after_probe, args)
+        steps.append(step)
+        samples[f"ttfb@{clients}"] = [result["ttfb_ms"] for result in results if result["ttfb_ms"] is not None]
+        samples[f"stream-kbps@{clients}"] = [
+            result["bytes_per_s"] / 125 for result in results
+            if result["bytes_per_s"] and result["kind"] != "disconnect" and not result["error"]
+        ]
+        print(
+            f"{clients:>4} clients: ttfb p95={harness.format_value(step['ttfb_ms']['p95'])}ms, "
+            f"slowest stream={harness.format_value(step['slowest_stream_kbps'])} kbps, "
+            f"{step['failed']} failed, rss max={harness.format_value(step['resources']['rss_mb']['max'])} MB, "
+            f"transcoders left={harness.format_value(leftover)}"
+        )
+    return {"prepare": prepare, "cold_open": cold_summary, "stream_urls": len(urls)}, steps, samples
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    if harness.is_server_reachable(base_url):
+        raise RuntimeError(f"{base_url} is already serving; the benchmark needs its own instance with the stand-in tools. Pass a free --base-url.")
+
+    passthrough = args.transcoder == "passthrough" or (args.transcoder == "auto" and shutil.which("ffmpeg") is None)
+    if args.transcoder == "ffmpeg" and shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is not on PATH; install it or pass --transcoder passthrough.")
+    if passthrough and args.transcoder == "auto":
+        print("ffmpeg not found; using the passthrough stand-in, so transcoding cost is not measured.")
+
+    harness.ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    standin_dir = Path(tempfile.mkdtemp(prefix="youtube-standin-", dir=harness.ARTIFACTS_DIR))
+    tools_dir = standin_dir / "bin"
+    tools_dir.mkdir()
+    write_standin_tools(tools_dir, passthrough)
+    media_path = standin_dir / "tone.wav"
+    write_tone(media_path, args.media_seconds)
+    media = MediaSource(media_path, args.source_kbps)
+    media.start()
+
+    api_key = secrets.token_urlsafe(24)
+    speaker_ips = fake_speakers.loopback_ips(args.sessions)
+    server = None
+    sampler = None
+    try:
+        with fake_speakers.FakeSpeakerFleet(speaker_ips) as fleet:
+            server = harness.ensure_server(
+                base_url,
+                "perf-youtube-audio",
+                True,
+                args.server_timeout,
+                extra_env={
+                    "PATH": f"{tools_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                    "Webhook__ApiKey": api_key,
+                    "Playback__PublicBaseUrl": base_url,
+                    "Playback__ArtifactDirectory": str(standin_dir / "youtube-audio"),
+                    "STANDIN_MEDIA_URL": media.url,
+                    "STANDIN_PLAYLIST_ITEMS": str(args.items),
+                    "STANDIN_RESOLVE_DELAY_MS": str(args.resolve_delay_ms),
+                },
+                demo_scale="small",
+                speaker_ips=speaker_ips,
+            )
+            scene_id = configure_runtime(server[3], args.mode, args.items, speaker_ips)
+            server_pid = harness.find_server_pid(server)
+            sampler = harness.ProcessSampler(server_pid)
+            sampler.start()
+            setup, steps, samples = asyncio.run(run_streams(args, base_url, api_key, scene_id, fleet, sampler, server_pid))
+    finally:
+        if sampler:
+            sampler.stop()
+        if server:
+            harness.stop_local_server(server[0], server[1], server[3])
+        media.stop()
+        shutil.rmtree(standin_dir, ignore_errors=True)
+
+    print()
+    harness.print_table(
+        ["clients", "ttfb p50", "ttfb p95", "kbps p50", "slowest kbps", "failed", "206/range", "cpu%", "rss MB", "left", "realtime"],
+        [
+            [
+                step["clients"],
+                step["ttfb_ms"]["median"],
+                step["ttfb_ms"]["p95"],
+                step["stream_kbps"]["median"],
+                step["slowest_stream_kbps"],
+                step["failed"],
+                f"{step['range_partial']}/{step['range_requests']}" if step["range_requests"] else "n/a",
+                step["resources"]["cpu_percent"]["mean"],
+                step["resources"]["rss_mb"]["max"],
+                step["transcoders_after_settle"],
+                "yes" if step["keeps_up"] else "no",
+            ]
+            for step in steps
+        ],
+    )
+    keeping_up = [step["clients"] for step in steps if step["keeps_up"]]
+    summary = {
+        "max_realtime_rooms": max(keeping_up) if keeping_up else 0,
+        "leaked_transcoders": max((step["transcoders_after_settle"] or 0 for step in steps), default=0),
+        "upstream_fetches": media.requests,
+    }
+    print(
+        f"\nOne instance fed {summary['max_realtime_rooms']} concurrent stream(s) at realtime "
+        f"(>= {REALTIME_BYTES_PER_SECOND / 125:.0f} kbps, TTFB p95 <= {args.ttfb_slo_ms:g}ms) in {args.mode} mode; "
+        f"{summary['upstream_fetches']} upstream fetch(es)."
+    )
+    if summary["leaked_transcoders"]:
+        print(f"Warning: {summary['leaked_transcoders']} transcoder process(es) outlived their clients.")
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "youtube-audio",
+            "commit": harness.git_commit(),
+            "base_url": base_url,
+            "mode": args.mode,
+            "transcoder": "passthrough" if passthrough else "ffmpeg",
+            "client_kbps": args.client_kbps,
+            "stream_seconds": args.stream_seconds,
+            "range_share": args.range_share,
+            "disconnect_share": args.disconnect_share,
+            "source_kbps": args.source_kbps,
+            **setup,
+            "summary": summary,
+            "steps": steps,
+        },
+    )
+    print(f"Report written to {report_path}")
+    perf_results.record_run(
+        f"youtube-audio-{args.mode}",
+        {name: values for name, values in samples.items() if values},
+        units={name: "kbps" for name in samples if name.startswith("stream-kbps@")},
+        higher_is_better={name for name in samples if name.startswith("stream-kbps@")},
+        parameters={
+            "transcoder": "passthrough" if passthrough else "ffmpeg",
+            "client_kbps": args.client_kbps,
+            "stream_seconds": args.stream_seconds,
+            "sessions": args.sessions,
+        },
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,248 @@
+"""
+Fake Sonos speaker fleet for the benchmark and simulation tools.
+
+Each speaker is a small HTTP server bound to its own loopback address on port
+1400, the port `SonosConnectorRepo` always targets, so the app talks to it the
+same way it talks to a real device. Linux routes all of 127.0.0.0/8 to the
+loopback interface; on macOS add the aliases first
+(`sudo ifconfig lo0 alias 127.0.0.11`, one per speaker).
+
+Every request is recorded as a `DeviceCommand` with a `time.perf_counter()`
+arrival timestamp, so a caller in the same process can measure the delay
+between its own request and the command that reached the device. SOAP writes
+get an empty success response and update a little transport state; reads
+(transport info, volume, position, media info, device description) return
+values of an idle speaker. `latency_ms` delays every response to mimic device
+processing time and `failure_rate` answers a share of commands with HTTP 500.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from xml.sax.saxutils import escape, unescape
+
+
+SONOS_PORT = 1400
+SOAP_ACTION_PATTERN = re.compile(r"#(?P<action>\w+)\"?\s*$")
+CURRENT_URI_PATTERN = re.compile(r"<(?:CurrentURI|EnqueuedURI)>(?P<uri>.*?)</(?:CurrentURI|EnqueuedURI)>", re.DOTALL)
+TRANSPORT_STATES = {"Play": "PLAYING", "Pause": "PAUSED_PLAYBACK", "Stop": "STOPPED"}
+
+
+@dataclass
+class DeviceCommand:
+    ip: str
+    path: str
+    action: str
+    uri: Optional[str]
+    received: float
+    status: int
+
+
+def loopback_ips(count: int, first: int = 11) -> list[str]:
+    """Return `count` loopback addresses starting at `127.0.0.<first>`."""
+    if count < 1 or first + count - 1 > 254:
+        raise ValueError(f"Cannot allocate {count} loopback addresses from 127.0.0.{first}.")
+    return [f"127.0.0.{first + index}" for index in range(count)]
+
+
+class FakeSpeaker:
+    def __init__(self, ip: str, index: int):
+        self.ip = ip
+        self.rincon_id = f"5CAAFD{index:06X}01400"
+        self.room_name = f"Fake Speaker {index + 1}"
+        self.transport_state = "STOPPED"
+        self.current_uri = ""
+        self.volume = 20
+        self.lock = threading.Lock()
+
+    def apply(self, action: str, body: str, uri: Optional[str]):
+        with self.lock:
+            if action in TRANSPORT_STATES:
+                self.transport_state = TRANSPORT_STATES[action]
+            elif action == "SetAVTransportURI" and uri is not None:
+                self.current_uri = uri
+            elif action == "SetVolume":
+                match = re.search(r"<DesiredVolume>(\d+)</DesiredVolume>", body)
+                if match:
+                    self.volume = int(match.group(1))
+
+    def soap_result(self, action: str) -> str:
+        with self.lock:
+            values = {
+                "GetTransportInfo": {
+                    "CurrentTransportState": self.transport_state,
+                    "CurrentTransportStatus": "OK",
+                    "CurrentSpeed": "1",
+                },
+                "GetVolume": {"CurrentVolume": str(self.volume)},
+                "GetMute": {"CurrentMute": "0"},
+                "GetPositionInfo": {
+                    "Track": "1",
+                    "TrackDuration": "0:00:00",
+                    "TrackMetaData": "",
+                    "TrackURI": self.current_uri,
+                    "RelTime": "0:00:00",
+                    "AbsTime": "NOT_IMPLEMENTED",
+                    "RelCount": "2147483647",
+                    "AbsCount": "2147483647",
+                },
+                "GetMediaInfo": {
+                    "NrTracks": "1" if self.current_uri else "0",
+                    "MediaDuration": "NOT_IMPLEMENTED",
+                    "CurrentURI": self.current_uri,
+                    "CurrentURIMetaData": "",
+                    "NextURI": "",
+                    "NextURIMetaData": "",
+                    "PlayMedium": "NETWORK",
+                    "RecordMedium": "NOT_IMPLEMENTED",
+                    "WriteStatus": "NOT_IMPLEMENTED",
+                },
+                "AddURIToQueue": {"FirstTrackNumberEnqueued": "1", "NumTracksAdded": "1", "NewQueueLength": "1"},
+                "Browse": {"Result": "<DIDL-Lite></DIDL-Lite>", "NumberReturned": "0", "TotalMatches": "0", "UpdateID": "1"},
+                "GetZoneGroupState": {"ZoneGroupState": ""},
+            }.get(action, {})
+        return "".join(f"<{name}>{escape(value)}</{name}>" for name, value in values.items())
+
+    def device_description(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<root xmlns="urn:schemas-upnp-org:device-1-0"><device>'
+            "<deviceType>urn:schemas-upnp-org:device:ZonePlayer:1</deviceType>"
+            f"<friendlyName>{self.ip} - Fake Speaker</friendlyName>"
+            f"<roomName>{self.room_name}</roomName>"
+            "<modelName>Fake One</modelName>"
+            f"<UDN>uuid:RINCON_{self.rincon_id}</UDN>"
+            "</device></root>"
+        )
+
+
+class FakeSpeakerFleet:
+    """Runs one fake speaker per loopback address; use as a context manager."""
+
+    def __init__(self, ips: list[str], latency_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 42):
+        self.ips = list(ips)
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.speakers = {ip: FakeSpeaker(ip, index) for index, ip in enumerate(self.ips)}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._commands: list[DeviceCommand] = []
+        self._servers: list[ThreadingHTTPServer] = []
+        self._threads: list[threading.Thread] = []
+
+    def __enter__(self) -> "FakeSpeakerFleet":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        for ip in self.ips:
+            try:
+                server = ThreadingHTTPServer((ip, SONOS_PORT), self._handler_class(self.speakers[ip]))
+            except OSError as error:
+                self.stop()
+                raise RuntimeError(
+                    f"Cannot bind fake speaker {ip}:{SONOS_PORT} ({error}). "
+                    "Free the port, or on macOS add the loopback alias first."
+                ) from error
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, name=f"fake-speaker-{ip}", daemon=True)
+            thread.start()
+            self._servers.append(server)
+            self._threads.append(thread)
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._servers.clear()
+        self._threads.clear()
+
+    def mark(self) -> int:
+        with self._lock:
+            return len(self._commands)
+
+    def commands(self, start_mark: int = 0, end_mark: Optional[int] = None) -> list[DeviceCommand]:
+        with self._lock:
+            return self._commands[start_mark:end_mark]
+
+    def _record(self, command: DeviceCommand):
+        with self._lock:
+            self._commands.append(command)
+
+    def _should_fail(self) -> bool:
+        if self.failure_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    def _handler_class(self, speaker: FakeSpeaker):
+        fleet = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status: int, body: str, content_type: str = 'text/xml; charset="utf-8"'):
+                payload = body.encode("utf-8")
+                if fleet.latency_ms > 0:
+                    time.sleep(fleet.latency_ms / 1000)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                received = time.perf_counter()
+                if self.path.startswith("/xml/device_description.xml"):
+                    status, body = 200, speaker.device_description()
+                else:
+                    status, body = 404, ""
+                fleet._record(DeviceCommand(speaker.ip, self.path, "GET", None, received, status))
+                self._respond(status, body)
+
+            def do_POST(self):
+                received = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8", errors="replace") if length else ""
+                soap_action = SOAP_ACTION_PATTERN.search(self.headers.get("SOAPACTION", ""))
+                action = soap_action.group("action") if soap_action else self.path.rsplit("/", 1)[-1]
+                uri_match = CURRENT_URI_PATTERN.search(body)
+                uri = unescape(uri_match.group("uri")) if uri_match else None
+
+                if fleet._should_fail():
+                    fleet._record(DeviceCommand(speaker.ip, self.path, action, uri, received, 500))
+                    self._respond(500, "")
+                    return
+
+                speaker.apply(action, body, uri)
+                fleet._record(DeviceCommand(speaker.ip, self.path, action, uri, received, 200))
+                service = "RenderingControl" if "RenderingControl" in self.path else "AVTransport"
+                if "ContentDirectory" in self.path:
+                    service = "ContentDirectory"
+                elif "ZoneGroupTopology" in self.path:
+                    service = "ZoneGroupTopology"
+                self._respond(
+                    200,
+                    '<?xml version="1.0"?>'
+                    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+                    's:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body>'
+                    f'<u:{action}Response xmlns:u="urn:schemas-upnp-org:service:{service}:1">'
+                    f"{speaker.soap_result(action)}"
+                    f"</u:{action}Response></s:Body></s:Envelope>",
+                )
+
+        return Handler
@@ -0,0 +1,686 @@
+#!/usr/bin/env python3
+"""
+Store benchmark samples across commits and report trends and regressions.
+
+The perf tools call `record_run()` after each run, which appends the raw
+samples to a SQLite file (`artifacts/perf/results.db`, override with
+`PERF_RESULTS_DB`; set it to `off` to skip recording). Runs are keyed by
+scenario, git commit and a machine fingerprint so numbers from different
+hardware are never compared with each other. Runs are only pooled and compared
+with runs of the same scenario parameters (`--demo-data`, `--duration`, ...),
+and runs from a dirty working tree are left out unless `--include-dirty` is set.
+
+  report   per-metric trend table over the last N commits, optional HTML charts
+  compare  candidate commit vs. the main-branch baseline; exits 1 on regressions
+
+Regressions are flagged with a two-sided Mann-Whitney U test over the repeated
+samples of both commits (exact for small samples without ties, otherwise the
+normal approximation with tie correction) combined with a minimum median change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import sonos_harness as harness
+
+
+DEFAULT_DB_PATH = harness.PERF_ARTIFACTS_DIR / "results.db"
+DEFAULT_BASELINE_BRANCH = "main"
+MIN_SAMPLES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    fingerprint TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    first_seen_utc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    branch TEXT,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    machine TEXT NOT NULL REFERENCES machines(fingerprint),
+    recorded_at_utc TEXT NOT NULL,
+    parameters TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    scenario TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    higher_is_better INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scenario, metric)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS IX_runs_scenario_machine_commit ON runs (scenario, machine, commit_sha);
+CREATE INDEX IF NOT EXISTS IX_samples_run_metric ON samples (run_id, metric);
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report benchmark trends and regressions from the perf results store.")
+    parser.add_argument("--db", default=None, help="Results database (default: PERF_RESULTS_DB or artifacts/perf/results.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report = subparsers.add_parser("report", help="Trend table per metric over recent commits")
+    report.add_argument("--scenario", default=None, help="Limit to one scenario (default: all)")
+    report.add_argument("--metric", default=None, help="Only metrics containing this text")
+    report.add_argument("--machine", default="current", help="Fingerprint, or `current` for this machine (default)")
+    report.add_argument("--last", type=int, default=15, help="Commits to show per scenario (default: 15)")
+    report.add_argument("--baseline-branch", default=DEFAULT_BASELINE_BRANCH)
+    report.add_argument("--html", default=None, help="Also write an HTML report with trend charts to this path")
+    report.add_argument("--include-dirty", action="store_true", help="Include runs recorded from a dirty working tree (marked *)")
+
+    compare = subparsers.add_parser("compare", help="Compare a commit against the baseline branch")
+    compare.add_argument("--scenario", default=None)
+    compare.add_argument("--machine", default="current")
+    compare.add_argument("--commit", default="HEAD", help="Candidate commit (default: HEAD)")
+    compare.add_argument("--baseline", default=None, help="Baseline commit (default: merge-base with --baseline-branch)")
+    compare.add_argument("--baseline-branch", default=DEFAULT_BASELINE_BRANCH)
+    compare.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: 0.05)")
+    compare.add_argument("--min-change", type=float, default=5.0, help="Minimum median change in %% to flag (default: 5)")
+    compare.add_argument("--include-dirty", action="store_true", help="Include runs recorded from a dirty working tree")
+
+    subparsers.add_parser("machines", help="List recorded machine fingerprints")
+    return parser.parse_args()
+
+
+def results_db_path(override: Optional[str] = None) -> Optional[Path]:
+    raw = override or os.getenv("PERF_RESULTS_DB")
+    if raw and raw.lower() == "off":
+        return None
+    path = Path(raw) if raw else DEFAULT_DB_PATH
+    return path if path.is_absolute() else harness.PROJECT_ROOT / path
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def git_output(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=harness.PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_branch() -> Optional[str]:
+    # CI checkouts are usually detached, so allow the branch to be passed in.
+    branch = os.getenv("PERF_BRANCH") or git_output("rev-parse", "--abbrev-ref", "HEAD")
+    return None if branch == "HEAD" else branch
+
+
+def resolve_commit(ref: str) -> Optional[str]:
+    return git_output("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+
+
+def machine_description() -> dict:
+    memory_mb = None
+    try:
+        memory_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        pass
+    return {
+        "host": os.getenv("PERF_MACHINE_NAME") or platform.node(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "memory_mb": memory_mb,
+    }
+
+
+def machine_fingerprint(description: Optional[dict] = None) -> str:
+    description = description or machine_description()
+    canonical = json.dumps(description, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def record_run(
+    scenario: str,
+    samples: dict[str, list[float]],
+    units: Optional[dict[str, str]] = None,
+    higher_is_better: Optional[set[str]] = None,
+    parameters: Optional[dict] = None,
+) -> Optional[int]:
+    """Append one benchmark run with its raw samples per metric and return the run id.
+
+    Metrics default to milliseconds where lower is better. Returns `None` when
+    recording is disabled or the working tree is not a git checkout.
+    """
+    db_path = results_db_path()
+    commit = harness.git_commit()
+    if db_path is None or commit is None:
+        return None
+
+    description = machine_description()
+    fingerprint = machine_fingerprint(description)
+    recorded_at = datetime.now(timezone.utc).isoformat()
+    units = units or {}
+    higher_is_better = higher_is_better or set()
+    with connect(db_path) as connection:
+        connection.execute(
+            "INSERT OR IGNORE INTO machines (fingerprint, description, first_seen_utc) VALUES (?, ?, ?)",
+            (fingerprint, json.dumps(description, sort_keys=True), recorded_at),
+        )
+        run_id = connection.execute(
+            "INSERT INTO runs (scenario, commit_sha, branch, dirty, machine, recorded_at_utc, parameters) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                scenario,
+                commit,
+                git_branch(),
+                int(bool(git_output("status", "--porcelain", "--untracked-files=no"))),
+                fingerprint,
+                recorded_at,
+                json.dumps(parameters or {}, sort_keys=True, default=str),
+            ),
+        ).lastrowid
+        for metric, values in samples.items():
+            connection.execute(
+                "INSERT INTO metrics (scenario, metric, unit, higher_is_better) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (scenario, metric) DO UPDATE SET unit = excluded.unit, higher_is_better = excluded.higher_is_better",
+                (scenario, metric, units.get(metric, "ms"), int(metric in higher_is_better)),
+            )
+            connection.executemany(
+                "INSERT INTO samples (run_id, metric, value) VALUES (?, ?, ?)",
+                [(run_id, metric, float(value)) for value in values if value is not None],
+            )
+    print(f"Recorded {scenario} run {run_id} for {commit[:10]} on machine {fingerprint} in {db_path}")
+    return run_id
+
+
+def mann_whitney_u(sample_a: list[float], sample_b: list[float]) -> tuple[float, float]:
+    """Two-sided Mann-Whitney U test. Returns `(U of sample_a, p-value)`."""
+    n_a, n_b = len(sample_a), len(sample_b)
+    combined = sorted([(value, 0) for value in sample_a] + [(value, 1) for value in sample_b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        tied = end - index + 1
+        tie_term += tied**3 - tied
+        index = end + 1
+
+    rank_sum_a = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_a = rank_sum_a - n_a * (n_a + 1) / 2
+    mean_u = n_a * n_b / 2
+
+    if tie_term == 0 and n_a + n_b <= 30:
+        counts = exact_u_distribution(n_a, n_b)
+        total = sum(counts)
+        lower = sum(counts[: int(u_a) + 1]) / total
+        upper = sum(counts[int(u_a):]) / total
+        return u_a, min(1.0, 2 * min(lower, upper))
+
+    n = n_a + n_b
+    variance = n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u_a, 1.0
+    z = (abs(u_a - mean_u) - 0.5) / math.sqrt(variance)
+    return u_a, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def exact_u_distribution(n_a: int, n_b: int) -> list[int]:
+    """Number of rank orderings giving each U value for sample sizes `n_a`, `n_b`."""
+    # table[i][j] holds the U-count list for i values from a and j from b.
+    table = [[[1] if i == 0 or j == 0 else None for j in range(n_b + 1)] for i in range(n_a + 1)]
+    for i in range(1, n_a + 1):
+        for j in range(1, n_b + 1):
+            # The largest value comes from a (beating all j of b) or from b.
+            from_a = [0] * j + table[i - 1][j]
+            from_b = table[i][j - 1]
+            size = max(len(from_a), len(from_b))
+            table[i][j] = [
+                (from_a[k] if k < len(from_a) else 0) + (from_b[k] if k < len(from_b) else 0)
+                for k in range(size)
+            ]
+    return table[n_a][n_b]
+
+
+def compare_samples(
+    candidate: list[float],
+    baseline: list[float],
+    higher_is_better: bool,
+    alpha: float = 0.05,
+    min_change_pct: float = 5.0,
+) -> dict:
+    result = {
+        "candidate_median": statistics.median(candidate) if candidate else None,
+        "baseline_median": statistics.median(baseline) if baseline else None,
+        "change_pct": None,
+        "p_value": None,
+        "status": "insufficient",
+    }
+    if len(candidate) < MIN_SAMPLES or len(baseline) < MIN_SAMPLES:
+        return result
+
+    base = result["baseline_median"]
+    if base:
+        result["change_pct"] = round((result["candidate_median"] - base) / abs(base) * 100, 2)
+    _, p_value = mann_whitney_u(candidate, baseline)
+    result["p_value"] = round(p_value, 4)
+
+    change = result["change_pct"] or 0.0
+    worse = change < 0 if higher_is_better else change > 0
+    if p_value < alpha and abs(change) >= min_change_pct:
+        result["status"] = "regression" if worse else "improvement"
+    else:
+        result["status"] = "unchanged"
+    return result
+
+
+def resolve_machine(connection: sqlite3.Connection, machine: str) -> str:
+    if machine == "current":
+        return machine_fingerprint()
+    matches = [row[0] for row in connection.execute("SELECT fingerprint FROM machines WHERE fingerprint LIKE ?", (f"{machine}%",))]
+    if len(matches) != 1:
+        raise ValueError(f"Machine '{machine}' matched {len(matches)} fingerprints; run `machines` to list them.")
+    return matches[0]
+
+
+def scenarios_for(connection: sqlite3.Connection, machine: str, scenario: Optional[str]) -> list[str]:
+    if scenario:
+        return [scenario]
+    return [row[0] for row in connection.execute("SELECT DISTINCT scenario FROM runs WHERE machine = ? ORDER BY scenario", (machine,))]
+
+
+def metric_definitions(connection: sqlite3.Connection, scenario: str, metric_filter: Optional[str] = None) -> list[tuple[str, str, bool]]:
+    rows = connection.execute(
+        "SELECT metric, unit, higher_is_better FROM metrics WHERE scenario = ? ORDER BY metric",
+        (scenario,),
+    ).fetchall()
+    return [(metric, unit, bool(flag)) for metric, unit, flag in rows if not metric_filter or metric_filter in metric]
+
+
+def run_filter(include_dirty: bool) -> str:
+    """WHERE clause for one series: scenario, machine and parameters, bound in that order."""
+    clause = "runs.scenario = ? AND runs.machine = ? AND runs.parameters = ?"
+    return clause if include_dirty else clause + " AND runs.dirty = 0"
+
+
+def parameter_sets(connection: sqlite3.Connection, scenario: str, machine: str, include_dirty: bool) -> list[str]:
+    """Distinct parameter sets recorded for a scenario, most recently used first."""
+    rows = connection.execute(
+        "SELECT parameters FROM runs WHERE scenario = ? AND machine = ?"
+        + ("" if include_dirty else " AND dirty = 0")
+        + " GROUP BY parameters ORDER BY MAX(recorded_at_utc) DESC",
+        (scenario, machine),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def describe_parameters(parameters: str) -> str:
+    values = json.loads(parameters)
+    return ", ".join(f"{key}={value}" for key, value in values.items()) or "no parameters"
+
+
+def commit_history(
+    connection: sqlite3.Connection,
+    scenario: str,
+    machine: str,
+    parameters: str,
+    limit: int,
+    include_dirty: bool = False,
+) -> list[dict]:
+    """Commits with runs for one scenario and parameter set on one machine, oldest first."""
+    rows = connection.execute(
+        "SELECT commit_sha, MAX(branch), MIN(recorded_at_utc), COUNT(*), MAX(dirty) FROM runs "
+        f"WHERE {run_filter(include_dirty)} GROUP BY commit_sha ORDER BY MIN(recorded_at_utc) DESC LIMIT ?",
+        (scenario, machine, parameters, limit),
+    ).fetchall()
+    return [
+        {"commit": commit, "branch": branch, "first_recorded_utc": recorded, "runs": runs, "dirty": bool(dirty)}
+        for commit, branch, recorded, runs, dirty in reversed(rows)
+    ]
+
+
+def commit_samples(
+    connection: sqlite3.Connection,
+    scenario: str,
+    machine: str,
+    parameters: str,
+    commit: str,
+    metric: str,
+    include_dirty: bool = False,
+) -> list[float]:
+    return [
+        row[0]
+        for row in connection.execute(
+            "SELECT samples.value FROM samples JOIN runs ON runs.id = samples.run_id "
+            f"WHERE {run_filter(include_dirty)} AND runs.commit_sha = ? AND samples.metric = ?",
+            (scenario, machine, parameters, commit, metric),
+        )
+    ]
+
+
+def has_runs(
+    connection: sqlite3.Connection,
+    scenario: str,
+    machine: str,
+    parameters: str,
+    commit: str,
+    include_dirty: bool = False,
+) -> bool:
+    return connection.execute(
+        f"SELECT 1 FROM runs WHERE {run_filter(include_dirty)} AND runs.commit_sha = ? LIMIT 1",
+        (scenario, machine, parameters, commit),
+    ).fetchone() is not None
+
+
+def find_baseline(
+    connection: sqlite3.Connection,
+    scenario: str,
+    machine: str,
+    parameters: str,
+    candidate: str,
+    baseline_branch: str,
+    include_dirty: bool = False,
+) -> Optional[str]:
+    """Prefer the merge-base with the baseline branch, else the latest run recorded on it."""
+    merge_base = git_output("merge-base", candidate, baseline_branch)
+    if merge_base and merge_base != candidate and has_runs(connection, scenario, machine, parameters, merge_base, include_dirty):
+        return merge_base
+
+    row = connection.execute(
+        f"SELECT commit_sha FROM runs WHERE {run_filter(include_dirty)} AND runs.branch = ? AND runs.commit_sha != ? "
+        "ORDER BY recorded_at_utc DESC LIMIT 1",
+        (scenario, machine, parameters, baseline_branch, candidate),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def compare_commits(
+    connection: sqlite3.Connection,
+    scenario: str,
+    machine: str,
+    parameters: str,
+    candidate: str,
+    baseline: str,
+    alpha: float,
+    min_change_pct: float,
+    include_dirty: bool = False,
+) -> list[dict]:
+    results = []
+    for metric, unit, higher_is_better in metric_definitions(connection, scenario):
+        comparison = compare_samples(
+            commit_samples(connection, scenario, machine, parameters, candidate, metric, include_dirty),
+            commit_samples(connection, scenario, machine, parameters, baseline, metric, include_dirty),
+            higher_is_better,
+            alpha,
+            min_change_pct,
+        )
+        results.append({"metric": metric, "unit": unit, **comparison})
+    return results
+
+
+def format_change(change: Optional[float]) -> str:
+    return "-" if change is None else f"{change:+.1f}%"
+
+
+def build_trends(connection: sqlite3.Connection, args: argparse.Namespace, machine: str) -> list[dict]:
+    trends = []
+    include_dirty = args.include_dirty
+    for scenario in scenarios_for(connection, machine, args.scenario):
+        # Each parameter set is its own series; runs with other settings are not comparable.
+        for parameters in parameter_sets(connection, scenario, machine, include_dirty):
+            history = commit_history(connection, scenario, machine, parameters, args.last, include_dirty)
+            if not history:
+                continue
+            baseline = find_baseline(
+                connection, scenario, machine, parameters, history[-1]["commit"], args.baseline_branch, include_dirty
+            )
+            for metric, unit, higher_is_better in metric_definitions(connection, scenario, args.metric):
+                baseline_values = (
+                    commit_samples(connection, scenario, machine, parameters, baseline, metric, include_dirty) if baseline else []
+                )
+                points = []
+                for entry in history:
+                    values = commit_samples(connection, scenario, machine, parameters, entry["commit"], metric, include_dirty)
+                    if not values:
+                        continue
+                    comparison = compare_samples(values, baseline_values, higher_is_better)
+                    if entry["commit"] == baseline:
+                        comparison["status"] = "baseline"
+                    points.append({**entry, "summary": harness.summarize(values), **comparison})
+                if points:
+                    trends.append(
+                        {
+                            "scenario": scenario,
+                            "parameters": describe_parameters(parameters),
+                            "metric": metric,
+                            "unit": unit,
+                            "higher_is_better": higher_is_better,
+                            "baseline": baseline,
+                            "points": points,
+                        }
+                    )
+    return trends
+
+
+def print_trends(trends: list[dict]):
+    for trend in trends:
+        direction = "higher is better" if trend["higher_is_better"] else "lower is better"
+        baseline = trend["baseline"][:10] if trend["baseline"] else "none"
+        print(f"\n{trend['scenario']} / {trend['metric']} ({trend['unit']}, {direction}; baseline {baseline})")
+        print(f"  {trend['parameters']}")
+        harness.print_table(
+            ["commit", "branch", "n", "median", "p95", "vs base", "p", "status"],
+            [
+                [
+                    point["commit"][:10] + ("*" if point["dirty"] else ""),
+                    point["branch"] or "-",
+                    point["summary"]["count"],
+                    point["summary"]["median"],
+                    point["summary"]["p95"],
+                    format_change(point["change_pct"]),
+                    harness.format_value(point["p_value"], 4),
+                    point["status"],
+                ]
+                for point in trend["points"]
+            ],
+        )
+
+
+def svg_chart(trend: dict, width: int = 640, height: int = 220) -> str:
+    """Median line with a min-max band per commit, regressions marked in red."""
+    points = trend["points"]
+    lows = [point["summary"]["min"] for point in points]
+    highs = [point["summary"]["max"] for point in points]
+    low, high = min(lows), max(highs)
+    span = (high - low) or 1.0
+    pad = 32
+    step = (width - 2 * pad) / max(len(points) - 1, 1)
+
+    def x(index: int) -> float:
+        return pad + index * step
+
+    def y(value: float) -> float:
+        return height - pad - (value - low) / span * (height - 2 * pad)
+
+    band = " ".join(f"{x(i):.1f},{y(value):.1f}" for i, value in enumerate(highs))
+    band += " " + " ".join(f"{x(i):.1f},{y(value):.1f}" for i, value in reversed(list(enumerate(lows))))
+    line = " ".join(f"{x(i):.1f},{y(point['summary']['median']):.1f}" for i, point in enumerate(points))
+    colours = {"regression": "#c62828", "improvement": "#2e7d32", "baseline": "#1565c0"}
+    markers = "".join(
+        f'<circle cx="{x(i):.1f}" cy="{y(point["summary"]["median"]):.1f}" r="4" fill="{colours.get(point["status"], "#555")}">'
+        f'<title>{html.escape(point["commit"][:10])}: {point["summary"]["median"]} {html.escape(trend["unit"])} '
+        f'({html.escape(point["status"])})</title></circle>'
+        for i, point in enumerate(points)
+    )
+    labels = "".join(
+        f'<text x="{x(i):.1f}" y="{height - 8}" font-size="10" text-anchor="middle">{html.escape(point["commit"][:7])}</text>'
+        for i, point in enumerate(points)
+    )
+    return (
+        f'<svg viewBox="0 0 {width} {height}" width="{width}" height="{height}" role="img">'
+        f'<polygon points="{band}" fill="#90caf9" fill-opacity="0.35"/>'
+        f'<polyline points="{line}" fill="none" stroke="#1565c0" stroke-width="2"/>'
+        f'{markers}{labels}'
+        f'<text x="4" y="{pad - 12}" font-size="10">{harness.format_value(high, 2)}</text>'
+        f'<text x="4" y="{height - pad + 4}" font-size="10">{harness.format_value(low, 2)}</text>'
+        "</svg>"
+    )
+
+
+def write_html_report(path: Path, trends: list[dict], machine: str):
+    sections = []
+    for trend in trends:
+        rows = "".join(
+            f"<tr class=\"{point['status']}\"><td>{html.escape(point['commit'][:10])}</td>"
+            f"<td>{html.escape(point['branch'] or '-')}</td><td>{point['summary']['count']}</td>"
+            f"<td>{point['summary']['median']}</td><td>{point['summary']['p95']}</td>"
+            f"<td>{format_change(point['change_pct'])}</td><td>{harness.format_value(point['p_value'], 4)}</td>"
+            f"<td>{point['status']}</td></tr>"
+            for point in trend["points"]
+        )
+        sections.append(
+            f"<section><h2>{html.escape(trend['scenario'])} / {html.escape(trend['metric'])} "
+            f"<small>({html.escape(trend['unit'])})</small></h2>"
+            f"<p><small>{html.escape(trend['parameters'])}</small></p>{svg_chart(trend)}"
+            "<table><tr><th>commit</th><th>branch</th><th>n</th><th>median</th><th>p95</th>"
+            f"<th>vs base</th><th>p</th><th>status</th></tr>{rows}</table></section>"
+        )
+
+    path = path if path.is_absolute() else harness.PROJECT_ROOT / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>SonosControl benchmark trends</title><style>"
+        "body{font-family:system-ui,sans-serif;margin:2rem;color:#222}section{margin-bottom:2.5rem}"
+        "table{border-collapse:collapse;font-size:.85rem}td,th{padding:.2rem .6rem;border-bottom:1px solid #ddd;text-align:right}"
+        "tr.regression{background:#ffebee}tr.improvement{background:#e8f5e9}tr.baseline{background:#e3f2fd}"
+        "</style></head><body>"
+        f"<h1>Benchmark trends</h1><p>Machine {html.escape(machine)}, generated "
+        f"{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}.</p>"
+        + "".join(sections)
+        + "</body></html>",
+        encoding="utf-8",
+    )
+    return path
+
+
+def run_report(connection: sqlite3.Connection, args: argparse.Namespace) -> int:
+    machine = resolve_machine(connection, args.machine)
+    trends = build_trends(connection, args, machine)
+    if not trends:
+        print(f"No results recorded for machine {machine}.")
+        return 0
+
+    print_trends(trends)
+    if args.html:
+        print(f"\nHTML report written to {write_html_report(Path(args.html), trends, machine)}")
+    return 0
+
+
+def run_compare(connection: sqlite3.Connection, args: argparse.Namespace) -> int:
+    machine = resolve_machine(connection, args.machine)
+    candidate = resolve_commit(args.commit) or args.commit
+    include_dirty = args.include_dirty
+    regressions = 0
+    for scenario in scenarios_for(connection, machine, args.scenario):
+        for parameters in parameter_sets(connection, scenario, machine, include_dirty):
+            if not has_runs(connection, scenario, machine, parameters, candidate, include_dirty):
+                continue
+            label = f"{scenario} ({describe_parameters(parameters)})"
+            baseline = resolve_commit(args.baseline) if args.baseline else find_baseline(
+                connection, scenario, machine, parameters, candidate, args.baseline_branch, include_dirty
+            )
+            if not baseline or not has_runs(connection, scenario, machine, parameters, baseline, include_dirty):
+                print(f"{label}: no baseline with the same parameters on machine {machine}; skipped.")
+                continue
+
+            results = compare_commits(
+                connection, scenario, machine, parameters, candidate, baseline, args.alpha, args.min_change, include_dirty
+            )
+            if not any(result["candidate_median"] is not None for result in results):
+                continue
+            regressions += print_comparison(label, candidate, baseline, results, include_dirty)
+
+    print(f"\n{regressions} significant regression(s).")
+    return 1 if regressions else 0
+
+
+def print_comparison(label: str, candidate: str, baseline: str, results: list[dict], include_dirty: bool) -> int:
+    """Print one scenario/parameter comparison and return its regression count."""
+    print(f"\n{label}: {candidate[:10]} vs baseline {baseline[:10]}" + (" (dirty runs included)" if include_dirty else ""))
+    harness.print_table(
+        ["metric", "baseline", "candidate", "change", "p", "status"],
+        [
+            [
+                result["metric"],
+                result["baseline_median"],
+                result["candidate_median"],
+                format_change(result["change_pct"]),
+                harness.format_value(result["p_value"], 4),
+                result["status"],
+            ]
+            for result in results
+        ],
+    )
+    return sum(1 for result in results if result["status"] == "regression")
+
+
+def run_machines(connection: sqlite3.Connection) -> int:
+    current = machine_fingerprint()
+    for fingerprint, description, first_seen in connection.execute(
+        "SELECT fingerprint, description, first_seen_utc FROM machines ORDER BY first_seen_utc"
+    ):
+        marker = "*" if fingerprint == current else " "
+        print(f"{marker} {fingerprint}  first seen {first_seen}  {description}")
+    return 0
+
+
+def run():
+    args = parse_args()
+    db_path = results_db_path(args.db)
+    if db_path is None:
+        raise RuntimeError("PERF_RESULTS_DB is set to `off`; pass --db to read a results database.")
+    if not db_path.exists():
+        raise RuntimeError(f"No results database at {db_path}. Run a benchmark first.")
+
+    with connect(db_path) as connection:
+        if args.command == "report":
+            exit_code = run_report(connection, args)
+        elif args.command == "compare":
+            exit_code = run_compare(connection, args)
+        else:
+            exit_code = run_machines(connection)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Profile SonosControl.Web cold starts phase by phase.
+
+Launches the app N times against fresh isolated runtimes and breaks each start
+into phases using the `Startup phase ... reached at ...` log lines written by
+`Program.cs`, plus the first successful HTTP response observed here:
+
+  launcher       `dotnet run` spawn -> app process start
+  runtime-init   app process start -> top of Program.cs
+  host-build     Program.cs -> WebApplication built
+  migrations     EF Core `Database.Migrate()`
+  seeding        admin role/user seeding
+  server-start   seeding done -> Kestrel listening
+  first-request  Kestrel listening -> first `/auth/login` response
+
+Reports min/median/max per phase and records every run in the perf results store
+(`perf_results.py`) so phases can be tracked across commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import perf_results
+import sonos_harness as harness
+
+
+PHASE_PATTERN = re.compile(r"Startup phase (?P<phase>[\w-]+) reached at (?P<timestamp>\S+?)\.?$")
+PHASES = [
+    ("launcher", "spawn", "process-start"),
+    ("runtime-init", "process-start", "program-start"),
+    ("host-build", "program-start", "host-build"),
+    ("migrations", "host-build", "migrations"),
+    ("seeding", "migrations", "seeding"),
+    ("server-start", "seeding", "server-started"),
+    ("first-request", "server-started", "first-request"),
+    ("total", "spawn", "first-request"),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure SonosControl.Web cold-start phases over repeated runs.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_STARTUP_BASE_URL", "http://localhost:5117"))
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts (default: 5)")
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument(
+        "--warm-db",
+        action="store_true",
+        help="Reuse one runtime directory so runs after the first start with an up-to-date database.",
+    )
+    parser.add_argument("--build", action="store_true", help="Run `dotnet build` once before profiling")
+    parser.add_argument("--out", default="artifacts/perf/startup_profile.json")
+    return parser.parse_args()
+
+
+def parse_timestamp(raw: str) -> datetime:
+    # .NET round-trip format carries 7 fractional digits; Python accepts at most 6.
+    match = re.match(r"(?P<base>[\d:T-]+)(?:\.(?P<fraction>\d+))?(?P<zone>Z|[+-]\d{2}:\d{2})?$", raw)
+    if not match:
+        raise ValueError(f"Unrecognised timestamp: {raw}")
+    fraction = (match.group("fraction") or "0")[:6].ljust(6, "0")
+    zone = match.group("zone") or "Z"
+    zone = "+00:00" if zone == "Z" else zone
+    return datetime.fromisoformat(f"{match.group('base')}.{fraction}{zone}")
+
+
+def pump_output(stream, log_stream, marks: dict):
+    for line in iter(stream.readline, ""):
+        log_stream.write(line)
+        match = PHASE_PATTERN.search(line.strip())
+        if match:
+            marks.setdefault(match.group("phase"), parse_timestamp(match.group("timestamp")))
+
+
+def wait_for_port_release(base_url: str, timeout_seconds: float = 15):
+    deadline = time.time() + timeout_seconds
+    while time.time() < deadline and harness.is_server_reachable(base_url):
+        time.sleep(0.5)
+
+
+def profile_cold_start(base_url: str, run_index: int, runtime_dir: Path, timeout_seconds: int) -> dict:
+    log_path = harness.ARTIFACTS_DIR / f"perf-startup_server_{run_index}.log"
+    marks: dict[str, datetime] = {}
+    with log_path.open("w", encoding="utf-8") as log_stream:
+        marks["spawn"] = datetime.now(timezone.utc)
+        process = subprocess.Popen(
+            ["dotnet", "run", "--project", "SonosControl.Web", "--no-build", "--urls", base_url],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=harness.PROJECT_ROOT,
+            shell=False,
+            env=harness.build_server_env(runtime_dir, "perf-startup"),
+        )
+        reader = threading.Thread(target=pump_output, args=(process.stdout, log_stream, marks), daemon=True)
+        reader.start()
+        try:
+            deadline = time.time() + timeout_seconds
+            while time.time() < deadline:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {process.returncode}. Check {log_path}.")
+                if harness.is_server_reachable(base_url):
+                    marks["first-request"] = datetime.now(timezone.utc)
+                    break
+                time.sleep(0.05)
+            else:
+                raise RuntimeError(f"Timed out waiting for {base_url}. Check {log_path}.")
+        finally:
+            harness.stop_local_server(process, None)
+            reader.join(timeout=5)
+
+    durations = {}
+    for phase, start, end in PHASES:
+        if start in marks and end in marks:
+            durations[phase] = round((marks[end] - marks[start]).total_seconds() * 1000, 1)
+        else:
+            durations[phase] = None
+    return durations
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    if harness.is_server_reachable(base_url):
+        raise RuntimeError(f"{base_url} is already serving; pick a free --base-url for cold-start profiling.")
+
+    if args.build:
+        subprocess.run(["dotnet", "build", "SonosControl.Web"], cwd=harness.PROJECT_ROOT, check=True)
+
+    shared_runtime = harness.create_runtime_dir("perf-startup") if args.warm_db else None
+    runs: list[dict] = []
+    try:
+        for run_index in range(1, args.runs + 1):
+            runtime_dir = shared_runtime or harness.create_runtime_dir("perf-startup")
+            try:
+                durations = profile_cold_start(base_url, run_index, runtime_dir, args.server_timeout)
+            finally:
+                if shared_runtime is None:
+                    harness.stop_local_server(None, None, runtime_dir)
+            runs.append(durations)
+            print(f"Run {run_index}/{args.runs}: total={harness.format_value(durations['total'])} ms")
+            wait_for_port_release(base_url)
+    finally:
+        if shared_runtime is not None:
+            harness.stop_local_server(None, None, shared_runtime)
+
+    summary = {
+        phase: harness.summarize([run[phase] for run in runs if run[phase] is not None])
+        for phase, _, _ in PHASES
+    }
+
+    print()
+    harness.print_table(
+        ["phase", "min ms", "median ms", "max ms"],
+        [[phase, stats["min"], stats["median"], stats["max"]] for phase, stats in summary.items()],
+    )
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "startup-profile",
+            "commit": harness.git_commit(),
+            "recorded_at_utc": datetime.now(timezone.utc).isoformat(),
+            "warm_db": args.warm_db,
+            "runs": runs,
+            "summary": summary,
+        },
+    )
+    print(f"Report written to {report_path}")
+    perf_results.record_run(
+        "startup-profile-warm" if args.warm_db else "startup-profile",
+        {phase: [run[phase] for run in runs] for phase, _, _ in PHASES},
+        parameters={"runs": args.runs},
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Discover SonosControl.Web page routes from Razor `@page` directives.
+
+Scans every `.razor` file under `SonosControl.Web` (skipping `bin`/`obj`) for
+`@page` templates and `[Authorize]` / `[AllowAnonymous]` attributes, including
+attributes inherited from `_Imports.razor` files in parent folders. The index
+is cached in `artifacts/route_index.json` and rebuilt when any `.razor` file is
+added, removed or has a different mtime.
+
+Parameterised templates (`/scenes/{SceneId}`, `{id:int}`) are filled from a
+seeded runtime via `parameter_values()`, so sweeps cover them too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import sonos_harness as harness
+
+
+WEB_PROJECT_DIR = harness.PROJECT_ROOT / "SonosControl.Web"
+CACHE_PATH = harness.ARTIFACTS_DIR / "route_index.json"
+CACHE_VERSION = 1
+
+PAGE_PATTERN = re.compile(r'^\s*@page\s+"(?P<template>[^"]*)"', re.MULTILINE)
+ATTRIBUTE_PATTERN = re.compile(r"^\s*@attribute\s+\[(?P<body>[^\]]+)\]", re.MULTILINE)
+AUTHORIZE_PATTERN = re.compile(r"^Authorize(?:Attribute)?\b(?:\((?P<args>.*)\))?$")
+NAMED_ARGUMENT_PATTERN = re.compile(r'(?P<name>Roles|Policy)\s*=\s*"(?P<value>[^"]*)"')
+PARAMETER_PATTERN = re.compile(r"\{(?P<catchall>\*{1,2})?(?P<name>\w+)(?::(?P<constraint>\w+))?(?P<optional>\?)?\}")
+CONSTRAINT_DEFAULTS = {
+    "int": "1",
+    "long": "1",
+    "decimal": "1",
+    "double": "1",
+    "float": "1",
+    "bool": "true",
+    "guid": "00000000-0000-0000-0000-000000000001",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List page routes discovered from SonosControl.Web Razor components.")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached index and rescan")
+    parser.add_argument("--json", action="store_true", help="Print the index as JSON")
+    return parser.parse_args()
+
+
+def razor_files() -> list[Path]:
+    return sorted(
+        path
+        for path in WEB_PROJECT_DIR.rglob("*.razor")
+        if not {"bin", "obj"} & set(path.relative_to(WEB_PROJECT_DIR).parts)
+    )
+
+
+def file_stamps(paths: list[Path]) -> dict[str, int]:
+    return {path.relative_to(harness.PROJECT_ROOT).as_posix(): path.stat().st_mtime_ns for path in paths}
+
+
+def parse_authorization(source: str) -> Optional[dict]:
+    """Return `{"anonymous", "roles", "policies"}` for the attributes in one file, or None."""
+    found = None
+    for match in ATTRIBUTE_PATTERN.finditer(source):
+        for attribute in (part.strip() for part in re.split(r",\s*(?=[A-Z]\w*(?:\(|$))", match.group("body"))):
+            if attribute.startswith("AllowAnonymous"):
+                found = found or {"anonymous": False, "roles": [], "policies": []}
+                found["anonymous"] = True
+                continue
+            authorize = AUTHORIZE_PATTERN.match(attribute)
+            if not authorize:
+                continue
+            found = found or {"anonymous": False, "roles": [], "policies": []}
+            for argument in NAMED_ARGUMENT_PATTERN.finditer(authorize.group("args") or ""):
+                values = [value.strip() for value in argument.group("value").split(",") if value.strip()]
+                key = "roles" if argument.group("name") == "Roles" else "policies"
+                found[key].extend(value for value in values if value not in found[key])
+            positional = re.match(r'\s*"(?P<policy>[^"]+)"', authorize.group("args") or "")
+            if positional and positional.group("policy") not in found["policies"]:
+                found["policies"].append(positional.group("policy"))
+    return found
+
+
+def inherited_authorization(path: Path, imports: dict[Path, dict]) -> Optional[dict]:
+    """Merge `_Imports.razor` attributes from the project root down to the file's folder."""
+    merged = None
+    folder = path.parent
+    chain = []
+    while True:
+        if folder in imports:
+            chain.append(imports[folder])
+        if folder == WEB_PROJECT_DIR or WEB_PROJECT_DIR not in folder.parents:
+            break
+        folder = folder.parent
+    for authorization in reversed(chain):
+        merged = merge_authorization(merged, authorization)
+    return merged
+
+
+def merge_authorization(base: Optional[dict], extra: Optional[dict]) -> Optional[dict]:
+    if not extra:
+        return base
+    if not base:
+        return {key: list(value) if isinstance(value, list) else value for key, value in extra.items()}
+    return {
+        "anonymous": base["anonymous"] or extra["anonymous"],
+        "roles": base["roles"] + [role for role in extra["roles"] if role not in base["roles"]],
+        "policies": base["policies"] + [policy for policy in extra["policies"] if policy not in base["policies"]],
+    }
+
+
+def template_parameters(template: str) -> list[dict]:
+    return [
+        {
+            "name": match.group("name"),
+            "constraint": match.group("constraint"),
+            "optional": bool(match.group("optional")),
+            "catch_all": bool(match.group("catchall")),
+        }
+        for match in PARAMETER_PATTERN.finditer(template)
+    ]
+
+
+def scan_routes(paths: list[Path]) -> list[dict]:
+    sources = {path: path.read_text(encoding="utf-8-sig", errors="replace") for path in paths}
+    imports = {
+        path.parent: parse_authorization(source)
+        for path, source in sources.items()
+        if path.name == "_Imports.razor"
+    }
+
+    routes = []
+    for path, source in sources.items():
+        templates = [match.group("template") for match in PAGE_PATTERN.finditer(source)]
+        if not templates:
+            continue
+        authorization = merge_authorization(inherited_authorization(path, imports), parse_authorization(source))
+        anonymous = bool(authorization and authorization["anonymous"])
+        for template in templates:
+            routes.append(
+                {
+                    "template": template,
+                    "component": path.stem,
+                    "file": path.relative_to(harness.PROJECT_ROOT).as_posix(),
+                    "requires_auth": bool(authorization) and not anonymous,
+                    "roles": [] if anonymous or not authorization else authorization["roles"],
+                    "policies": [] if anonymous or not authorization else authorization["policies"],
+                    "parameters": template_parameters(template),
+                }
+            )
+    return sorted(routes, key=lambda route: route["template"])
+
+
+def load_route_index(refresh: bool = False) -> list[dict]:
+    """Return the cached route index, rescanning when any `.razor` file changed."""
+    paths = razor_files()
+    stamps = file_stamps(paths)
+    if not refresh and CACHE_PATH.exists():
+        try:
+            cached = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+            if cached.get("version") == CACHE_VERSION and cached.get("files") == stamps:
+                return cached["routes"]
+        except (OSError, ValueError):
+            pass
+
+    routes = scan_routes(paths)
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_PATH.write_text(
+        json.dumps({"version": CACHE_VERSION, "files": stamps, "routes": routes}, indent=2),
+        encoding="utf-8",
+    )
+    return routes
+
+
+def singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    if name.endswith("s"):
+        return name[:-1]
+    return name
+
+
+def parameter_values(runtime_dir: Optional[Path]) -> dict[str, str]:
+    """Collect candidate route values from a seeded runtime, keyed by lowercase parameter name.
+
+    List entries in `config.json` contribute `<item><Key>` names, e.g. the first
+    scene yields `sceneid` and `scenename`, a speaker yields `speakeripaddress`
+    and `speakerip`. Users in `app.db` contribute `userid` and `username`.
+    """
+    values: dict[str, str] = {}
+    if runtime_dir is None:
+        return values
+
+    config_path = runtime_dir / "settings" / "config.json"
+    if config_path.exists():
+        settings = json.loads(config_path.read_text(encoding="utf-8"))
+        for key, value in settings.items():
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                values.setdefault(key.lower(), str(value))
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                prefix = singular(key).lower()
+                for item_key, item_value in value[0].items():
+                    if isinstance(item_value, (str, int)) and not isinstance(item_value, bool):
+                        name = f"{prefix}{item_key}".lower()
+                        values.setdefault(name, str(item_value))
+                        if name.endswith("ipaddress"):
+                            values.setdefault(name[: -len("address")], str(item_value))
+
+    db_path = runtime_dir / "app.db"
+    if db_path.exists():
+        with sqlite3.connect(db_path, timeout=30) as connection:
+            row = connection.execute("SELECT Id, UserName FROM AspNetUsers ORDER BY UserName LIMIT 1").fetchone()
+        if row:
+            values.setdefault("userid", row[0])
+            values.setdefault("username", row[1])
+    return values
+
+
+def fill_template(template: str, values: dict[str, str]) -> tuple[Optional[str], list[str]]:
+    """Substitute route parameters; returns `(path, missing_parameter_names)`."""
+    missing: list[str] = []
+
+    def substitute(match: re.Match) -> str:
+        name = match.group("name")
+        value = values.get(name.lower())
+        if value is None and match.group("constraint") == "datetime":
+            value = date.today().isoformat()
+        if value is None:
+            value = CONSTRAINT_DEFAULTS.get(match.group("constraint") or "")
+        if value is None:
+            if match.group("optional") or match.group("catchall"):
+                return ""
+            missing.append(name)
+            return match.group(0)
+        return str(value)
+
+    path = PARAMETER_PATTERN.sub(substitute, template)
+    if missing:
+        return None, missing
+    path = re.sub(r"/{2,}", "/", path)
+    return (path.rstrip("/") or "/"), []
+
+
+def run():
+    args = parse_args()
+    routes = load_route_index(refresh=args.refresh)
+    if args.json:
+        print(json.dumps(routes, indent=2))
+        return
+
+    harness.print_table(
+        ["route", "component", "auth", "roles"],
+        [
+            [
+                route["template"],
+                route["component"],
+                "yes" if route["requires_auth"] else "no",
+                ",".join(route["roles"] + route["policies"]) or "-",
+            ]
+            for route in routes
+        ],
+    )
+    print(f"\n{len(routes)} routes; index cached at {CACHE_PATH}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Seed an isolated SonosControl runtime with representative demo data.
+
+Populates `settings/config.json` (speakers, stations, Spotify/YouTube Music
+collections, scenes, schedule windows with holiday overrides, automation
+rules) and `app.db` (users with roles, favourites, playback history, logs) at a
+`small`, `medium` or `large` scale. Output is deterministic for a given
+`--seed` and `--anchor-date`; history rows are bulk-inserted with `sqlite3`.
+
+The database schema must already exist. When the runtime has no `app.db` yet,
+the app is started once against it so EF migrations and role seeding run.
+
+Used directly, or through `--demo-data` on `capture_readme_screenshots.py` and
+the perf tools.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import sqlite3
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import sonos_harness as harness
+
+
+@dataclass(frozen=True)
+class DemoScale:
+    speakers: int
+    stations: int
+    spotify: int
+    youtube_music: int
+    scenes: int
+    schedule_windows: int
+    holidays: int
+    automation_rules: int
+    users: int
+    favourites_per_user: int
+    playback_rows: int
+    log_rows: int
+    days: int
+
+
+SCALES = {
+    "small": DemoScale(3, 8, 4, 3, 3, 4, 3, 2, 3, 3, 2_000, 5_000, 30),
+    "medium": DemoScale(6, 25, 10, 6, 8, 12, 10, 6, 12, 6, 25_000, 50_000, 90),
+    "large": DemoScale(12, 80, 30, 15, 25, 40, 30, 20, 40, 10, 150_000, 300_000, 365),
+}
+
+DEMO_PASSWORD = "Demo1234."
+ROOM_NAMES = [
+    "Kitchen", "Living Room", "Office", "Bedroom", "Patio", "Bathroom",
+    "Studio", "Garage", "Dining Room", "Hallway", "Guest Room", "Lobby",
+]
+STATION_NAMES = [
+    "Antenne Vorarlberg", "Radio V", "Kronehit", "Ö3", "Rock Antenne Bayern", "Radio Paloma",
+    "FM4", "Radio Swiss Jazz", "Klassik Radio", "Lounge FM", "Bayern 3", "SWR3",
+]
+SPOTIFY_NAMES = ["Top 50 Global", "Astroworld", "Chill Vibes", "Morning Coffee", "Deep Focus", "Dinner Jazz"]
+YOUTUBE_MUSIC_NAMES = ["Supermix", "Energize", "Discover Mix", "Relax", "Workout"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Robin", "Casey", "Morgan", "Taylor", "Jamie", "Riley", "Avery"]
+LAST_NAMES = ["Berger", "Gruber", "Huber", "Wagner", "Mayer", "Bauer", "Hofer", "Moser"]
+LOG_ACTIONS = [
+    ("Station Changed", 18),
+    ("Playback Started", 14),
+    ("Playback Paused", 12),
+    ("Next Track", 12),
+    ("Spotify Track Changed", 8),
+    ("YouTube Music Changed", 5),
+    ("Group Created", 4),
+    ("Speaker Ungrouped", 3),
+    ("Sync Play Started (Cloned URI)", 3),
+    ("SceneApplied", 6),
+    ("WebhookAction", 6),
+    ("QueueModified", 5),
+    ("ScheduleWindowUpdated", 2),
+    ("DeviceOffline", 2),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed an isolated SonosControl runtime with demo data.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--anchor-date",
+        default=None,
+        help="History ends at midnight UTC of this date (YYYY-MM-DD, default: today)",
+    )
+    parser.add_argument(
+        "--runtime-dir",
+        default=None,
+        help="Existing runtime directory (with settings/ and app.db). Default: a new one under artifacts/",
+    )
+    parser.add_argument(
+        "--base-url",
+        default="http://localhost:5119",
+        help="Free URL used to start the app once when the runtime has no database yet",
+    )
+    parser.add_argument("--server-timeout", type=int, default=180)
+    return parser.parse_args()
+
+
+def demo_guid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def demo_id(rng: random.Random) -> str:
+    return uuid.UUID(int=rng.getrandbits(128), version=4).hex
+
+
+def identity_password_hash(password: str, salt: bytes) -> str:
+    """ASP.NET Core Identity V3 hash: PBKDF2-HMAC-SHA512, 100k iterations, 128-bit salt, 256-bit subkey."""
+    iterations = 100_000
+    subkey = hashlib.pbkdf2_hmac("sha512", password.encode("utf-8"), salt, iterations, 32)
+    header = bytes([0x01]) + (2).to_bytes(4, "big") + iterations.to_bytes(4, "big") + len(salt).to_bytes(4, "big")
+    return base64.b64encode(header + salt + subkey).decode("ascii")
+
+
+def format_db_datetime(value: datetime) -> str:
+    # EF Core's SQLite provider stores DateTime as "yyyy-MM-dd HH:mm:ss.FFFFFFF".
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def format_time(hour: int, minute: int = 0) -> str:
+    return f"{hour:02d}:{minute:02d}:00"
+
+
+def numbered(names: list[str], count: int) -> list[str]:
+    return [names[index] if index < len(names) else f"{names[index % len(names)]} {index // len(names) + 1}" for index in range(count)]
+
+
+def build_speakers(rng: random.Random, count: int, speaker_ips: Optional[list[str]] = None) -> list[dict]:
+    speakers = []
+    for index, name in enumerate(numbered(ROOM_NAMES, count)):
+        ip = speaker_ips[index % len(speaker_ips)] if speaker_ips else f"192.0.2.{10 + index}"
+        speakers.append(
+            {
+                "Name": name,
+                "IpAddress": ip,
+                "Uuid": f"RINCON_{rng.getrandbits(48):012X}01400",
+                "StartupVolume": rng.choice([None, 10, 15, 20]),
+            }
+        )
+    return speakers
+
+
+def build_settings(rng: random.Random, scale: DemoScale, anchor: date, speaker_ips: Optional[list[str]] = None) -> dict:
+    speakers = build_speakers(rng, scale.speakers, speaker_ips)
+    speaker_ips = [speaker["IpAddress"] for speaker in speakers]
+    stations = [
+        {"Name": name, "Url": f"stream.demo.invalid/{index:03d}/live.mp3"}
+        for index, name in enumerate(numbered(STATION_NAMES, scale.stations))
+    ]
+    spotify = [
+        {"Name": name, "Url": f"https://open.spotify.com/playlist/demo{index:04d}"}
+        for index, name in enumerate(numbered(SPOTIFY_NAMES, scale.spotify))
+    ]
+    youtube_music = [
+        {"Name": name, "Url": f"https://music.youtube.com/playlist?list=DEMO{index:04d}"}
+        for index, name in enumerate(numbered(YOUTUBE_MUSIC_NAMES, scale.youtube_music))
+    ]
+
+    scenes = []
+    for index in range(scale.scenes):
+        source_type = rng.choice([1, 1, 2, 3])
+        source = {1: stations, 2: spotify, 3: youtube_music}[source_type]
+        members = rng.sample(speaker_ips, k=rng.randint(1, len(speaker_ips)))
+        scenes.append(
+            {
+                "Id": demo_id(rng),
+                "Name": f"{rng.choice(['Morning', 'Lunch', 'Evening', 'Party', 'Focus', 'Dinner'])} {index + 1}",
+                "Description": "Demo scene",
+                "Enabled": rng.random() > 0.1,
+                "SourceSelectionMode": 0,
+                "SourceType": source_type,
+                "SourceUrl": rng.choice(source)["Url"],
+                "IsSyncedPlayback": len(members) > 1,
+                "MasterSpeakerIp": members[0],
+                "TimerMinutes": rng.choice([None, None, 30, 60, 120]),
+                "SpeakerIps": members,
+                "Actions": [
+                    {"SpeakerIp": ip, "Volume": rng.randint(8, 30), "IncludeInPlayback": True, "IsMaster": ip == members[0]}
+                    for ip in members
+                ],
+                "LastModifiedUtc": f"{anchor.isoformat()}T00:00:00Z",
+            }
+        )
+
+    holiday_dates = [anchor + timedelta(days=offset) for offset in sorted(rng.sample(range(1, 365), k=scale.holidays))]
+    excluded_dates = [holiday.isoformat() for holiday in holiday_dates]
+
+    windows = []
+    for index in range(scale.schedule_windows):
+        start_hour = rng.randint(6, 19)
+        recurrence = rng.choice([0, 1, 1, 2, 3])
+        windows.append(
+            {
+                "Id": demo_id(rng),
+                "Name": f"Window {index + 1}",
+                "IsEnabled": rng.random() > 0.15,
+                # Above 100 so the dated holiday overrides (priority 0-99) win.
+                "Priority": rng.choice([100, 150, 200, 500]),
+                "StartTime": format_time(start_hour, rng.choice([0, 15, 30, 45])),
+                "StopTime": format_time(min(23, start_hour + rng.randint(1, 4)), rng.choice([0, 30])),
+                "RecurrenceType": recurrence,
+                "DaysOfWeek": sorted(rng.sample(range(7), k=rng.randint(1, 4))) if recurrence == 3 else [],
+                "StartDate": None,
+                "EndDate": None,
+                "ExcludedDates": excluded_dates,
+                "SceneId": rng.choice(scenes)["Id"] if scenes else None,
+                "FadeInSeconds": rng.choice([0, 0, 10, 30]),
+                "FadeOutSeconds": rng.choice([0, 0, 10, 30]),
+                "LastModifiedUtc": f"{anchor.isoformat()}T00:00:00Z",
+            }
+        )
+
+    # Holidays in the v2 shape (see SettingsSchemaMigrationService): every date is
+    # excluded from the regular windows above, and holidays with playback get a
+    # dated override window on top. Holidays without one simply stay quiet.
+    for index, holiday in enumerate(holiday_dates):
+        if rng.random() < 0.5 or not scenes:
+            continue
+        windows.append(
+            {
+                "Id": demo_id(rng),
+                "Name": f"Holiday {index + 1}",
+                "IsEnabled": True,
+                "Priority": index,
+                "StartTime": format_time(9),
+                "StopTime": format_time(15),
+                "RecurrenceType": 0,
+                "DaysOfWeek": [],
+                "StartDate": holiday.isoformat(),
+                "EndDate": holiday.isoformat(),
+                "ExcludedDates": [],
+                "SceneId": rng.choice(scenes)["Id"],
+                "FadeInSeconds": 0,
+                "FadeOutSeconds": 0,
+                "LastModifiedUtc": f"{anchor.isoformat()}T00:00:00Z",
+            }
+        )
+
+    rules = []
+    for index in range(scale.automation_rules):
+        apply_scene = bool(scenes) and rng.random() < 0.5
+        rules.append(
+            {
+                "Id": demo_id(rng),
+                "Name": f"Rule {index + 1}",
+                "Enabled": True,
+                "TriggerType": rng.choice([1, 2]),
+                "ActionType": 1 if apply_scene else 2,
+                "SceneId": rng.choice(scenes)["Id"] if apply_scene else None,
+                "FallbackUrl": None if apply_scene else rng.choice(stations)["Url"],
+                "FallbackSourceType": 0 if apply_scene else 1,
+                "RetryCount": rng.randint(1, 3),
+                "RetryDelaySeconds": rng.choice([5, 10, 30]),
+                "LastModifiedUtc": f"{anchor.isoformat()}T00:00:00Z",
+            }
+        )
+
+    return {
+        "SettingsSchemaVersion": 2,
+        "Volume": 12,
+        "MaxVolume": 40,
+        "IP_Adress": speaker_ips[0] if speaker_ips else "10.0.0.1",
+        "Speakers": speakers,
+        "Stations": stations,
+        "SpotifyTracks": spotify,
+        "YouTubeMusicCollections": youtube_music,
+        "YouTubeCollections": [],
+        "AutoPlayStationUrl": stations[0]["Url"] if stations else None,
+        "Scenes": scenes,
+        "ScheduleWindows": windows,
+        "AutomationRules": rules,
+        "ActiveDays": [1, 2, 3, 4, 5],
+        "AllowUserRegistration": True,
+    }
+
+
+def random_instant(rng: random.Random, now: datetime, days: int) -> datetime:
+    # Weight towards daytime listening hours so hourly charts look plausible.
+    day_offset = rng.random() * days
+    hour = min(23.99, max(0.0, rng.gauss(14, 4.5)))
+    base = (now - timedelta(days=day_offset)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return min(now, base + timedelta(hours=hour))
+
+
+def playback_rows(rng: random.Random, count: int, now: datetime, days: int, speakers: list[str], media: list[tuple[str, list[str]]]):
+    for _ in range(count):
+        media_type, names = rng.choice(media)
+        start = random_instant(rng, now, days)
+        duration = round(min(rng.expovariate(1 / 1500), 4 * 3600), 1)
+        yield (
+            rng.choice(speakers),
+            rng.choice(names),
+            "" if media_type == "Station" else f"Artist {rng.randint(1, 400)}",
+            "" if media_type == "Station" else f"Album {rng.randint(1, 900)}",
+            media_type,
+            format_db_datetime(start),
+            format_db_datetime(start + timedelta(seconds=duration)),
+            duration,
+        )
+
+
+def log_rows(rng: random.Random, count: int, now: datetime, days: int, users: list[str], speakers: list[str]):
+    actions = [action for action, _ in LOG_ACTIONS]
+    weights = [weight for _, weight in LOG_ACTIONS]
+    for _ in range(count):
+        action = rng.choices(actions, weights)[0]
+        yield (
+            action,
+            rng.choice(users),
+            format_db_datetime(random_instant(rng, now, days)),
+            f"{rng.choice(speakers)}: {action.lower()}",
+        )
+
+
+def history_media(settings: dict) -> list[tuple[str, list[str]]]:
+    return [
+        ("Station", [station["Name"] for station in settings["Stations"]] or ["Radio"]),
+        ("Spotify", [item["Name"] for item in settings["SpotifyTracks"]] or ["Spotify"]),
+        ("YouTube Music", ["YouTube Music"]),
+        ("YouTube", ["YouTube"]),
+    ]
+
+
+def insert_history(
+    db_path: Path,
+    rng: random.Random,
+    playback_count: int,
+    log_count: int,
+    now: datetime,
+    days: int,
+    users: list[str],
+    speakers: list[str],
+    media: list[tuple[str, list[str]]],
+):
+    with sqlite3.connect(db_path, timeout=30) as connection:
+        # Only affects this connection; the app keeps its own durability settings.
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executemany(
+            "INSERT INTO PlaybackStats (SpeakerName, TrackName, Artist, Album, MediaType, StartTime, EndTime, DurationSeconds) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            playback_rows(rng, playback_count, now, days, speakers, media),
+        )
+        connection.executemany(
+            "INSERT INTO Logs (Action, PerformedBy, Timestamp, Details) VALUES (?, ?, ?, ?)",
+            log_rows(rng, log_count, now, days, users, speakers),
+        )
+
+
+def insert_users(connection: sqlite3.Connection, rng: random.Random, count: int) -> list[tuple[str, str]]:
+    roles = dict(connection.execute("SELECT NormalizedName, Id FROM AspNetRoles"))
+    if "OPERATOR" not in roles:
+        raise RuntimeError("Identity roles are missing; start the app once against this runtime first.")
+
+    password_hash = identity_password_hash(DEMO_PASSWORD, rng.randbytes(16))
+    users = []
+    for index in range(count):
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES) + index) % len(LAST_NAMES)]
+        username = f"{first.lower()}{index + 1}"
+        user_id = demo_guid(rng)
+        email = f"{username}@demo.invalid"
+        connection.execute(
+            "INSERT INTO AspNetUsers (Id, FirstName, LastName, UserName, NormalizedUserName, Email, NormalizedEmail, "
+            "EmailConfirmed, PasswordHash, SecurityStamp, ConcurrencyStamp, PhoneNumber, PhoneNumberConfirmed, "
+            "TwoFactorEnabled, LockoutEnd, LockoutEnabled, AccessFailedCount, ThemePreference) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?, NULL, 0, 0, NULL, 1, 0, ?)",
+            (
+                user_id, first, last, username, username.upper(), email, email.upper(),
+                password_hash, uuid.UUID(int=rng.getrandbits(128)).hex.upper(), demo_guid(rng),
+                rng.choice(["system", "light", "dark"]),
+            ),
+        )
+        role = "ADMIN" if index % 5 == 0 else "OPERATOR"
+        connection.execute("INSERT INTO AspNetUserRoles (UserId, RoleId) VALUES (?, ?)", (user_id, roles[role]))
+        users.append((user_id, username))
+    return users
+
+
+def insert_favourites(connection: sqlite3.Connection, rng: random.Random, user_ids: list[str], settings: dict, per_user: int, anchor: datetime):
+    sources = (
+        [("radio", station["Url"]) for station in settings["Stations"]]
+        + [("spotify", item["Url"]) for item in settings["SpotifyTracks"]]
+        + [("youtubemusic", item["Url"]) for item in settings["YouTubeMusicCollections"]]
+    )
+    rows = []
+    for user_id in user_ids:
+        for source_type, url in rng.sample(sources, k=min(per_user, len(sources))):
+            created = anchor - timedelta(days=rng.randint(0, 60))
+            rows.append((user_id, source_type, url.lower(), format_db_datetime(created)))
+    connection.executemany(
+        "INSERT OR IGNORE INTO UserFavouriteSources (UserId, SourceType, SourceUrl, CreatedAtUtc) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+
+
+def seed_runtime(
+    runtime_dir: Path,
+    scale_name: str = "medium",
+    seed: int = 42,
+    anchor_date: Optional[date] = None,
+    speaker_ips: Optional[list[str]] = None,
+) -> dict:
+    """Write demo settings and rows into a runtime whose database is already migrated."""
+    scale = SCALES[scale_name]
+    rng = random.Random(seed)
+    anchor_date = anchor_date or datetime.now(timezone.utc).date()
+    now = datetime(anchor_date.year, anchor_date.month, anchor_date.day)
+    db_path = runtime_dir / "app.db"
+    if not db_path.exists():
+        raise RuntimeError(f"{db_path} does not exist; start the app once against this runtime first.")
+
+    started = time.perf_counter()
+    settings = build_settings(rng, scale, anchor_date, speaker_ips)
+    settings_dir = runtime_dir / "settings"
+    settings_dir.mkdir(parents=True, exist_ok=True)
+    (settings_dir / "config.json").write_text(json.dumps(settings, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    with sqlite3.connect(db_path, timeout=30) as connection:
+        existing_ids = [row[0] for row in connection.execute("SELECT Id FROM AspNetUsers ORDER BY UserName")]
+        users = insert_users(connection, rng, scale.users)
+        insert_favourites(connection, rng, existing_ids + [user_id for user_id, _ in users], settings, scale.favourites_per_user, now)
+
+    usernames = [username for _, username in users] + [harness.DEFAULT_ADMIN_USERNAME, "Unknown"]
+    speakers = [speaker["Name"] for speaker in settings["Speakers"]]
+    insert_history(db_path, rng, scale.playback_rows, scale.log_rows, now, scale.days, usernames, speakers, history_media(settings))
+
+    return {
+        "scale": scale_name,
+        "seed": seed,
+        "anchor_date": anchor_date.isoformat(),
+        "counts": asdict(scale),
+        "user_password": DEMO_PASSWORD,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def prepare_runtime(runtime_dir: Path, base_url: str, timeout_seconds: int):
+    """Start the app once against `runtime_dir` so migrations and role seeding create the schema."""
+    if (runtime_dir / "app.db").exists():
+        return
+    if harness.is_server_reachable(base_url):
+        raise RuntimeError(f"{base_url} is already serving; pass a free --base-url to initialise the runtime.")
+
+    process, log_stream, log_path, _ = harness.start_local_server(base_url, "demo-seed", runtime_dir=runtime_dir)
+    try:
+        if not harness.wait_for_server_ready(base_url, timeout_seconds, process=process):
+            raise RuntimeError(f"Timed out initialising the runtime at {base_url}. Check server log: {log_path}")
+    finally:
+        harness.stop_local_server(process, log_stream)
+
+
+def run():
+    args = parse_args()
+    anchor_date = date.fromisoformat(args.anchor_date) if args.anchor_date else None
+    runtime_dir = Path(args.runtime_dir).resolve() if args.runtime_dir else harness.create_runtime_dir(f"demo-{args.scale}")
+
+    prepare_runtime(runtime_dir, args.base_url.rstrip("/"), args.server_timeout)
+    summary = seed_runtime(runtime_dir, args.scale, args.seed, anchor_date)
+
+    scale = SCALES[args.scale]
+    print(
+        f"Seeded {args.scale} demo data into {runtime_dir} in {summary['seconds']}s: "
+        f"{scale.speakers} speakers, {scale.stations} stations, {scale.scenes} scenes, "
+        f"{scale.schedule_windows} schedule windows, {scale.holidays} holidays, {scale.users} users, "
+        f"{scale.playback_rows} playback rows, {scale.log_rows} log rows."
+    )
+    print(f"Demo users sign in with password '{DEMO_PASSWORD}'. Run the app against this runtime with:")
+    print(f"  Settings__DataDirectory={runtime_dir / 'settings'}")
+    print(f"  ConnectionStrings__DefaultConnection=Data Source={runtime_dir / 'app.db'}")
+
+
+if __name__ == "__main__":
+    run()
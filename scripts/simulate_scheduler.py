@@ -0,0 +1,757 @@
+#!/usr/bin/env python3
+"""
+Replay weeks of schedules against an isolated instance on a simulated clock.
+
+The app is started with `Automation:SimulatedClock` set, which runs the
+automation scheduler's clock `--speed` times faster than the wall clock (its
+15 s poll loop and fades shrink by the same factor), and with its speakers
+pointed at a fake fleet (see `fake_speakers.py`). The run then:
+
+1. generates scenes, schedule windows and holiday overrides through
+   `api/scenes` and `api/schedules`, the way the v2 settings migration models
+   holidays: a dated override window with a higher priority, plus the date
+   excluded from every regular window (`SkipPlayback` holidays get only the
+   exclusion),
+2. adds automation rules to `config.json`, since rules have no API,
+3. waits while the scheduler works through `--weeks` of virtual time,
+4. replays the same windows through a Python copy of `ScheduleWindowEvaluator`
+   to get the expected trigger instants, and compares them with the
+   `Schedule ... triggered` lines in the server log.
+
+It reports scheduler tick cost (idle ticks from `/metricsz`, trigger ticks
+from the log), missed, failed, late and unexpected triggers, and how far apart
+the generated scenes' commands reached their speakers (fan-out).
+
+Acceleration compresses waiting but not work: a trigger tick that takes 50 ms
+costs 72 virtual seconds at 1440x. The report prints that overhead; when it
+exceeds `--grace-seconds`, lower `--speed` before reading lateness as a bug.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as clock_time, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+from urllib.error import HTTPError, URLError
+from urllib.request import Request
+from zoneinfo import ZoneInfo
+
+import fake_speakers
+import perf_results
+import sonos_harness as harness
+
+
+# Mirrors AutomationSchedulerService.PollInterval.
+POLL_INTERVAL_SECONDS = 15
+SOURCE_HOST = "127.0.0.1/scheduler-sim"
+SOURCE_PATTERN = re.compile(r"scheduler-sim/(?P<tag>[\w-]+)\.mp3")
+TRIGGER_PATTERN = re.compile(
+    r"Schedule (?P<window>\S+) triggered scene (?P<scene>\S+) at (?P<at>\S+) "
+    r"on (?P<targets>\d+) speaker\(s\) in (?P<elapsed>[\d.,]+) ms\."
+)
+FAILURE_PATTERN = re.compile(r"Schedule (?P<window>\S+) could not apply scene (?P<scene>\S+) at (?P<at>\S+?): ")
+# .NET DayOfWeek numbers Sunday as 0; Python's weekday() numbers Monday as 0.
+RECURRENCE_DAYS = {0: set(range(7)), 1: {1, 2, 3, 4, 5}, 2: {0, 6}}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay weeks of generated schedules on a simulated clock and check every trigger.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", harness.DEFAULT_BASE_URL))
+    parser.add_argument("--windows", type=int, default=300, help="Regular schedule windows to generate (default: 300, max 900)")
+    parser.add_argument("--holidays", type=int, default=40, help="Holiday dates to generate (default: 40)")
+    parser.add_argument("--skip-share", type=float, default=0.4, help="Share of holidays without playback (default: 0.4)")
+    parser.add_argument("--rules", type=int, default=100, help="Automation rules to add to config.json (default: 100)")
+    parser.add_argument("--speakers", type=int, default=8, help="Fake speakers (default: 8)")
+    parser.add_argument("--weeks", type=float, default=2, help="Virtual weeks to replay (default: 2)")
+    parser.add_argument("--speed", type=float, default=1440, help="Virtual seconds per wall-clock second (default: 1440, one day per minute)")
+    parser.add_argument("--start-date", default=None, help="First virtual day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--time-zone", default="Europe/Vienna", help="Automation:TimeZone for the run (default: Europe/Vienna)")
+    parser.add_argument("--grace-seconds", type=float, default=15, help="Virtual delay beyond one poll interval before a trigger counts as late (default: 15)")
+    parser.add_argument("--device-latency-ms", type=float, default=0, help="Fake speaker response delay (default: 0)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="Share of speaker commands answered with HTTP 500 (default: 0)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--out", default="artifacts/perf/scheduler_simulation.json")
+    return parser.parse_args()
+
+
+def parse_time(value: str) -> clock_time:
+    return clock_time.fromisoformat(value[:8])
+
+
+def parse_utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}:00"
+
+
+@dataclass
+class Window:
+    """The fields of `ScheduleWindow` that `ScheduleWindowEvaluator` reads."""
+
+    id: str
+    name: str
+    priority: int
+    start: clock_time
+    stop: clock_time
+    recurrence: int
+    days: set[int]
+    start_date: Optional[date]
+    end_date: Optional[date]
+    excluded: set[date]
+    scene_id: str
+    modified: datetime
+
+    @classmethod
+    def from_api(cls, payload: dict) -> "Window":
+        return cls(
+            id=payload["id"],
+            name=payload["name"],
+            priority=payload["priority"],
+            start=parse_time(payload["startTime"]),
+            stop=parse_time(payload["stopTime"]),
+            recurrence=payload["recurrenceType"],
+            days=set(payload.get("daysOfWeek") or []),
+            start_date=date.fromisoformat(payload["startDate"]) if payload.get("startDate") else None,
+            end_date=date.fromisoformat(payload["endDate"]) if payload.get("endDate") else None,
+            excluded={date.fromisoformat(value) for value in payload.get("excludedDates") or []},
+            scene_id=payload.get("sceneId") or "",
+            modified=parse_utc(payload["lastModifiedUtc"]),
+        )
+
+    def date_allowed(self, day: date) -> bool:
+        if day in self.excluded:
+            return False
+        dotnet_day = (day.weekday() + 1) % 7
+        allowed = self.days if self.recurrence == 3 else RECURRENCE_DAYS.get(self.recurrence, set())
+        return dotnet_day in allowed
+
+
+class ScheduleModel:
+    """Python port of `ScheduleWindowEvaluator.SelectActiveWindow` with per-day caching."""
+
+    def __init__(self, windows: list[Window], zone: ZoneInfo):
+        # Priority ascending, then most recently modified, then id: stable sorts, last key first.
+        ordered = sorted(windows, key=lambda window: window.id.upper())
+        ordered.sort(key=lambda window: window.modified, reverse=True)
+        self.windows = sorted(ordered, key=lambda window: window.priority)
+        self.zone = zone
+        self._by_date: dict[date, list[tuple[Window, bool, bool]]] = {}
+
+    def _candidates(self, day: date) -> list[tuple[Window, bool, bool]]:
+        cached = self._by_date.get(day)
+        if cached is None:
+            previous = day - timedelta(days=1)
+            cached = []
+            for window in self.windows:
+                if (window.start_date and day < window.start_date) or (window.end_date and day > window.end_date):
+                    continue
+                today = window.date_allowed(day)
+                overnight_tail = window.stop <= window.start and window.date_allowed(previous)
+                if today or overnight_tail:
+                    cached.append((window, today, overnight_tail))
+            self._by_date[day] = cached
+        return cached
+
+    def active(self, instant_utc: datetime) -> Optional[Window]:
+        local = instant_utc.astimezone(self.zone).replace(tzinfo=None)
+        now = local.time()
+        for window, today, overnight_tail in self._candidates(local.date()):
+            if window.stop > window.start:
+                if today and window.start <= now < window.stop:
+                    return window
+            elif (today and now >= window.start) or (overnight_tail and now < window.stop):
+                return window
+        return None
+
+    def expected_triggers(self, start_utc: datetime, end_utc: datetime) -> list[dict]:
+        """Every instant the active window changes to another window, at minute resolution."""
+        triggers = []
+        previous = self.active(start_utc - timedelta(minutes=1))
+        current_trigger = None
+        instant = start_utc
+        while instant < end_utc:
+            window = self.active(instant)
+            if window is not previous:
+                if current_trigger:
+                    current_trigger["until"] = instant
+                current_trigger = None
+                if window is not None:
+                    current_trigger = {"window": window, "at": instant, "until": end_utc}
+                    triggers.append(current_trigger)
+            previous = window
+            instant += timedelta(minutes=1)
+        return triggers
+
+
+@dataclass
+class Generated:
+    scenes: list[dict] = field(default_factory=list)
+    windows: list[dict] = field(default_factory=list)
+    holidays: list[dict] = field(default_factory=list)
+    rules: list[dict] = field(default_factory=list)
+
+
+def build_schedule_set(args, rng: random.Random, first_day: date, speaker_ips: list[str]) -> Generated:
+    """Generate scenes, regular windows, holiday overrides and rules in the API's shape."""
+    generated = Generated()
+    span_days = int(args.weeks * 7) + 7
+    # About one holiday per replayed week; the rest spread over the year, where they still
+    # lengthen every window's excluded dates the way a real holiday calendar does.
+    in_span = min(args.holidays, max(1, int(args.weeks)))
+    holiday_dates = sorted(
+        rng.sample([first_day + timedelta(days=offset) for offset in range(1, span_days)], k=in_span)
+        + rng.sample([first_day + timedelta(days=offset) for offset in range(span_days, span_days + 365)], k=args.holidays - in_span)
+    )
+
+    def add_scene(tag: str) -> str:
+        members = rng.sample(speaker_ips, k=rng.randint(1, min(4, len(speaker_ips))))
+        scene_id = f"sim-scene-{tag}"
+        generated.scenes.append(
+            {
+                "id": scene_id,
+                "name": f"Simulation {tag}",
+                "description": "Scheduler simulation",
+                "enabled": True,
+                "sourceSelectionMode": 0,
+                "sourceType": 1,
+                "sourceUrl": f"{SOURCE_HOST}/{tag}.mp3",
+                # Unsynced, so every member receives the scene's own stream URI.
+                "isSyncedPlayback": False,
+                "masterSpeakerIp": members[0],
+                "speakerIps": members,
+                "actions": [
+                    {"speakerIp": ip, "volume": rng.randint(8, 25), "includeInPlayback": True, "isMaster": ip == members[0]}
+                    for ip in members
+                ],
+            }
+        )
+        return scene_id
+
+    for index, holiday in enumerate(holiday_dates):
+        tag = f"holiday-{index:03d}"
+        skip = rng.random() < args.skip_share
+        entry = {"date": holiday.isoformat(), "skip_playback": skip, "window_id": None}
+        if not skip:
+            start = rng.randrange(7 * 12, 14 * 12) * 5
+            entry["window_id"] = f"sim-{tag}"
+            generated.windows.append(
+                {
+                    "id": entry["window_id"],
+                    "name": f"Holiday {holiday.isoformat()}",
+                    "isEnabled": True,
+                    "priority": index,
+                    "startTime": format_clock(start),
+                    "stopTime": format_clock(start + rng.randrange(12, 96) * 5),
+                    "recurrenceType": 0,
+                    "daysOfWeek": [],
+                    "startDate": holiday.isoformat(),
+                    "endDate": holiday.isoformat(),
+                    "excludedDates": [],
+                    "sceneId": add_scene(tag),
+                    "fadeInSeconds": 0,
+                    "fadeOutSeconds": 0,
+                }
+            )
+        generated.holidays.append(entry)
+
+    priorities = rng.sample(range(100, 1001), k=args.windows)
+    for index in range(args.windows):
+        tag = f"window-{index:04d}"
+        recurrence = rng.choice([0, 1, 1, 2, 3, 3])
+        # Mostly daytime programmes, with a few overnight windows.
+        start_hour = rng.choice([rng.randint(6, 20)] * 9 + [rng.randint(21, 23)])
+        start = start_hour * 60 + rng.randrange(12) * 5
+        limited = rng.random() < 0.1
+        range_start = first_day + timedelta(days=rng.randrange(span_days))
+        generated.windows.append(
+            {
+                "id": f"sim-{tag}",
+                "name": f"Regular {index + 1:04d}",
+                "isEnabled": rng.random() > 0.05,
+                "priority": priorities[index],
+                "startTime": format_clock(start),
+                "stopTime": format_clock(start + rng.randrange(3, 73) * 5),
+                "recurrenceType": recurrence,
+                "daysOfWeek": sorted(rng.sample(range(7), k=rng.randint(1, 4))) if recurrence == 3 else [],
+                "startDate": range_start.isoformat() if limited else None,
+                "endDate": (range_start + timedelta(days=rng.randint(1, 10))).isoformat() if limited else None,
+                "excludedDates": [holiday.isoformat() for holiday in holiday_dates],
+                "sceneId": add_scene(tag),
+                "fadeInSeconds": rng.choice([0, 0, 0, 5, 10]),
+                "fadeOutSeconds": rng.choice([0, 0, 0, 5, 10]),
+            }
+        )
+
+    fallback_scene = generated.scenes[0]["id"] if generated.scenes else None
+    modified = datetime.now(timezone.utc)
+    for index in range(args.rules):
+        apply_scene = fallback_scene is not None and rng.random() < 0.5
+        generated.rules.append(
+            {
+                "Id": f"sim-rule-{index:04d}",
+                "Name": f"Simulation rule {index + 1}",
+                "Enabled": rng.random() > 0.2,
+                "TriggerType": rng.choice([1, 2]),
+                "ActionType": 1 if apply_scene else 2,
+                "SceneId": fallback_scene if apply_scene else None,
+                "FallbackUrl": None if apply_scene else f"{SOURCE_HOST}/fallback.mp3",
+                "FallbackSourceType": 0 if apply_scene else 1,
+                # Retry delays run on the wall clock, which the simulated clock would magnify.
+                "RetryCount": rng.randint(0, 2),
+                "RetryDelaySeconds": 0,
+                "LastModifiedUtc": (modified + timedelta(seconds=index)).isoformat().replace("+00:00", "Z"),
+            }
+        )
+    return generated
+
+
+def api_request(opener, base_url: str, method: str, path: str, payload: Optional[dict] = None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = Request(f"{base_url}{path}", data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with opener.open(request, timeout=60) as response:
+            body = response.read()
+    except HTTPError as error:
+        raise RuntimeError(f"{method} {path} failed ({error.code}): {error.read()[:300]!r}") from error
+    return json.loads(body) if body else None
+
+
+def create_schedule_set(opener, base_url: str, generated: Generated, runtime_dir: Path) -> dict:
+    """Replace the seeded windows with the generated set and return API timings."""
+    timings: dict[str, list[float]] = defaultdict(list)
+
+    def timed(kind: str, method: str, path: str, payload: Optional[dict] = None):
+        started = time.perf_counter()
+        result = api_request(opener, base_url, method, path, payload)
+        timings[kind].append((time.perf_counter() - started) * 1000)
+        return result
+
+    for window in timed("list", "GET", "/api/schedules") or []:
+        timed("delete", "DELETE", f"/api/schedules/{window['id']}")
+    for scene in generated.scenes:
+        timed("scene", "POST", "/api/scenes", scene)
+    for window in generated.windows:
+        timed("window", "POST", "/api/schedules", window)
+
+    # Automation rules have no API; the settings file watcher picks the edit up.
+    config_path = runtime_dir / "settings" / "config.json"
+    settings = json.loads(config_path.read_text(encoding="utf-8"))
+    settings["AutomationRules"] = generated.rules
+    config_path.write_text(json.dumps(settings, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    return {kind: harness.summarize(values) for kind, values in timings.items()}
+
+
+def scheduler_metrics(base_url: str, opener) -> Optional[dict]:
+    metrics = harness.fetch_metrics(base_url, opener=opener)
+    return (metrics or {}).get("scheduler")
+
+
+def virtual_now(metrics: Optional[dict]) -> Optional[datetime]:
+    value = (metrics or {}).get("lastEvaluationUtc")
+    return parse_utc(value) if value else None
+
+
+def idle_tick_cost(before: dict, after: dict) -> dict:
+    """Mean cost of ticks that did not trigger, between two `/metricsz` scheduler snapshots."""
+    def totals(snapshot: dict) -> tuple[float, float, int, int]:
+        all_ms = snapshot["averageEvaluationDurationMs"] * snapshot["evaluations"]
+        trigger_ms = snapshot["averageTriggerDurationMs"] * snapshot["triggers"]
+        return all_ms, trigger_ms, snapshot["evaluations"], snapshot["triggers"]
+
+    all_before, trigger_before, evaluations_before, triggers_before = totals(before)
+    all_after, trigger_after, evaluations_after, triggers_after = totals(after)
+    idle_count = (evaluations_after - evaluations_before) - (triggers_after - triggers_before)
+    idle_ms = (all_after - all_before) - (trigger_after - trigger_before)
+    return {
+        "evaluations": evaluations_after - evaluations_before,
+        "triggers": triggers_after - triggers_before,
+        "idle_mean_ms": idle_ms / idle_count if idle_count > 0 else None,
+    }
+
+
+def wait_for_virtual(base_url: str, opener, target: datetime, speed: float, on_sample=None, stall_seconds: float = 60) -> dict:
+    """Poll `/metricsz` until the scheduler has evaluated at or after `target`."""
+    poll_seconds = min(1.0, max(0.1, 600 / speed))
+    last_now, last_progress = None, time.monotonic()
+    while True:
+        metrics = scheduler_metrics(base_url, opener)
+        now = virtual_now(metrics)
+        if on_sample and metrics:
+            on_sample(metrics, now)
+        if now and now >= target:
+            return metrics
+        if now != last_now:
+            last_now, last_progress = now, time.monotonic()
+        elif time.monotonic() - last_progress > stall_seconds:
+            raise RuntimeError(f"The scheduler has not evaluated for {stall_seconds:.0f}s (last at {last_now}); check the server log.")
+        time.sleep(poll_seconds)
+
+
+def wait_for_seeded_scenes(base_url: str, opener, timeout_seconds: float = 30):
+    """Wait until the API serves the seeded settings, so generated writes do not overwrite them."""
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            if api_request(opener, base_url, "GET", "/api/scenes"):
+                return
+        except (RuntimeError, URLError, OSError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("The seeded demo settings did not reach the API; check the server log.")
+
+
+def parse_server_log(log_path: Path) -> tuple[list[dict], list[dict]]:
+    triggers, failures = [], []
+    for line in log_path.read_text(encoding="utf-8", errors="replace").splitlines():
+        match = TRIGGER_PATTERN.search(line)
+        if match:
+            triggers.append(
+                {
+                    "window": match.group("window"),
+                    "scene": match.group("scene"),
+                    "at": datetime.fromisoformat(match.group("at")).astimezone(timezone.utc),
+                    "targets": int(match.group("targets")),
+                    "elapsed_ms": float(match.group("elapsed").replace(",", ".")),
+                }
+            )
+            continue
+        match = FAILURE_PATTERN.search(line)
+        if match:
+            failures.append({"window": match.group("window"), "at": datetime.fromisoformat(match.group("at")).astimezone(timezone.utc)})
+    return triggers, failures
+
+
+def compare_triggers(expected: list[dict], observed: list[dict], failures: list[dict], late_after: float) -> tuple[list[dict], list[dict]]:
+    """Match each expected trigger to the first logged trigger of that window inside its active stretch."""
+    observed_by_window: dict[str, list[dict]] = defaultdict(list)
+    for trigger in observed:
+        observed_by_window[trigger["window"]].append(trigger)
+    failures_by_window: dict[str, list[datetime]] = defaultdict(list)
+    for failure in failures:
+        failures_by_window[failure["window"]].append(failure["at"])
+
+    used: set[int] = set()
+    outcomes = []
+    for trigger in expected:
+        window = trigger["window"]
+        match = next(
+            (
+                candidate for candidate in observed_by_window.get(window.id, [])
+                if id(candidate) not in used and trigger["at"] - timedelta(seconds=1) <= candidate["at"] < trigger["until"]
+            ),
+            None,
+        )
+        outcome = {
+            "window": window.id,
+            "expected_at": trigger["at"],
+            "stretch_minutes": (trigger["until"] - trigger["at"]).total_seconds() / 60,
+            "observed_at": None,
+            "lateness_s": None,
+            "status": "missed",
+        }
+        if match:
+            used.add(id(match))
+            lateness = max(0.0, (match["at"] - trigger["at"]).total_seconds())
+            outcome.update(observed_at=match["at"], lateness_s=lateness, status="late" if lateness > late_after else "on-time")
+        elif any(trigger["at"] <= failed < trigger["until"] for failed in failures_by_window.get(window.id, [])):
+            outcome["status"] = "failed"
+        outcomes.append(outcome)
+
+    unexpected = [trigger for trigger in observed if id(trigger) not in used]
+    return outcomes, unexpected
+
+
+def fan_out_bursts(commands: list[fake_speakers.DeviceCommand], gap_seconds: float) -> list[dict]:
+    """Group each scene's stream-URI commands into bursts, one per application of the scene."""
+    by_tag: dict[str, list[fake_speakers.DeviceCommand]] = defaultdict(list)
+    for command in commands:
+        match = SOURCE_PATTERN.search(command.uri or "") if command.action == "SetAVTransportURI" else None
+        if match and command.status == 200:
+            by_tag[match.group("tag")].append(command)
+
+    bursts = []
+    for tagged in by_tag.values():
+        current: list[fake_speakers.DeviceCommand] = []
+        for command in sorted(tagged, key=lambda item: item.received):
+            # A speaker receiving the same URI again means the scene was applied again.
+            repeated = any(item.ip == command.ip for item in current)
+            if current and (repeated or command.received - current[-1].received > gap_seconds):
+                bursts.append(current)
+                current = []
+            current.append(command)
+        if current:
+            bursts.append(current)
+    return [
+        {
+            "started": burst[0].received,
+            "speakers": len({command.ip for command in burst}),
+            "spread_ms": (burst[-1].received - burst[0].received) * 1000,
+        }
+        for burst in bursts
+    ]
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    if harness.is_server_reachable(base_url):
+        raise RuntimeError(f"{base_url} is already serving; the simulation needs its own instance on a simulated clock. Pass a free --base-url.")
+    if not 1 <= args.windows <= 900:
+        raise ValueError("--windows must be between 1 and 900 (priorities 100-1000 stay unique).")
+    if args.holidays > 100:
+        raise ValueError("--holidays must be at most 100 (override priorities 0-99).")
+
+    zone = ZoneInfo(args.time_zone)
+    today = datetime.now(zone).date()
+    first_day = date.fromisoformat(args.start_date) if args.start_date else today
+    if first_day < today:
+        # The API stamps windows with the real time; the scheduler re-applies any window modified
+        # after its last application, so virtual time must not run behind the wall clock.
+        raise ValueError("--start-date cannot be in the past.")
+    clock_start = max(
+        datetime.combine(first_day, clock_time(), zone).astimezone(timezone.utc),
+        datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1),
+    )
+    rng = random.Random(args.seed)
+    speaker_ips = fake_speakers.loopback_ips(args.speakers)
+    generated = build_schedule_set(args, rng, first_day, speaker_ips)
+    late_after = POLL_INTERVAL_SECONDS + args.grace_seconds
+
+    server = None
+    sampler = None
+    daily_rows: list[dict] = []
+    try:
+        with fake_speakers.FakeSpeakerFleet(speaker_ips, args.device_latency_ms, args.failure_rate, args.seed) as fleet:
+            server = harness.ensure_server(
+                base_url,
+                "perf-scheduler-sim",
+                True,
+                args.server_timeout,
+                extra_env={
+                    "BackgroundServices__Enabled": "true",
+                    "Automation__TimeZone": args.time_zone,
+                    "Automation__SimulatedClock__StartUtc": clock_start.isoformat(),
+                    "Automation__SimulatedClock__Speed": str(args.speed),
+                },
+                demo_scale="small",
+                speaker_ips=speaker_ips,
+            )
+            log_path = server[2]
+            username, password = harness.default_credentials()
+            opener = harness.login_http(base_url, username, password)
+            wait_for_seeded_scenes(base_url, opener)
+
+            setup_started = time.perf_counter()
+            api_timings = create_schedule_set(opener, base_url, generated, server[3])
+            setup_seconds = time.perf_counter() - setup_started
+            model = ScheduleModel(
+                [
+                    Window.from_api(window)
+                    for window in api_request(opener, base_url, "GET", "/api/schedules")
+                    if window["isEnabled"]
+                ],
+                zone,
+            )
+            enabled_scenes = {scene["id"] for scene in api_request(opener, base_url, "GET", "/api/scenes") if scene["enabled"]}
+            model.windows = [window for window in model.windows if window.scene_id in enabled_scenes]
+            print(
+                f"Created {len(generated.scenes)} scenes and {len(generated.windows)} windows "
+                f"({sum(1 for holiday in generated.holidays if holiday['window_id'])} holiday overrides) "
+                f"and {len(generated.rules)} rules in {setup_seconds:.1f}s."
+            )
+
+            # Start on the first local midnight after setup, so the whole set is in place.
+            settled = virtual_now(wait_for_virtual(base_url, opener, clock_start, args.speed))
+            settled = max(settled or clock_start, clock_start) + timedelta(seconds=2 * POLL_INTERVAL_SECONDS)
+            analysis_start = datetime.combine(settled.astimezone(zone).date() + timedelta(days=1), clock_time(), zone).astimezone(timezone.utc)
+            analysis_end = analysis_start + timedelta(days=args.weeks * 7)
+            print(
+                f"Replaying {analysis_start.astimezone(zone):%Y-%m-%d %H:%M} to {analysis_end.astimezone(zone):%Y-%m-%d %H:%M} "
+                f"({args.time_zone}) at {args.speed:g}x, about {(analysis_end - settled).total_seconds() / args.speed / 60:.1f} min."
+            )
+
+            metrics_start = wait_for_virtual(base_url, opener, analysis_start, args.speed)
+            fleet_start = fleet.mark()
+            real_start = time.perf_counter()
+            server_pid = harness.find_server_pid(server)
+            sampler = harness.ProcessSampler(server_pid) if server_pid else None
+            if sampler:
+                sampler.start()
+
+            day_state = {"metrics": metrics_start, "day": analysis_start.astimezone(zone).date()}
+
+            def on_sample(metrics: dict, now: Optional[datetime]):
+                if not now:
+                    return
+                day = now.astimezone(zone).date()
+                if day != day_state["day"]:
+                    daily_rows.append({"day": day_state["day"].isoformat(), **idle_tick_cost(day_state["metrics"], metrics)})
+                    print(
+                        f"  {day_state['day']:%a %Y-%m-%d}: {daily_rows[-1]['evaluations']} ticks, "
+                        f"{daily_rows[-1]['triggers']} triggers, idle tick "
+                        f"{harness.format_value(daily_rows[-1]['idle_mean_ms'], 3)}ms"
+                    )
+                    day_state.update(metrics=metrics, day=day)
+
+            # Run one poll interval past the end so triggers due at the edge are logged.
+            metrics_end = wait_for_virtual(
+                base_url, opener, analysis_end + timedelta(seconds=2 * POLL_INTERVAL_SECONDS), args.speed, on_sample
+            )
+            real_seconds = time.perf_counter() - real_start
+            resources = sampler.window(0) if sampler else harness.empty_resource_window()
+            commands = fleet.commands(fleet_start)
+    finally:
+        if sampler:
+            sampler.stop()
+        if server:
+            harness.stop_local_server(server[0], server[1], server[3])
+
+    observed, failures = parse_server_log(log_path)
+    # Same bound as the expected triggers: a change at the final midnight is in neither list.
+    observed = [trigger for trigger in observed if analysis_start <= trigger["at"] < analysis_end]
+    failures = [failure for failure in failures if analysis_start <= failure["at"] < analysis_end]
+    expected = model.expected_triggers(analysis_start, analysis_end)
+    outcomes, unexpected = compare_triggers(expected, observed, failures, late_after)
+    bursts = fan_out_bursts(commands, gap_seconds=1.0)
+
+    counts = defaultdict(int)
+    for outcome in outcomes:
+        counts[outcome["status"]] += 1
+    trigger_ticks = [trigger["elapsed_ms"] for trigger in observed]
+    lateness = [outcome["lateness_s"] for outcome in outcomes if outcome["lateness_s"] is not None]
+    idle = idle_tick_cost(metrics_start, metrics_end)
+    trigger_tick_summary = harness.summarize(trigger_ticks)
+    acceleration_overhead_s = (trigger_tick_summary["p95"] or 0) * args.speed / 1000
+
+    print()
+    harness.print_table(
+        ["day", "ticks", "triggers", "idle tick ms"],
+        [[row["day"], row["evaluations"], row["triggers"], harness.format_value(row["idle_mean_ms"], 3)] for row in daily_rows],
+    )
+    print()
+    harness.print_table(
+        ["expected", "on time", "late", "missed", "failed", "unexpected", "late p95 s", "late max s"],
+        [[
+            len(outcomes),
+            counts["on-time"],
+            counts["late"],
+            counts["missed"],
+            counts["failed"],
+            len(unexpected),
+            harness.summarize(lateness)["p95"],
+            harness.summarize(lateness)["max"],
+        ]],
+    )
+    print()
+    harness.print_table(
+        ["tick", "count", "mean ms", "p95 ms", "max ms"],
+        [
+            ["idle", idle["evaluations"] - idle["triggers"], harness.format_value(idle["idle_mean_ms"], 3), "-", "-"],
+            ["trigger", len(trigger_ticks), trigger_tick_summary["mean"], trigger_tick_summary["p95"], trigger_tick_summary["max"]],
+            ["any", metrics_end["evaluations"], harness.format_value(metrics_end["averageEvaluationDurationMs"], 3), "-", metrics_end["maxEvaluationDurationMs"]],
+        ],
+    )
+    fan_out = harness.summarize([burst["spread_ms"] for burst in bursts])
+    print(
+        f"\nFan-out over {len(bursts)} scene start(s): first to last speaker p50={harness.format_value(fan_out['median'])}ms, "
+        f"p95={harness.format_value(fan_out['p95'])}ms, max={harness.format_value(fan_out['max'])}ms."
+    )
+    print(
+        f"Replayed {args.weeks:g} week(s) with {len(model.windows)} active windows in {real_seconds:.0f}s; "
+        f"server CPU mean={harness.format_value(resources['cpu_percent']['mean'])}%, RSS max={harness.format_value(resources['rss_mb']['max'])} MB."
+    )
+    if acceleration_overhead_s > args.grace_seconds:
+        print(
+            f"Warning: a p95 trigger tick costs {acceleration_overhead_s:.0f} virtual seconds at {args.speed:g}x, "
+            f"more than --grace-seconds; late triggers may be an artefact of the speed. Lower --speed to confirm."
+        )
+    for outcome in [outcome for outcome in outcomes if outcome["status"] != "on-time"][:10]:
+        print(
+            f"  {outcome['status']:>7}: {outcome['window']} due {outcome['expected_at'].astimezone(zone):%Y-%m-%d %H:%M} "
+            f"(active {outcome['stretch_minutes']:.0f} min)"
+            + (f", fired {outcome['lateness_s']:.0f}s late" if outcome["lateness_s"] is not None else "")
+        )
+
+    summary = {
+        "expected": len(outcomes),
+        "on_time": counts["on-time"],
+        "late": counts["late"],
+        "missed": counts["missed"],
+        "failed": counts["failed"],
+        "unexpected": len(unexpected),
+        "late_after_seconds": late_after,
+        "acceleration_overhead_seconds": round(acceleration_overhead_s, 1),
+    }
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "scheduler-simulation",
+            "commit": harness.git_commit(),
+            "base_url": base_url,
+            "speed": args.speed,
+            "time_zone": args.time_zone,
+            "analysis_start_utc": analysis_start.isoformat(),
+            "analysis_end_utc": analysis_end.isoformat(),
+            "real_seconds": round(real_seconds, 1),
+            "schedule_set": {
+                "scenes": len(generated.scenes),
+                "windows": len(generated.windows),
+                "active_windows": len(model.windows),
+                "holidays": generated.holidays,
+                "rules": len(generated.rules),
+                "speakers": args.speakers,
+            },
+            "api_ms": api_timings,
+            "device_latency_ms": args.device_latency_ms,
+            "failure_rate": args.failure_rate,
+            "summary": summary,
+            "idle_ticks": idle,
+            "trigger_ticks_ms": trigger_tick_summary,
+            "lateness_s": harness.summarize(lateness),
+            "fan_out_ms": fan_out,
+            "resources": resources,
+            "days": daily_rows,
+            "problems": [
+                {**outcome, "expected_at": outcome["expected_at"].isoformat(), "observed_at": outcome["observed_at"] and outcome["observed_at"].isoformat()}
+                for outcome in outcomes if outcome["status"] != "on-time"
+            ],
+            "unexpected": [{**trigger, "at": trigger["at"].isoformat()} for trigger in unexpected],
+        },
+    )
+    print(f"Report written to {report_path}")
+    perf_results.record_run(
+        "scheduler-simulation",
+        {
+            "trigger-tick": trigger_ticks,
+            "idle-tick": [row["idle_mean_ms"] for row in daily_rows if row["idle_mean_ms"] is not None],
+            "lateness": lateness,
+            "fan-out": [burst["spread_ms"] for burst in bursts],
+            "missed": [counts["missed"] + counts["failed"]],
+        },
+        units={"lateness": "s", "missed": "count"},
+        parameters={
+            "windows": args.windows,
+            "holidays": args.holidays,
+            "rules": args.rules,
+            "speakers": args.speakers,
+            "weeks": args.weeks,
+            "speed": args.speed,
+        },
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,232 @@
+"""
+Batched in-page assertions for the UI smoke runners.
+
+A check list is plain data: each entry names a `check` and the elements it
+targets. `evaluate_checks()` injects the whole list into the page in a single
+`page.evaluate` call, re-runs it on the next frames until everything passes or
+the settle budget runs out, and returns one structured result. This replaces a
+chain of `expect(...)` / `locator.count()` round trips per matrix cell; keep
+Playwright's auto-wait for the readiness gate that precedes the batch.
+
+Targets:
+  {"css": "<selector>"}
+  {"role": "heading|button|link|dialog", "name": "...", "exact": False}
+  {"text": "...", "exact": True}          innermost elements with that text
+  {"label": "..."}                        aria-label / aria-labelledby / <label>
+  Any target may add "within": <target> to scope the lookup to the first
+  visible match of another target.
+
+Checks:
+  visible                target has a visible match
+  count                  target match count; "equals", "min" and/or "max"
+  has_class              every match carries "class"
+  no_horizontal_overflow document is not wider than the viewport
+  player_anchored        "player" sits on the bottom edge and "content" reserves its height
+  uniform_height         heights of all matches differ by at most "tolerance" px (default 1)
+  touch_targets          every match is at least "min_size" px wide (default 44);
+                         optional "same_count_as": <target>
+
+Common keys: "when": <target> skips the check unless the target matches, and
+"min_width" / "max_width" limit it to viewport widths.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+
+DEFAULT_SETTLE_MS = 2000
+
+ASSERTION_SCRIPT = """
+async ({ checks, settleMs }) => {
+    const ROLE_SELECTORS = {
+        heading: 'h1,h2,h3,h4,h5,h6,[role="heading"]',
+        button: 'button,[role="button"],input[type="button"],input[type="submit"]',
+        link: 'a[href],[role="link"]',
+        dialog: 'dialog,[role="dialog"]',
+    };
+    const normalize = value => (value || '').replace(/\\s+/g, ' ').trim();
+    const isVisible = element => {
+        const rect = element.getBoundingClientRect();
+        if (rect.width === 0 && rect.height === 0) return false;
+        const style = window.getComputedStyle(element);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const labelText = element => {
+        const labelledBy = element.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            return normalize(labelledBy.split(/\\s+/).map(id => document.getElementById(id)?.textContent || '').join(' '));
+        }
+        if (element.hasAttribute('aria-label')) return normalize(element.getAttribute('aria-label'));
+        if (element.labels && element.labels.length) {
+            return normalize([...element.labels].map(label => label.textContent).join(' '));
+        }
+        return '';
+    };
+    const accessibleName = element => labelText(element) || normalize(element.textContent || element.value);
+    const matches = (actual, expected, exact) => exact
+        ? actual === normalize(expected)
+        : actual.toLowerCase().includes(normalize(expected).toLowerCase());
+
+    const resolve = target => {
+        let scope = document;
+        if (target.within) {
+            scope = resolve(target.within).find(isVisible);
+            if (!scope) return [];
+        }
+        if (target.css) return [...scope.querySelectorAll(target.css)];
+        if (target.role) {
+            return [...scope.querySelectorAll(ROLE_SELECTORS[target.role] || `[role="${target.role}"]`)]
+                .filter(element => target.name === undefined || matches(accessibleName(element), target.name, target.exact === true));
+        }
+        if (target.label !== undefined) {
+            return [...scope.querySelectorAll('[aria-label],[aria-labelledby],input,select,textarea')]
+                .filter(element => matches(labelText(element), target.label, target.exact !== false));
+        }
+        if (target.text !== undefined) {
+            const exact = target.exact !== false;
+            const hits = [...scope.querySelectorAll('body *')]
+                .filter(element => matches(normalize(element.textContent), target.text, exact));
+            return hits.filter(element => !hits.some(other => other !== element && element.contains(other)));
+        }
+        throw new Error(`Unsupported target: ${JSON.stringify(target)}`);
+    };
+
+    const evaluateCheck = check => {
+        const width = window.innerWidth;
+        if ((check.min_width && width < check.min_width) || (check.max_width && width > check.max_width)) {
+            return { status: 'skipped', detail: `viewport ${width}px` };
+        }
+        if (check.when && resolve(check.when).length === 0) {
+            return { status: 'skipped', detail: 'condition not met' };
+        }
+
+        const fail = detail => ({ status: 'failed', detail });
+        const pass = detail => ({ status: 'passed', detail });
+        switch (check.check) {
+            case 'visible': {
+                const found = resolve(check.target);
+                return found.some(isVisible) ? pass(`${found.length} match(es)`) : fail(
+                    found.length ? `${found.length} match(es), none visible` : 'no matching element');
+            }
+            case 'count': {
+                const count = resolve(check.target).length;
+                const ok = (check.equals === undefined || count === check.equals)
+                    && (check.min === undefined || count >= check.min)
+                    && (check.max === undefined || count <= check.max);
+                return ok ? pass(`count=${count}`) : fail(`count=${count}`);
+            }
+            case 'has_class': {
+                const found = resolve(check.target);
+                if (!found.length) return fail('no matching element');
+                const missing = found.filter(element => !element.classList.contains(check.class));
+                return missing.length ? fail(`${missing.length}/${found.length} without .${check.class}`) : pass(`${found.length} match(es)`);
+            }
+            case 'no_horizontal_overflow': {
+                const documentWidth = document.documentElement.scrollWidth;
+                const detail = `viewport=${width}px, document=${documentWidth}px, body=${document.body.scrollWidth}px`;
+                return documentWidth <= width ? pass(detail) : fail(detail);
+            }
+            case 'player_anchored': {
+                const player = document.querySelector(check.player);
+                const content = document.querySelector(check.content);
+                if (!player || !content) return fail('player or content region missing');
+                const rect = player.getBoundingClientRect();
+                const bottomGap = Math.abs(window.innerHeight - rect.bottom);
+                if (bottomGap > 2) return fail(`player is ${bottomGap.toFixed(1)}px from the bottom edge`);
+                const paddingBottom = Number.parseFloat(window.getComputedStyle(content).paddingBottom) || 0;
+                if (window.getComputedStyle(player).position === 'fixed' && paddingBottom + 4 < rect.height) {
+                    return fail(`content reserves ${paddingBottom}px for a ${rect.height.toFixed(1)}px player`);
+                }
+                return pass(`gap=${bottomGap.toFixed(1)}px, padding=${paddingBottom}px`);
+            }
+            case 'uniform_height': {
+                const heights = resolve(check.target).map(element => Math.round(element.getBoundingClientRect().height * 100) / 100);
+                if (!heights.length) return { status: 'skipped', detail: 'no matching element' };
+                const spread = Math.max(...heights) - Math.min(...heights);
+                return spread <= (check.tolerance ?? 1) ? pass(`${heights.length} element(s)`) : fail(`heights differ: ${heights.join(', ')}`);
+            }
+            case 'touch_targets': {
+                const sizes = resolve(check.target).map(element => Math.round(element.getBoundingClientRect().width * 100) / 100);
+                if (check.same_count_as) {
+                    const expected = resolve(check.same_count_as).length;
+                    if (sizes.length !== expected) return fail(`count=${sizes.length}, expected ${expected}`);
+                }
+                const small = sizes.filter(size => size < (check.min_size ?? 44));
+                return small.length ? fail(`too small: ${small.join(', ')}`) : pass(`${sizes.length} target(s)`);
+            }
+            default:
+                return fail(`unknown check '${check.check}'`);
+        }
+    };
+
+    const started = performance.now();
+    let attempts = 0;
+    let results;
+    while (true) {
+        attempts += 1;
+        results = checks.map(check => {
+            try {
+                return evaluateCheck(check);
+            } catch (error) {
+                return { status: 'failed', detail: String(error) };
+            }
+        });
+        const pending = results.some(result => result.status === 'failed');
+        if (!pending || performance.now() - started >= settleMs) break;
+        await new Promise(resolve => setTimeout(resolve, 50));
+    }
+    return { results, attempts, elapsedMs: performance.now() - started };
+}
+"""
+
+
+def describe_target(target: Optional[dict]) -> str:
+    if not target:
+        return ""
+    if "css" in target:
+        text = target["css"]
+    elif "role" in target:
+        text = f"{target['role']} '{target['name']}'" if "name" in target else target["role"]
+    elif "label" in target:
+        text = f"label '{target['label']}'"
+    else:
+        text = f"text '{target.get('text')}'"
+    if target.get("within"):
+        text += f" in {describe_target(target['within'])}"
+    return text
+
+
+def describe_check(check: dict) -> str:
+    if check.get("name"):
+        return check["name"]
+    bounds = ", ".join(f"{key}={check[key]}" for key in ("equals", "min", "max", "class") if key in check)
+    target = describe_target(check.get("target"))
+    return " ".join(part for part in (check["check"], target, f"({bounds})" if bounds else "") if part)
+
+
+async def evaluate_checks(page, checks: list[dict], settle_ms: int = DEFAULT_SETTLE_MS) -> dict:
+    """Run every check in one round trip on an async Playwright page and pair outcomes with descriptions."""
+    raw = await page.evaluate(ASSERTION_SCRIPT, {"checks": checks, "settleMs": settle_ms})
+    return pair_results(checks, raw)
+
+
+def pair_results(checks: list[dict], raw: dict) -> dict:
+    results = [
+        {"check": describe_check(check), **outcome}
+        for check, outcome in zip(checks, raw["results"])
+    ]
+    return {
+        "results": results,
+        "failures": [result for result in results if result["status"] == "failed"],
+        "attempts": raw["attempts"],
+        "elapsed_ms": round(raw["elapsedMs"], 1),
+    }
+
+
+def format_failures(failures: list[dict]) -> str:
+    """Render collected `{"cell": ..., "check": ..., "detail": ...}` entries as one report."""
+    lines = [f"{len(failures)} UI smoke assertion(s) failed:"]
+    for failure in failures:
+        lines.append(f"- [{failure['cell']}] {failure['check']}: {failure['detail']}")
+    return "\n".join(lines)
@@ -0,0 +1,416 @@
+"""
+Shared helpers for the SonosControl performance and UI harness scripts.
+
+Covers the pieces every tool needs: starting an isolated `SonosControl.Web`
+instance with disposable settings/SQLite storage, signing in over plain HTTP,
+reading `/metricsz`, sampling server CPU/RSS, and summarising timings.
+
+Scripts in this directory import it directly; the root-level UI scripts add
+`scripts/` to `sys.path` first.
+"""
+
+from __future__ import annotations
+
+import http.cookiejar
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener, urlopen
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+PERF_ARTIFACTS_DIR = ARTIFACTS_DIR / "perf"
+
+DEFAULT_BASE_URL = "http://localhost:5107"
+DEFAULT_ADMIN_USERNAME = "admin"
+DEFAULT_ADMIN_PASSWORD = "Test1234."
+
+CHROME_PATH = os.getenv("PLAYWRIGHT_CHROME_PATH")
+
+ANTIFORGERY_PATTERN = re.compile(
+    r'name="__RequestVerificationToken"[^>]*value="([^"]+)"|value="([^"]+)"[^>]*name="__RequestVerificationToken"'
+)
+
+
+def is_server_reachable(base_url: str) -> bool:
+    try:
+        with urlopen(f"{base_url.rstrip('/')}/auth/login", timeout=3):
+            return True
+    except (URLError, HTTPError, TimeoutError, OSError):
+        return False
+
+
+def wait_for_server_ready(base_url: str, timeout_seconds: int, process=None) -> bool:
+    deadline = time.time() + timeout_seconds
+    while time.time() < deadline:
+        if process and process.poll() is not None:
+            return False
+
+        if is_server_reachable(base_url):
+            return True
+
+        time.sleep(1)
+
+    return False
+
+
+def create_runtime_dir(label: str) -> Path:
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    runtime_dir = Path(tempfile.mkdtemp(prefix=f"sonoscontrol-{label}-", dir=ARTIFACTS_DIR)).resolve()
+    (runtime_dir / "settings").mkdir(parents=True, exist_ok=True)
+    return runtime_dir
+
+
+def build_server_env(runtime_dir: Path, label: str, extra_env: Optional[dict] = None) -> dict:
+    return {
+        **os.environ,
+        "BackgroundServices__Enabled": os.getenv("BackgroundServices__Enabled", "false"),
+        "Settings__DataDirectory": str(runtime_dir / "settings"),
+        "ConnectionStrings__DefaultConnection": f"Data Source={runtime_dir / 'app.db'}",
+        "ADMIN_USERNAME": os.getenv("ADMIN_USERNAME", DEFAULT_ADMIN_USERNAME),
+        "ADMIN_EMAIL": os.getenv("ADMIN_EMAIL", f"admin@{label}.invalid"),
+        "ADMIN_PASSWORD": os.getenv("ADMIN_PASSWORD", DEFAULT_ADMIN_PASSWORD),
+        "DataProtection__KeysDirectory": os.getenv(
+            "DataProtection__KeysDirectory",
+            str((runtime_dir / "keys").resolve()),
+        ),
+        **(extra_env or {}),
+    }
+
+
+def start_local_server(
+    base_url: str,
+    label: str,
+    extra_env: Optional[dict] = None,
+    runtime_dir: Optional[Path] = None,
+):
+    """Launch `dotnet run` against a disposable runtime directory.
+
+    Pass an existing `runtime_dir` to reuse pre-seeded settings and SQLite data.
+    Returns `(process, log_stream, log_path, runtime_dir)` like the UI scripts.
+    """
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = ARTIFACTS_DIR / f"{label}_server.log"
+    log_stream = log_path.open("w", encoding="utf-8")
+    if runtime_dir is None:
+        runtime_dir = create_runtime_dir(label)
+
+    process = subprocess.Popen(
+        ["dotnet", "run", "--project", "SonosControl.Web", "--no-build", "--urls", base_url],
+        stdout=log_stream,
+        stderr=subprocess.STDOUT,
+        cwd=PROJECT_ROOT,
+        shell=False,
+        env=build_server_env(runtime_dir, label, extra_env),
+    )
+    return process, log_stream, log_path, runtime_dir
+
+
+def stop_local_server(process, log_stream, runtime_dir=None):
+    if process and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout=5)
+
+    if log_stream:
+        log_stream.close()
+    if runtime_dir:
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+
+def ensure_server(
+    base_url: str,
+    label: str,
+    autostart: bool,
+    timeout_seconds: int,
+    extra_env: Optional[dict] = None,
+    demo_scale: Optional[str] = None,
+    demo_seed: int = 42,
+    speaker_ips: Optional[list[str]] = None,
+):
+    """Reuse a reachable server or start an isolated one.
+
+    With `demo_scale`, the isolated runtime is seeded via `seed_demo_data` once it is up;
+    `speaker_ips` points the seeded speakers at a fake fleet (see `fake_speakers.py`).
+    Returns the `start_local_server` tuple, or `None` when an existing server is used.
+    """
+    if autostart and not is_server_reachable(base_url):
+        server = start_local_server(base_url, label, extra_env=extra_env)
+        process, log_stream, log_path, runtime_dir = server
+        if not wait_for_server_ready(base_url, timeout_seconds, process=process):
+            exit_code = process.poll()
+            stop_local_server(process, log_stream, runtime_dir)
+            raise RuntimeError(
+                f"Timed out waiting for {base_url} (server exit code: {exit_code}). "
+                f"Check server log: {log_path}"
+            )
+        if demo_scale:
+            import seed_demo_data
+
+            seed_demo_data.seed_runtime(runtime_dir, demo_scale, demo_seed, speaker_ips=speaker_ips)
+        return server
+
+    if demo_scale:
+        raise RuntimeError("Demo data can only be seeded into an auto-started isolated runtime.")
+    if not is_server_reachable(base_url):
+        raise RuntimeError(f"App is not reachable at {base_url}. Start the app or enable auto-start.")
+
+    return None
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_chrome_path() -> Optional[str]:
+    if CHROME_PATH:
+        path = Path(CHROME_PATH)
+        if path.exists():
+            return str(path)
+        raise RuntimeError(f"PLAYWRIGHT_CHROME_PATH does not exist: {CHROME_PATH}")
+
+    if platform.system() == "Darwin":
+        mac_chrome = Path("/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+        if mac_chrome.exists():
+            return str(mac_chrome)
+
+    return None
+
+
+def launch_chromium(playwright):
+    executable_path = resolve_chrome_path()
+    if executable_path:
+        return playwright.chromium.launch(headless=True, executable_path=executable_path)
+
+    return playwright.chromium.launch(headless=True)
+
+
+def default_credentials(username: Optional[str] = None, password: Optional[str] = None) -> tuple[str, str]:
+    return (
+        username or os.getenv("PERF_USERNAME") or os.getenv("ADMIN_USERNAME") or DEFAULT_ADMIN_USERNAME,
+        password or os.getenv("PERF_PASSWORD") or os.getenv("ADMIN_PASSWORD") or DEFAULT_ADMIN_PASSWORD,
+    )
+
+
+def login_http(base_url: str, username: str, password: str):
+    """Sign in through the cookie login form and return an authenticated urllib opener."""
+    cookies = http.cookiejar.CookieJar()
+    opener = build_opener(HTTPCookieProcessor(cookies))
+    login_url = f"{base_url.rstrip('/')}/auth/login"
+
+    with opener.open(login_url, timeout=10) as response:
+        html = response.read().decode("utf-8", errors="replace")
+
+    match = ANTIFORGERY_PATTERN.search(html)
+    if not match:
+        raise RuntimeError(f"No antiforgery token found on {login_url}.")
+
+    form = urlencode(
+        {
+            "username": username,
+            "password": password,
+            "rememberMe": "false",
+            "__RequestVerificationToken": match.group(1) or match.group(2),
+        }
+    ).encode("utf-8")
+    with opener.open(Request(login_url, data=form, method="POST"), timeout=10) as response:
+        final_url = response.geturl()
+
+    if "/auth/login" in final_url:
+        raise RuntimeError(f"Login failed for user '{username}' ({final_url}).")
+
+    return opener
+
+
+def fetch_json(base_url: str, path: str, opener=None, timeout: float = 10):
+    url = f"{base_url.rstrip('/')}{path}"
+    open_url = opener.open if opener else urlopen
+    with open_url(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def fetch_metrics(base_url: str, opener=None) -> Optional[dict]:
+    try:
+        return fetch_json(base_url, "/metricsz", opener=opener)
+    except (URLError, HTTPError, TimeoutError, OSError, ValueError):
+        return None
+
+
+def dashboard_metrics_delta(before: Optional[dict], after: Optional[dict]) -> dict:
+    """Derive dashboard refresh counts and mean duration for the window between two snapshots."""
+    if not before or not after:
+        return {"refreshes": 0, "failures": 0, "mean_duration_ms": None}
+
+    start = before.get("dashboard", {})
+    end = after.get("dashboard", {})
+    start_runs = start.get("successes", 0) + start.get("failures", 0)
+    end_runs = end.get("successes", 0) + end.get("failures", 0)
+    runs = end_runs - start_runs
+    mean = None
+    if runs > 0:
+        total_ms = end.get("averageDurationMs", 0) * end_runs - start.get("averageDurationMs", 0) * start_runs
+        mean = round(total_ms / runs, 2)
+
+    return {
+        "refreshes": runs,
+        "failures": end.get("failures", 0) - start.get("failures", 0),
+        "mean_duration_ms": mean,
+        "duration_buckets": {
+            bucket: count - start.get("durationBuckets", {}).get(bucket, 0)
+            for bucket, count in end.get("durationBuckets", {}).items()
+        },
+    }
+
+
+class ProcessSampler:
+    """Samples CPU and RSS of a server process tree on a background thread.
+
+    `dotnet run` hosts the app in a child process, so children are included.
+    Requires `psutil` (see `requirements-perf.txt`).
+    """
+
+    def __init__(self, pid: int, interval_seconds: float = 0.5):
+        import psutil
+
+        self._psutil = psutil
+        self._root = psutil.Process(pid)
+        self._interval = interval_seconds
+        self._lock = threading.Lock()
+        self._samples: list[tuple[float, float, float]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _tree(self):
+        try:
+            return [self._root, *self._root.children(recursive=True)]
+        except self._psutil.Error:
+            return []
+
+    def _sample_once(self):
+        cpu = 0.0
+        rss = 0
+        for proc in self._tree():
+            try:
+                cpu += proc.cpu_percent(None)
+                rss += proc.memory_info().rss
+            except self._psutil.Error:
+                continue
+        with self._lock:
+            self._samples.append((time.perf_counter(), cpu, rss / (1024 * 1024)))
+
+    def _loop(self):
+        for proc in self._tree():
+            try:
+                proc.cpu_percent(None)
+            except self._psutil.Error:
+                continue
+        while not self._stop.wait(self._interval):
+            self._sample_once()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="process-sampler", daemon=True)
+        self._thread.start()
+
+    def mark(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def window(self, start_mark: int, end_mark: Optional[int] = None) -> dict:
+        with self._lock:
+            samples = self._samples[start_mark:end_mark]
+        cpu = [sample[1] for sample in samples]
+        rss = [sample[2] for sample in samples]
+        return {
+            "samples": len(samples),
+            "cpu_percent": summarize(cpu),
+            "rss_mb": summarize(rss),
+        }
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+def empty_resource_window() -> dict:
+    return {"samples": 0, "cpu_percent": summarize([]), "rss_mb": summarize([])}
+
+
+def find_server_pid(server) -> Optional[int]:
+    if server is None:
+        return None
+    return server[0].pid
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0, "min": None, "median": None, "p95": None, "max": None, "mean": None}
+
+    return {
+        "count": len(values),
+        "min": round(min(values), 3),
+        "median": round(statistics.median(values), 3),
+        "p95": round(percentile(values, 95), 3),
+        "max": round(max(values), 3),
+        "mean": round(statistics.fmean(values), 3),
+    }
+
+
+def format_value(value, digits: int = 1) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return str(value)
+
+
+def print_table(headers: list[str], rows: list[list]):
+    cells = [[format_value(value) for value in row] for row in rows]
+    widths = [max(len(header), *(len(row[index]) for row in cells)) if cells else len(header) for index, header in enumerate(headers)]
+    print("  ".join(header.rjust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in cells:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+def write_json_report(path: Path, payload: dict) -> Path:
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    return path
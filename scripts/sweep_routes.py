@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Sweep every discovered page route and rank the slowest.
+
+Routes come from `route_index.py` (Razor `@page` directives, cached by mtime).
+Parameterised templates are filled from the seeded runtime (`--demo-data`) or
+`--param NAME=VALUE`. For each route and repeat the sweep records:
+- server render time: an authenticated HTTP GET of the prerendered page,
+- browser navigation timing: TTFB, DOMContentLoaded and load,
+- ready time: navigation start until the network is idle and the circuit is up,
+plus one batched layout check (overflow, player anchoring) per route.
+
+The report ranks routes by median ready time, is written to
+`artifacts/perf/route_sweep.json`, and is recorded in the perf results store.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError, async_playwright
+
+import perf_results
+import route_index
+import smoke_assertions
+import sonos_harness as harness
+import ui_scheduler
+
+
+LAYOUT_CHECKS = [
+    {"check": "no_horizontal_overflow"},
+    {
+        "check": "player_anchored",
+        "name": "global player anchored without covering content",
+        "player": "[data-qa='global-player-bar']",
+        "content": "article.content",
+        "when": {"css": "[data-qa='global-player-bar']"},
+    },
+]
+NAVIGATION_TIMING_SCRIPT = """
+() => {
+    const entry = performance.getEntriesByType('navigation')[0];
+    if (!entry) return null;
+    return {
+        ttfb: entry.responseStart - entry.startTime,
+        domContentLoaded: entry.domContentLoadedEventEnd - entry.startTime,
+        load: entry.loadEventEnd - entry.startTime,
+    };
+}
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time every page route discovered from @page directives and rank the slowest.")
+    parser.add_argument("--base-url", default=os.getenv("PERF_BASE_URL", harness.DEFAULT_BASE_URL))
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed visits per route (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Routes swept at once; keep 1 for clean timings (default: 1)")
+    parser.add_argument("--viewport", default="1280x900", help="Viewport as WIDTHxHEIGHT")
+    parser.add_argument("--top", type=int, default=10, help="Slowest routes to print (default: 10)")
+    parser.add_argument("--include", default=None, help="Only sweep routes containing this text")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE", help="Route parameter value (repeatable)")
+    parser.add_argument("--refresh-index", action="store_true", help="Rescan .razor files even if the cache is current")
+    parser.add_argument("--server-timeout", type=int, default=180)
+    parser.add_argument("--no-autostart", action="store_true")
+    parser.add_argument(
+        "--demo-data",
+        choices=["small", "medium", "large"],
+        default=None,
+        help="Seed the isolated runtime with demo data at this scale; also fills route parameters",
+    )
+    parser.add_argument("--out", default="artifacts/perf/route_sweep.json")
+    return parser.parse_args()
+
+
+def parse_viewport(viewport: str) -> dict:
+    width, height = (int(part) for part in viewport.lower().split("x"))
+    return {"width": width, "height": height}
+
+
+def parse_params(raw: list[str]) -> dict[str, str]:
+    values = {}
+    for item in raw:
+        name, separator, value = item.partition("=")
+        if not separator or not name:
+            raise ValueError(f"Invalid --param '{item}'. Use NAME=VALUE.")
+        values[name.strip().lower()] = value
+    return values
+
+
+def plan_routes(routes: list[dict], values: dict[str, str], include: Optional[str]) -> tuple[list[dict], list[dict]]:
+    """Split the index into sweepable routes with concrete paths and skipped ones with a reason."""
+    planned, skipped = [], []
+    for route in routes:
+        if include and include not in route["template"]:
+            continue
+        path, missing = route_index.fill_template(route["template"], values)
+        if path is None:
+            skipped.append({**route, "reason": f"no value for {', '.join(missing)}"})
+        else:
+            planned.append({**route, "path": path})
+    return planned, skipped
+
+
+def time_server_render(opener, url: str) -> Optional[float]:
+    started = time.perf_counter()
+    try:
+        with opener.open(url, timeout=60) as response:
+            response.read()
+    except (HTTPError, URLError, TimeoutError, OSError):
+        return None
+    return (time.perf_counter() - started) * 1000
+
+
+def empty_samples() -> dict[str, list[float]]:
+    return {"server_ms": [], "ttfb_ms": [], "dom_content_loaded_ms": [], "load_ms": [], "ready_ms": []}
+
+
+def route_result(route: dict, samples: dict, errors: list[str], final_path: Optional[str] = None, layout: Optional[dict] = None) -> dict:
+    return {
+        "template": route["template"],
+        "path": route["path"],
+        "component": route["component"],
+        "file": route["file"],
+        "requires_auth": route["requires_auth"],
+        "roles": route["roles"],
+        "final_path": final_path,
+        "redirected": final_path is not None and final_path.rstrip("/") != route["path"].rstrip("/"),
+        "errors": errors,
+        "layout_failures": layout["failures"] if layout else [],
+        "timings": {name: harness.summarize(values) for name, values in samples.items()},
+        "samples": samples,
+    }
+
+
+async def sweep_route(page, opener, base_url: str, route: dict, repeats: int) -> dict:
+    url = f"{base_url}{route['path']}"
+    samples = empty_samples()
+    errors: list[str] = []
+    final_path = None
+    layout = None
+    for attempt in range(repeats):
+        server_ms = await asyncio.to_thread(time_server_render, opener, url)
+        if server_ms is None:
+            errors.append("server render request failed")
+        else:
+            samples["server_ms"].append(server_ms)
+
+        started = time.perf_counter()
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=60000)
+        except PlaywrightError as error:
+            errors.append(str(error).splitlines()[0])
+            continue
+        samples["ready_ms"].append((time.perf_counter() - started) * 1000)
+        timing = await page.evaluate(NAVIGATION_TIMING_SCRIPT)
+        if timing:
+            samples["ttfb_ms"].append(timing["ttfb"])
+            samples["dom_content_loaded_ms"].append(timing["domContentLoaded"])
+            samples["load_ms"].append(timing["load"])
+        final_path = urlparse(page.url).path or "/"
+        if attempt == 0:
+            layout = await smoke_assertions.evaluate_checks(page, LAYOUT_CHECKS)
+
+    return route_result(route, samples, errors, final_path, layout)
+
+
+async def sweep(args, base_url: str, planned: list[dict], username: str, password: str) -> list[dict]:
+    opener = await asyncio.to_thread(harness.login_http, base_url, username, password)
+    scheduler = ui_scheduler.CellScheduler(args.concurrency, args.concurrency)
+    results: list[dict] = []
+
+    async with async_playwright() as playwright:
+        browser = await harness.launch_chromium(playwright)
+        login_context = await browser.new_context(viewport=parse_viewport(args.viewport))
+        login_page = await login_context.new_page()
+        await login_page.goto(f"{base_url}/auth/login", wait_until="networkidle")
+        await login_page.fill("#username", username)
+        await login_page.fill("#password", password)
+        await login_page.click("button#loginBtn")
+        await login_page.wait_for_load_state("networkidle")
+        if "/auth/login" in login_page.url:
+            raise RuntimeError(f"Unable to log in as '{username}'. Pass --username/--password.")
+        storage_state = await login_context.storage_state()
+        await login_context.close()
+
+        async def visit(route: dict):
+            async with scheduler.slot("chromium", base_url):
+                try:
+                    # A fresh context per route keeps caches and circuits from leaking between pages.
+                    context = await browser.new_context(viewport=parse_viewport(args.viewport), storage_state=storage_state)
+                    try:
+                        page = await context.new_page()
+                        result = await sweep_route(page, opener, base_url, route, args.repeats)
+                    finally:
+                        await context.close()
+                except Exception as error:
+                    # One broken route must not discard the measurements of all the others.
+                    result = route_result(route, empty_samples(), [f"{type(error).__name__}: {error}".splitlines()[0]])
+            results.append(result)
+            print(
+                f"{route['path']:<32} ready p50={harness.format_value(result['timings']['ready_ms']['median'])}ms "
+                f"server p50={harness.format_value(result['timings']['server_ms']['median'])}ms"
+            )
+
+        await asyncio.gather(*[visit(route) for route in planned])
+        await scheduler.drain()
+        await browser.close()
+    return results
+
+
+def ready_median(result: dict) -> float:
+    median = result["timings"]["ready_ms"]["median"]
+    return -1.0 if median is None else median
+
+
+def run():
+    args = parse_args()
+    base_url = args.base_url.rstrip("/")
+    username, password = harness.default_credentials(args.username, args.password)
+    routes = route_index.load_route_index(refresh=args.refresh_index)
+
+    server = harness.ensure_server(
+        base_url,
+        "perf-routes",
+        not args.no_autostart,
+        args.server_timeout,
+        demo_scale=args.demo_data,
+    )
+    try:
+        values = route_index.parameter_values(server[3] if server else None)
+        values.update(parse_params(args.param))
+        planned, skipped = plan_routes(routes, values, args.include)
+        results = asyncio.run(sweep(args, base_url, planned, username, password))
+    finally:
+        if server:
+            harness.stop_local_server(server[0], server[1], server[3])
+
+    ranked = sorted(results, key=ready_median, reverse=True)
+    print()
+    harness.print_table(
+        ["#", "route", "component", "server p50", "ttfb p50", "dcl p50", "ready p50", "ready p95", "notes"],
+        [
+            [
+                index,
+                result["path"],
+                result["component"],
+                result["timings"]["server_ms"]["median"],
+                result["timings"]["ttfb_ms"]["median"],
+                result["timings"]["dom_content_loaded_ms"]["median"],
+                result["timings"]["ready_ms"]["median"],
+                result["timings"]["ready_ms"]["p95"],
+                ", ".join(
+                    note
+                    for note in (
+                        f"-> {result['final_path']}" if result["redirected"] else "",
+                        f"{len(result['layout_failures'])} layout" if result["layout_failures"] else "",
+                        f"{len(result['errors'])} errors" if result["errors"] else "",
+                    )
+                    if note
+                ) or "-",
+            ]
+            for index, result in enumerate(ranked[: args.top], start=1)
+        ],
+    )
+    for route in skipped:
+        print(f"Skipped {route['template']}: {route['reason']}")
+
+    report_path = harness.write_json_report(
+        Path(args.out),
+        {
+            "scenario": "route-sweep",
+            "commit": harness.git_commit(),
+            "base_url": base_url,
+            "viewport": args.viewport,
+            "repeats": args.repeats,
+            "demo_data": args.demo_data,
+            "routes_discovered": len(routes),
+            "ranked": [{key: value for key, value in result.items() if key != "samples"} for result in ranked],
+            "skipped": skipped,
+        },
+    )
+    print(f"\n{len(results)} routes swept, {len(skipped)} skipped. Report written to {report_path}")
+    perf_results.record_run(
+        "route-sweep",
+        {
+            f"{metric}@{result['path']}": result["samples"][f"{metric}_ms"]
+            for result in results
+            for metric in ("ready", "server")
+        },
+        parameters={"viewport": args.viewport, "repeats": args.repeats, "demo_data": args.demo_data},
+    )
+
+
+if __name__ == "__main__":
+    run()
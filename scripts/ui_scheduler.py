@@ -0,0 +1,116 @@
+"""
+Bounded asyncio scheduling for the Playwright UI runners.
+
+`CellScheduler` limits how many matrix cells run at once per browser and per
+server, and moves follow-up I/O off the critical path: a cell hands its
+screenshot bytes to the `ScreenshotWriter` thread and its `/metricsz` fetch to
+`background()`, then releases its slot so the next cell navigates while the
+previous one is still being written. Call `drain()` before reporting so every
+background write has landed.
+
+Chromium encodes screenshots in the browser process, so the harness receives
+finished PNG bytes; the writer keeps them byte-for-byte (lossless) and only
+moves the disk writes off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import queue
+import threading
+from pathlib import Path
+from typing import Awaitable, Optional
+
+import sonos_harness as harness
+
+
+class ScreenshotWriter:
+    """Writes screenshot bytes to disk on one daemon thread, in submission order."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._errors: list[str] = []
+        self.files_written = 0
+        self.bytes_written = 0
+        self._thread = threading.Thread(target=self._loop, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            path, data = self._queue.get()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+                self.files_written += 1
+                self.bytes_written += len(data)
+            except OSError as error:
+                self._errors.append(f"{path}: {error}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, path: Path, data: bytes):
+        self._queue.put((path, data))
+
+    def flush(self):
+        """Block until every submitted file is on disk; raise if any write failed."""
+        self._queue.join()
+        if self._errors:
+            raise OSError("Screenshot writes failed: " + "; ".join(self._errors))
+
+
+class CellScheduler:
+    def __init__(self, per_browser: int, per_server: int):
+        if per_browser < 1 or per_server < 1:
+            raise ValueError("Concurrency limits must be at least 1.")
+        self._per_browser = per_browser
+        self._per_server = per_server
+        self._browser_slots: dict[str, asyncio.Semaphore] = {}
+        self._server_slots: dict[str, asyncio.Semaphore] = {}
+        self._background: set[asyncio.Task] = set()
+        self.writer = ScreenshotWriter()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, browser: str, server: str):
+        server_slot = self._server_slots.setdefault(server, asyncio.Semaphore(self._per_server))
+        browser_slot = self._browser_slots.setdefault(browser, asyncio.Semaphore(self._per_browser))
+        # Acquire in a fixed order so cells waiting on both limits cannot deadlock.
+        async with server_slot:
+            async with browser_slot:
+                yield
+
+    def background(self, awaitable: Awaitable) -> asyncio.Task:
+        task = asyncio.ensure_future(awaitable)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def write_file(self, path: Path, data: bytes):
+        self.writer.submit(path, data)
+
+    def fetch_metrics(self, base_url: str, sink: dict, key: str = "server_metrics") -> asyncio.Task:
+        """Fetch `/metricsz` in a worker thread and store a compact snapshot in `sink[key]`."""
+
+        async def fetch():
+            snapshot: Optional[dict] = await asyncio.to_thread(harness.fetch_metrics, base_url)
+            sink[key] = compact_metrics(snapshot)
+
+        return self.background(fetch())
+
+    async def drain(self):
+        while self._background:
+            await asyncio.gather(*list(self._background))
+        await asyncio.to_thread(self.writer.flush)
+
+
+def compact_metrics(snapshot: Optional[dict]) -> Optional[dict]:
+    if not snapshot:
+        return None
+    dashboard = snapshot.get("dashboard", {})
+    return {
+        "generated_at_utc": snapshot.get("generatedAtUtc"),
+        "dashboard_refreshes": dashboard.get("successes", 0) + dashboard.get("failures", 0),
+        "dashboard_failures": dashboard.get("failures", 0),
+        "dashboard_average_ms": dashboard.get("averageDurationMs"),
+        "sonos_command_errors": snapshot.get("sonosCommands", {}).get("totalErrors", 0),
+    }
@@ -1,15 +1,23 @@
+import asyncio
+import json
 import os
 import platform
-import re
 import shutil
 import subprocess
+import sys
 import tempfile
 import time
+import zlib
 from pathlib import Path
 from urllib.error import URLError, HTTPError
 from urllib.request import urlopen
 
-from playwright.sync_api import sync_playwright, expect
+from playwright.async_api import Error as PlaywrightError, async_playwright, expect
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+import route_index  # noqa: E402
+import smoke_assertions  # noqa: E402
+import ui_scheduler  # noqa: E402
 
 
 BASE_URL = os.getenv("MOBILE_SMOKE_BASE_URL", "http://localhost:5107")
@@ -21,6 +29,15 @@ SERVER_START_TIMEOUT_SECONDS = int(os.getenv("MOBILE_SMOKE_SERVER_TIMEOUT", "180
 AUTO_START_SERVER = os.getenv("MOBILE_SMOKE_AUTOSTART", "1") != "0"
 MAX_LOGIN_ATTEMPTS = int(os.getenv("MOBILE_SMOKE_MAX_LOGIN_ATTEMPTS", "4"))
 CHROME_PATH = os.getenv("PLAYWRIGHT_CHROME_PATH")
+# Matrix cells in flight per browser and per server; lanes (viewport x theme) run concurrently.
+BROWSER_CONCURRENCY = int(os.getenv("MOBILE_SMOKE_CONCURRENCY", "4"))
+SERVER_CONCURRENCY = int(os.getenv("MOBILE_SMOKE_SERVER_CONCURRENCY", "4"))
+# always | on-failure | sampled; failed cells are always captured full-page.
+SCREENSHOT_POLICY = os.getenv("MOBILE_SMOKE_SCREENSHOTS", "always")
+SCREENSHOT_SCOPE = os.getenv("MOBILE_SMOKE_SCREENSHOT_SCOPE", "full-page")
+SCREENSHOT_SAMPLE_RATE = float(os.getenv("MOBILE_SMOKE_SCREENSHOT_SAMPLE_RATE", "0.1"))
+SCREENSHOT_POLICIES = ("always", "on-failure", "sampled")
+SCREENSHOT_SCOPES = ("full-page", "viewport")
 VIEWPORTS = [
     ("mobile", 390, 844),
     ("tablet", 768, 900),
@@ -39,6 +56,65 @@ ROUTES = [
     ("/administration/backups", "backups", "Backups"),
 ]
 
+PLAYER = {"css": "[data-qa='global-player-bar']"}
+# Declarative per-page assertions, evaluated in one injected script per page
+# (see scripts/smoke_assertions.py). Readiness is still gated with Playwright.
+COMMON_CHECKS = [
+    {"check": "count", "target": PLAYER, "equals": 1},
+    {"check": "visible", "target": PLAYER},
+    {"check": "has_class", "target": PLAYER, "class": "player-surface--compact"},
+    {"check": "no_horizontal_overflow"},
+    {
+        "check": "player_anchored",
+        "name": "global player anchored without covering content",
+        "player": "[data-qa='global-player-bar']",
+        "content": "article.content",
+    },
+]
+ROUTE_CHECKS = {
+    "home": [
+        {"check": "visible", "target": {"css": "[data-qa='home-dashboard']"}},
+        {"check": "visible", "target": {"role": "heading", "name": "Favourites"}},
+        {"check": "visible", "target": {"role": "heading", "name": "Active Automation"}},
+        {"check": "visible", "target": {"role": "heading", "name": "Device warnings"}},
+        {"check": "count", "target": {"css": ".spotify-library"}, "equals": 0},
+        {"check": "count", "target": {"css": ".spotify-home-context"}, "equals": 0},
+        {"check": "count", "target": {"css": ".spotify-room-picker"}, "equals": 0},
+        {"check": "count", "target": {"css": ".player-surface--expanded"}, "equals": 0},
+        {"check": "count", "target": {"css": "[data-qa='global-player-sync']"}, "equals": 1},
+        {"check": "count", "target": {"css": ".home-quick-library .library__item"}, "max": 6},
+        {
+            "check": "visible",
+            "target": {"role": "heading", "name": "Speakers"},
+            "when": {"css": "[data-qa='room-card']"},
+        },
+        {"check": "visible", "target": {"css": "#global-player-volume-number"}, "min_width": 1200},
+    ],
+    "library": [
+        {"check": "uniform_height", "name": "library card heights match", "target": {"css": ".source-card"}},
+        {
+            "check": "touch_targets",
+            "name": "favourite buttons are 44px touch targets",
+            "target": {"css": ".source-card__favourite"},
+            "same_count_as": {"css": ".source-card"},
+        },
+    ],
+}
+EXPANDED_PLAYER = {"role": "dialog", "name": "Now playing"}
+EXPANDED_PLAYER_CHECKS = [
+    {"check": "visible", "target": {"label": "Room", "within": EXPANDED_PLAYER}},
+    {"check": "visible", "target": {"label": "Volume for active room percentage", "exact": False, "within": EXPANDED_PLAYER}},
+    {"check": "visible", "target": {"role": "button", "name": "Sync", "exact": True, "within": EXPANDED_PLAYER}},
+    {"check": "visible", "target": {"role": "heading", "name": "Queue", "within": EXPANDED_PLAYER}},
+]
+DRAWER_CHECKS = [
+    {"check": "visible", "target": {"css": ".nav-scrollable"}},
+    *[
+        {"check": "visible", "target": {"role": "link", "name": name, "exact": True}}
+        for name in ("Home", "Library", "Automation", "Insights")
+    ],
+]
+
 
 def is_server_reachable():
     try:
@@ -105,22 +181,6 @@ def stop_local_server(process, log_stream, runtime_dir=None):
         shutil.rmtree(runtime_dir, ignore_errors=True)
 
 
-def assert_no_horizontal_overflow(page):
-    dimensions = page.evaluate(
-        """
-        () => ({
-            viewportWidth: window.innerWidth,
-            documentWidth: document.documentElement.scrollWidth,
-            bodyWidth: document.body.scrollWidth,
-        })
-        """
-    )
-    assert dimensions["documentWidth"] <= dimensions["viewportWidth"], (
-        f"{page.url} has horizontal overflow: viewport={dimensions['viewportWidth']}px, "
-        f"document={dimensions['documentWidth']}px, body={dimensions['bodyWidth']}px."
-    )
-
-
 def resolve_chrome_path():
     if CHROME_PATH:
         path = Path(CHROME_PATH)
@@ -136,50 +196,16 @@ def resolve_chrome_path():
     return None
 
 
-def launch_chromium(playwright):
+async def launch_chromium(playwright):
     executable_path = resolve_chrome_path()
     if executable_path:
-        return playwright.chromium.launch(headless=True, executable_path=executable_path)
-
-    return playwright.chromium.launch(headless=True)
-
-
-def assert_global_player_visible(page):
-    player = page.locator("[data-qa='global-player-bar']")
-    expect(player).to_have_count(1)
-    expect(player).to_be_visible(timeout=10000)
-    expect(player).to_have_class(re.compile(r"\bplayer-surface--compact\b"))
-
+        return await playwright.chromium.launch(headless=True, executable_path=executable_path)
 
-def assert_bottom_player_does_not_cover_content(page):
-    spacing = page.evaluate(
-        """
-        () => {
-            const player = document.querySelector('[data-qa="global-player-bar"]');
-            const content = document.querySelector('article.content');
-            if (!player || !content) return null;
-            const playerRect = player.getBoundingClientRect();
-            const playerStyle = window.getComputedStyle(player);
-            const paddingBottom = Number.parseFloat(window.getComputedStyle(content).paddingBottom) || 0;
-            return {
-                bottomGap: Math.abs(window.innerHeight - playerRect.bottom),
-                paddingBottom,
-                playerHeight: playerRect.height,
-                position: playerStyle.position
-            };
-        }
-        """
-    )
-    assert spacing is not None, "Global bottom player or content region missing."
-    assert spacing["bottomGap"] <= 2, "Global player is not anchored to the bottom viewport edge."
-    if spacing["position"] == "fixed":
-        assert (
-            spacing["paddingBottom"] + 4 >= spacing["playerHeight"]
-        ), "Main content does not reserve enough space for the global bottom player."
+    return await playwright.chromium.launch(headless=True)
 
 
-def apply_theme(page, theme):
-    page.evaluate(
+async def apply_theme(page, theme):
+    await page.evaluate(
         """
         theme => {
             document.documentElement.dataset.theme = theme;
@@ -190,83 +216,203 @@ def apply_theme(page, theme):
     )
 
 
-def assert_home_dashboard_layout(page):
-    expect(page.locator("[data-qa='home-dashboard']")).to_be_visible(timeout=10000)
-    expect(page.get_by_role("heading", name="Favourites")).to_be_visible(timeout=10000)
-    expect(page.get_by_role("heading", name="Active Automation")).to_be_visible(timeout=10000)
-    expect(page.get_by_role("heading", name="Device warnings")).to_be_visible(timeout=10000)
-    expect(page.locator(".spotify-library")).to_have_count(0)
-    expect(page.locator(".spotify-home-context")).to_have_count(0)
-    expect(page.locator(".spotify-room-picker")).to_have_count(0)
-    expect(page.locator(".player-surface--expanded")).to_have_count(0)
-    expect(page.locator("[data-qa='global-player-sync']")).to_have_count(1)
-    assert page.locator(".home-quick-library .library__item").count() <= 6
-    if page.locator("[data-qa='room-card']").count() > 0:
-        expect(page.get_by_role("heading", name="Speakers")).to_be_visible(timeout=10000)
-
-
-def assert_library_cards_are_uniform(page):
-    cards = page.locator(".source-card")
-    if cards.count() == 0:
+class SmokeReport:
+    """Collects assertion outcomes across the matrix instead of stopping at the first failure."""
+
+    def __init__(self):
+        self.failures = []
+        self.failed_cells = set()
+        self.cells = []
+        self.browser_errors = []
+        self.lane_error_counts = {}
+        self.server_metrics = {}
+        self.screenshots = []
+
+    async def gate(self, cell, description, assertion):
+        """Run a Playwright auto-wait readiness check; record a failure instead of raising."""
+        try:
+            await assertion()
+            return True
+        except AssertionError as error:
+            self.failures.append({"cell": cell, "check": description, "detail": str(error).splitlines()[0]})
+            self.failed_cells.add(cell)
+            return False
+
+    def cell_error(self, cell, error, check="cell completed"):
+        """Record a Playwright error (navigation or click timeout) that ended a cell early."""
+        self.failures.append({"cell": cell, "check": check, "detail": str(error).splitlines()[0]})
+        self.failed_cells.add(cell)
+
+    async def check(self, cell, page, checks, batch=None):
+        started = time.perf_counter()
+        result = await smoke_assertions.evaluate_checks(page, checks)
+        if result["failures"]:
+            self.failed_cells.add(cell)
+        if batch:
+            cell = f"{cell} {batch}"
+        self.cells.append(
+            {
+                "cell": cell,
+                "checks": len(checks),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "attempts": result["attempts"],
+                "failures": result["failures"],
+            }
+        )
+        self.failures.extend({"cell": cell, **failure} for failure in result["failures"])
+
+    def browser_error(self, lane, text):
+        self.browser_errors.append(f"{lane} {text}")
+        self.lane_error_counts[lane] = self.lane_error_counts.get(lane, 0) + 1
+
+    def watch(self, page, lane):
+        page.on(
+            "console",
+            lambda message: self.browser_error(lane, f"console: {message.text}") if message.type == "error" else None,
+        )
+        page.on("pageerror", lambda error: self.browser_error(lane, f"pageerror: {error}"))
+
+    def write(self, path):
+        payload = {
+            "failures": sorted(self.failures, key=lambda failure: failure["cell"]),
+            "cells": sorted(self.cells, key=lambda cell: cell["cell"]),
+            "server_metrics": self.server_metrics,
+            "screenshots": sorted(self.screenshots),
+        }
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    def mean_check_ms(self):
+        durations = [cell["duration_ms"] for cell in self.cells]
+        return sum(durations) / len(durations) if durations else 0.0
+
+
+def screenshot_path(output_dir, slug, lane):
+    return output_dir / f"{slug}_{lane.replace('/', '_')}.png"
+
+
+def screenshot_plan(cell, failed):
+    """Return `(capture, full_page)` for a cell under the configured screenshot policy."""
+    if failed:
+        return True, True
+    full_page = SCREENSHOT_SCOPE == "full-page"
+    if SCREENSHOT_POLICY == "always":
+        return True, full_page
+    if SCREENSHOT_POLICY == "sampled":
+        # Hash the cell name so the same cells are sampled on every run.
+        return zlib.crc32(cell.encode("utf-8")) % 10000 < SCREENSHOT_SAMPLE_RATE * 10000, full_page
+    return False, False
+
+
+async def finish_cell(page, cell, lane, errors_before, path, scheduler, report):
+    """Capture per policy, then hand the file write and `/metricsz` fetch to the background."""
+    failed = cell in report.failed_cells or report.lane_error_counts.get(lane, 0) > errors_before
+    capture, full_page = screenshot_plan(cell, failed)
+    if capture:
+        scheduler.write_file(path, await page.screenshot(full_page=full_page, type="png"))
+        report.screenshots.append(path.name)
+    else:
+        # Drop a stale capture from an earlier run so the folder only shows this run.
+        path.unlink(missing_ok=True)
+    scheduler.fetch_metrics(BASE_URL, report.server_metrics, cell)
+
+
+async def verify_expanded_player(page, report, cell):
+    open_button = page.get_by_role("button", name="Open expanded player")
+    if not await report.gate(cell, "expanded player button visible", lambda: expect(open_button).to_be_visible(timeout=5000)):
         return
+    await open_button.click()
+    sheet = page.get_by_role("dialog", name="Now playing")
+    if not await report.gate(cell, "expanded player opens", lambda: expect(sheet).to_be_visible(timeout=10000)):
+        return
+    await report.check(cell, page, EXPANDED_PLAYER_CHECKS, batch="expanded")
+    await sheet.get_by_role("button", name="Close expanded player").click()
 
-    dimensions = cards.evaluate_all(
-        """
-        elements => elements.map(element => {
-            const rect = element.getBoundingClientRect();
-            return { width: rect.width, height: rect.height };
-        })
-        """
-    )
-    heights = [round(item["height"], 2) for item in dimensions]
-    assert max(heights) - min(heights) <= 1, f"Library card heights differ: {heights}"
-    favourite_buttons = page.locator(".source-card__favourite")
-    expect(favourite_buttons).to_have_count(cards.count())
-    button_sizes = favourite_buttons.evaluate_all(
-        "elements => elements.map(element => element.getBoundingClientRect().width)"
-    )
-    assert all(size >= 44 for size in button_sizes), f"Favourite touch targets are too small: {button_sizes}"
-
-
-def verify_responsive_home(page, output_dir):
-    for slug, width, height in VIEWPORTS:
-        for theme in THEMES:
-            page.set_viewport_size({"width": width, "height": height})
-            page.goto(f"{BASE_URL}/", wait_until="networkidle")
-            apply_theme(page, theme)
-            assert_global_player_visible(page)
-            assert_home_dashboard_layout(page)
-            if width >= 1200:
-                expect(page.locator("#global-player-volume-number")).to_be_visible(timeout=10000)
-            if width <= 768:
-                page.get_by_role("button", name="Open expanded player").click()
-                sheet = page.get_by_role("dialog", name="Now playing")
-                expect(sheet).to_be_visible(timeout=10000)
-                expect(sheet.get_by_label("Room", exact=True)).to_be_visible()
-                expect(sheet.get_by_label("Volume for active room percentage")).to_be_visible()
-                expect(sheet.get_by_role("button", name="Sync", exact=True)).to_be_visible()
-                expect(sheet.get_by_role("heading", name="Queue")).to_be_visible()
-                sheet.get_by_role("button", name="Close expanded player").click()
-            assert_no_horizontal_overflow(page)
-            assert_bottom_player_does_not_cover_content(page)
-            page.screenshot(path=str(output_dir / f"home_{slug}_{theme}.png"), full_page=True)
-
-
-def verify_drawer(page):
+
+async def verify_responsive_home(page, lane, theme, width, output_dir, report, scheduler):
+    cell = f"home {lane}"
+    errors_before = report.lane_error_counts.get(lane, 0)
+    await page.goto(f"{BASE_URL}/", wait_until="networkidle")
+    await apply_theme(page, theme)
+    dashboard = page.locator("[data-qa='home-dashboard']")
+    if await report.gate(cell, "home dashboard ready", lambda: expect(dashboard).to_be_visible(timeout=10000)):
+        if width <= 768:
+            await verify_expanded_player(page, report, cell)
+        await report.check(cell, page, COMMON_CHECKS + ROUTE_CHECKS["home"])
+    await finish_cell(page, cell, lane, errors_before, screenshot_path(output_dir, "home", lane), scheduler, report)
+
+
+async def verify_drawer(page, report, cell):
     menu_button = page.locator("button.app-mobile-menu-button")
-    if menu_button.count() == 0:
+    if await menu_button.count() == 0:
         return
 
-    expect(menu_button.first).to_be_visible(timeout=5000)
-    menu_button.first.click(force=True)
-    page.wait_for_timeout(150)
-    expect(page.locator(".nav-scrollable")).to_be_visible(timeout=5000)
-    expect(page.get_by_role("link", name="Home", exact=True)).to_be_visible(timeout=5000)
-    expect(page.get_by_role("link", name="Library", exact=True)).to_be_visible(timeout=5000)
-    expect(page.get_by_role("link", name="Automation", exact=True)).to_be_visible(timeout=5000)
-    expect(page.get_by_role("link", name="Insights", exact=True)).to_be_visible(timeout=5000)
-    page.locator("button.nav-drawer-close").click()
-    page.wait_for_timeout(150)
+    if not await report.gate(cell, "drawer menu button visible", lambda: expect(menu_button.first).to_be_visible(timeout=5000)):
+        return
+    await menu_button.first.click(force=True)
+    close_button = page.locator("button.nav-drawer-close")
+    if not await report.gate(cell, "drawer opens", lambda: expect(close_button).to_be_visible(timeout=5000)):
+        return
+    await report.check(cell, page, DRAWER_CHECKS, batch="drawer")
+    await close_button.click()
+    await page.wait_for_timeout(150)
+
+
+async def verify_route(page, lane, theme, width, route, slug, expected_text, output_dir, report, scheduler):
+    cell = f"{route} {lane}"
+    errors_before = report.lane_error_counts.get(lane, 0)
+    await page.goto(f"{BASE_URL}{route}", wait_until="networkidle")
+    await apply_theme(page, theme)
+    heading = page.locator("article.content").get_by_text(expected_text, exact=True).first
+    if await report.gate(cell, f"'{expected_text}' visible", lambda: expect(heading).to_be_visible(timeout=10000)):
+        if width < 992:
+            await verify_drawer(page, report, cell)
+        await report.check(cell, page, COMMON_CHECKS + ROUTE_CHECKS.get(slug, []))
+    await finish_cell(page, cell, lane, errors_before, screenshot_path(output_dir, slug, lane), scheduler, report)
+
+
+async def run_cell(page, lane, cell, path, verification, report, scheduler):
+    """Run one matrix cell; a Playwright error fails that cell instead of the whole matrix."""
+    async with scheduler.slot("chromium", BASE_URL):
+        try:
+            await verification
+        except PlaywrightError as error:
+            report.cell_error(cell, error)
+            # The cell never reached finish_cell; capture the page it gave up on.
+            try:
+                await finish_cell(page, cell, lane, report.lane_error_counts.get(lane, 0), path, scheduler, report)
+            except PlaywrightError as capture_error:
+                report.cell_error(cell, capture_error, check="failure screenshot")
+
+
+async def verify_lane(browser, storage_state, viewport, theme, output_dir, report, scheduler):
+    """Walk the responsive home check and every route for one viewport/theme pair in its own context."""
+    viewport_slug, width, height = viewport
+    lane = f"{viewport_slug}/{theme}"
+    context = await browser.new_context(viewport={"width": width, "height": height}, storage_state=storage_state)
+    try:
+        page = await context.new_page()
+        report.watch(page, lane)
+        await run_cell(
+            page,
+            lane,
+            f"home {lane}",
+            screenshot_path(output_dir, "home", lane),
+            verify_responsive_home(page, lane, theme, width, output_dir, report, scheduler),
+            report,
+            scheduler,
+        )
+        for route, slug, expected_text in ROUTES:
+            await run_cell(
+                page,
+                lane,
+                f"{route} {lane}",
+                screenshot_path(output_dir, slug, lane),
+                verify_route(page, lane, theme, width, route, slug, expected_text, output_dir, report, scheduler),
+                report,
+                scheduler,
+            )
+    finally:
+        await context.close()
 
 
 def get_login_attempts():
@@ -303,26 +449,103 @@ def get_login_attempts():
     return attempts
 
 
-def try_login(page, username, password):
-    page.goto(f"{BASE_URL}/auth/login", wait_until="networkidle")
-    page.fill("#username", username)
-    page.fill("#password", password)
-    page.click("button#loginBtn")
-    page.wait_for_load_state("networkidle")
-    page.wait_for_timeout(300)
+async def try_login(page, username, password):
+    await page.goto(f"{BASE_URL}/auth/login", wait_until="networkidle")
+    await page.fill("#username", username)
+    await page.fill("#password", password)
+    await page.click("button#loginBtn")
+    await page.wait_for_load_state("networkidle")
+    await page.wait_for_timeout(300)
 
     if "/auth/login" not in page.url:
         return True, page.url, ""
 
     error_text = ""
     error_alert = page.locator(".alert[role='alert']")
-    if error_alert.count() > 0:
-        error_text = error_alert.first.inner_text().strip()
+    if await error_alert.count() > 0:
+        error_text = (await error_alert.first.inner_text()).strip()
 
     return False, page.url, error_text
 
 
+async def run_matrix(started_local_server):
+    output_dir = Path("mobile_smoke_screenshots")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    async with async_playwright() as p:
+        browser = await launch_chromium(p)
+        login_context = await browser.new_context(viewport={"width": 390, "height": 844})
+        page = await login_context.new_page()
+
+        login_attempt_errors = []
+        login_succeeded = False
+        for username, password in get_login_attempts():
+            login_succeeded, current_url, error_text = await try_login(page, username, password)
+            if login_succeeded:
+                break
+
+            login_attempt_errors.append(
+                f"{username}@{current_url} ({error_text or 'no error message'})"
+            )
+
+        if not login_succeeded:
+            await page.screenshot(path=str(output_dir / "mobile_login_failure.png"), full_page=True)
+            attempts_description = "; ".join(login_attempt_errors) or "none"
+            raise AssertionError(
+                "Unable to log in. Set MOBILE_SMOKE_USERNAME and MOBILE_SMOKE_PASSWORD. "
+                f"Attempt results: {attempts_description}"
+            )
+
+        storage_state = await login_context.storage_state()
+        await login_context.close()
+
+        report = SmokeReport()
+        report_path = Path("artifacts") / "mobile_smoke_report.json"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        scheduler = ui_scheduler.CellScheduler(BROWSER_CONCURRENCY, SERVER_CONCURRENCY)
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *[
+                    verify_lane(browser, storage_state, viewport, theme, output_dir, report, scheduler)
+                    for viewport in VIEWPORTS
+                    for theme in THEMES
+                ]
+            )
+        finally:
+            await scheduler.drain()
+            report.write(report_path)
+        elapsed = time.perf_counter() - started
+        await browser.close()
+
+    problems = []
+    if report.failures:
+        problems.append(smoke_assertions.format_failures(sorted(report.failures, key=lambda failure: failure["cell"])))
+    if report.browser_errors:
+        problems.append("Browser errors detected:\n" + "\n".join(report.browser_errors))
+    assert not problems, "\n\n".join(problems) + f"\nFull report: {report_path}"
+
+    print(
+        f"UI smoke passed: {len(VIEWPORTS)} viewports × {len(THEMES)} themes × "
+        f"{len(ROUTES)} primary routes in {elapsed:.1f}s; isolated runtime={started_local_server}; "
+        f"{len(report.cells)} batched checks, mean {report.mean_check_ms():.1f} ms per page; "
+        f"{len(report.screenshots)} screenshots ({SCREENSHOT_POLICY}, {SCREENSHOT_SCOPE}, "
+        f"{scheduler.writer.bytes_written / (1024 * 1024):.1f} MB)."
+    )
+
+    index = route_index.load_route_index()
+    covered = {route["component"] for route in index if route["template"] in {path for path, _, _ in ROUTES}}
+    uncovered = sorted({route["component"] for route in index} - covered)
+    if uncovered:
+        print(f"Pages without smoke coverage (see scripts/sweep_routes.py): {', '.join(uncovered)}")
+
+
 def run():
+    if SCREENSHOT_POLICY not in SCREENSHOT_POLICIES:
+        raise ValueError(f"MOBILE_SMOKE_SCREENSHOTS must be one of {', '.join(SCREENSHOT_POLICIES)}.")
+    if SCREENSHOT_SCOPE not in SCREENSHOT_SCOPES:
+        raise ValueError(f"MOBILE_SMOKE_SCREENSHOT_SCOPE must be one of {', '.join(SCREENSHOT_SCOPES)}.")
+
     server_process = None
     server_log_stream = None
     server_log_path = None
@@ -345,69 +568,11 @@ def run():
             f"App is not reachable at {BASE_URL}. Start the app or enable auto-start."
         )
 
-    with sync_playwright() as p:
-        try:
-            browser = launch_chromium(p)
-            context = browser.new_context(viewport={"width": 390, "height": 844})
-            page = context.new_page()
-            browser_errors = []
-            page.on("console", lambda message: browser_errors.append(f"console: {message.text}") if message.type == "error" else None)
-            page.on("pageerror", lambda error: browser_errors.append(f"pageerror: {error}"))
-
-            output_dir = Path("mobile_smoke_screenshots")
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            login_attempt_errors = []
-            login_succeeded = False
-            for username, password in get_login_attempts():
-                login_succeeded, current_url, error_text = try_login(page, username, password)
-                if login_succeeded:
-                    break
-
-                login_attempt_errors.append(
-                    f"{username}@{current_url} ({error_text or 'no error message'})"
-                )
-
-            if not login_succeeded:
-                page.screenshot(path=str(output_dir / "mobile_login_failure.png"), full_page=True)
-                attempts_description = "; ".join(login_attempt_errors) or "none"
-                raise AssertionError(
-                    "Unable to log in. Set MOBILE_SMOKE_USERNAME and MOBILE_SMOKE_PASSWORD. "
-                    f"Attempt results: {attempts_description}"
-                )
-
-            verify_responsive_home(page, output_dir)
-
-            for viewport_slug, width, height in VIEWPORTS:
-                page.set_viewport_size({"width": width, "height": height})
-                for theme in THEMES:
-                    for route, slug, expected_text in ROUTES:
-                        page.goto(f"{BASE_URL}{route}", wait_until="networkidle")
-                        apply_theme(page, theme)
-                        main_content = page.locator("article.content")
-                        expect(main_content.get_by_text(expected_text, exact=True).first).to_be_visible(timeout=10000)
-
-                        assert_global_player_visible(page)
-                        if width < 992:
-                            verify_drawer(page)
-                        assert_no_horizontal_overflow(page)
-                        assert_bottom_player_does_not_cover_content(page)
-                        if route == "/library":
-                            assert_library_cards_are_uniform(page)
-
-                        page.screenshot(path=str(output_dir / f"{slug}_{viewport_slug}_{theme}.png"), full_page=True)
-
-            assert not browser_errors, "Browser errors detected:\n" + "\n".join(browser_errors)
-
-            context.close()
-            browser.close()
-            print(
-                f"UI smoke passed: {len(VIEWPORTS)} viewports × {len(THEMES)} themes × "
-                f"{len(ROUTES)} primary routes; isolated runtime={started_local_server}."
-            )
-        finally:
-            if started_local_server:
-                stop_local_server(server_process, server_log_stream, runtime_dir)
+    try:
+        asyncio.run(run_matrix(started_local_server))
+    finally:
+        if started_local_server:
+            stop_local_server(server_process, server_log_stream, runtime_dir)
 
 
 if __name__ == "__main__":